@@ -0,0 +1,38 @@
+from devito import Grid, TimeFunction, Eq
+from devito.ir.clusters import clusterize
+from devito.ir.equations import LoweredEq
+from devito.symbolics import indexify
+
+
+def coupled_system(nfields, grid):
+    """
+    A first-order system in the style of the elastic wave equation: ``nfields``
+    "velocities" are updated from the "stresses", which in turn are updated from
+    the new velocities. This gives rise to many flow and anti dependences.
+    """
+    v = [TimeFunction(name='v%d' % i, grid=grid, space_order=4)
+         for i in range(nfields)]
+    s = [TimeFunction(name='s%d' % i, grid=grid, space_order=4)
+         for i in range(nfields)]
+    x, y, z = grid.dimensions
+
+    eqns = [Eq(v[i].forward, v[i] + s[i].dx + s[i - 1].dy + s[i - 2].dz)
+            for i in range(nfields)]
+    eqns += [Eq(s[i].forward, s[i] + v[i].forward.dx + v[i - 1].forward.dy +
+                v[(i + 1) % nfields].forward.dz)
+             for i in range(nfields)]
+
+    return [LoweredEq(indexify(i)) for i in eqns]
+
+
+class Clusterize(object):
+
+    params = [4, 8, 16, 32]
+    param_names = ['nfields']
+
+    def setup(self, nfields):
+        grid = Grid(shape=(16, 16, 16))
+        self.exprs = coupled_system(nfields, grid)
+
+    def time_clusterize(self, nfields):
+        clusterize(self.exprs)
@@ -0,0 +1,43 @@
+from sympy import cos, sin
+
+from devito import Grid, Function, TimeFunction, Eq
+from devito.dse.manipulation import common_subexprs_elimination
+from devito.ir.equations import LoweredEq
+from devito.symbolics import indexify
+from devito.types import Scalar
+
+
+def rotated_laplacian(space_order):
+    """
+    The TTI-like Laplacian of a wavefield, in a coordinate system rotated by
+    two space-varying angles. This yields large expressions with plenty of
+    common sub-expressions.
+    """
+    grid = Grid(shape=(16, 16, 16))
+    u = TimeFunction(name='u', grid=grid, space_order=space_order)
+    theta = Function(name='theta', grid=grid)
+    phi = Function(name='phi', grid=grid)
+
+    def gx(f):
+        return (cos(theta)*cos(phi)*f.dx + cos(theta)*sin(phi)*f.dy -
+                sin(theta)*f.dz)
+
+    def gy(f):
+        return -sin(phi)*f.dx + cos(phi)*f.dy
+
+    eqn = Eq(u.forward, gx(gx(u)) + gy(gy(u)))
+
+    return [LoweredEq(indexify(eqn))]
+
+
+class CommonSubexprsElimination(object):
+
+    params = [4, 8, 16]
+    param_names = ['space_order']
+
+    def setup(self, space_order):
+        self.exprs = rotated_laplacian(space_order)
+
+    def time_cse(self, space_order):
+        make = lambda: Scalar(name='r').indexify()
+        common_subexprs_elimination(self.exprs, make)
@@ -61,6 +61,7 @@ def option_performance(f):
         'O3': {'dse': 'aggressive', 'dle': 'advanced'},
         # Parametric
         'dse': {'dse': ['basic', 'advanced', 'aggressive'], 'dle': 'advanced'},
+        'padding': {'dse': 'advanced', 'dle': 'advanced', 'autopadding': [False, True]},
     }
 
     def from_preset(ctx, param, value):
@@ -70,12 +71,12 @@ def option_performance(f):
 
     def from_value(ctx, param, value):
         """Prefer preset values and warn for competing values."""
-        return ctx.params[param.name] or value
+        return ctx.params.get(param.name) or value
 
     options = [
         click.option('-bm', '--bench-mode', is_eager=True,
                      callback=from_preset, expose_value=False, default='O2',
-                     type=click.Choice(['O1', 'O2', 'O3', 'dse']),
+                     type=click.Choice(['O1', 'O2', 'O3', 'dse', 'padding']),
                      help='Choose what to benchmark; ignored if execmode=run'),
         click.option('--arch', default='unknown',
                      help='Architecture on which the simulation is/was run'),
@@ -86,7 +87,9 @@ def option_performance(f):
                      type=click.Choice(['noop'] + configuration._accepted['dle']),
                      help='Devito loop engine (DLE) mode'),
         click.option('-a', '--autotune', is_flag=True,
-                     help='Switch auto tuning on/off')
+                     help='Switch auto tuning on/off'),
+        click.option('--autopadding', is_flag=True, callback=from_value,
+                     help='Pad the wavefields to avoid cache-set conflicts')
     ]
     for option in reversed(options):
         f = option(f)
@@ -149,7 +152,8 @@ def test(problem, **kwargs):
     Test numerical correctness with different parameters.
     """
     run = tti_run if problem == 'tti' else acoustic_run
-    sweep_options = ('space_order', 'time_order', 'dse', 'dle', 'autotune')
+    sweep_options = ('space_order', 'time_order', 'dse', 'dle', 'autotune',
+                     'autopadding')
 
     last_res = None
     for params in sweep(kwargs, keys=sweep_options):
@@ -331,6 +335,7 @@ def get_ob_bench(problem, resultsdir, parameters):
             devito_params['dse'] = params['dse']
             devito_params['dle'] = params['dle']
             devito_params['at'] = params['autotune']
+            devito_params['ap'] = params['autopadding']
             return '_'.join(['%s[%s]' % (k, v) for k, v in devito_params.items()])
 
     return DevitoBenchmark(name=problem, resultsdir=resultsdir, parameters=parameters)
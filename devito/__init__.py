@@ -4,6 +4,7 @@ from itertools import product
 # API imports
 from devito.base import *  # noqa
 from devito.builtins import *  # noqa
+from devito.checkpointing import Checkpointer, SegmentedOperator  # noqa
 from devito.data.allocators import *  # noqa
 from devito.equation import *  # noqa
 from devito.finite_differences import *  # noqa
@@ -16,6 +17,7 @@ from devito.backends import backends_registry, init_backend
 from devito.compiler import compiler_registry
 from devito.dle import dle_registry
 from devito.dse import dse_registry
+from devito.finite_differences.finite_difference import _generate_fd_shortcuts
 from devito.logger import error, warning, info, logger_registry, set_log_level  # noqa
 from devito.parameters import *  # noqa
 from devito.profiling import profiler_registry
@@ -35,6 +37,14 @@ configuration.add('backend', 'core', list(backends_registry), callback=init_back
 # Should Devito run a first-touch Operator upon data allocation?
 configuration.add('first-touch', 0, [0, 1], lambda i: bool(i), False)
 
+# Should Devito pad the innermost Dimension of the Functions to avoid cache-set
+# conflicts? The padding is picked at Operator construction time
+configuration.add('autopadding', 0, [0, 1], lambda i: bool(i), False)
+
+# Should Devito JIT-compile, in the background, variants of the Operators
+# specialized for the runtime arguments (e.g., the grid shape) given to apply()?
+configuration.add('specialize', 0, [0, 1], lambda i: bool(i), False)
+
 # Should Devito ignore any unknown runtime arguments supplied to Operator.apply(),
 # or rather raise an exception (the default behaviour)?
 configuration.add('ignore-unknowns', 0, [0, 1], lambda i: bool(i), False)
@@ -88,19 +98,38 @@ configuration.add('develop-mode', True, [False, True])
 
 # Setup DSE
 configuration.add('dse', 'advanced', list(dse_registry))
+# Number of processes in which the DSE rewrites independent Clusters. The
+# generated code doesn't depend on it
+configuration.add('dse-jobs', 1, impacts_jit=False)
 
 # Setup DLE
 configuration.add('dle', 'advanced', list(dle_registry))
 configuration.add('dle-options', {})
 
+# Max number of bytes of checkpoints kept in memory by a Checkpointer; any
+# further checkpoints are stored on disk. 0 means unlimited
+configuration.add('checkpointing-memory', 0, impacts_jit=False)
+
+# Number of bytes held by the Data of the cached Functions above which the symbol
+# caches are automatically trimmed, and number of bytes the trimming aims at.
+# A high watermark of 0 means unlimited
+configuration.add('cache-high-watermark', 0, impacts_jit=False)
+configuration.add('cache-low-watermark', 0, impacts_jit=False)
+
 # Setup Operator profiling
 configuration.add('profiling', 'basic', list(profiler_registry), impacts_jit=False)
 
-# Initialize `configuration`. This will also trigger the backend initialization
+# Initialize `configuration`. This will also select the backend, which however
+# only gets imported upon first use
 init_configuration()
 
-# Expose a mechanism to clean up the symbol caches (SymPy's, Devito's)
-clear_cache = CacheManager().clear  # noqa
+
+def clear_cache():
+    """Clean up the symbol caches (SymPy's, Devito's)."""
+    # The derivative shortcut tables hold on to Dimensions, and thus to their
+    # (cached) spacing symbols
+    _generate_fd_shortcuts.cache_clear()
+    CacheManager().clear()  # noqa
 
 
 # Helper functions to switch on/off optimisation levels
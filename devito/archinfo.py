@@ -1,21 +1,48 @@
 """Collection of utilities to detect properties of the underlying architecture."""
 
+from collections import namedtuple
+from glob import glob
 from subprocess import PIPE, Popen
+from shutil import which
+import os
+import socket
 
 import numpy as np
 import cpuinfo
 import psutil
 
 from devito.logger import warning
-from devito.tools.memoization import memoized_func
+from devito.tools.memoization import memoized_func, memoized_on_disk
 
-__all__ = ['platform_registry',
+__all__ = ['platform_registry', 'Cache',
            'INTEL64', 'SNB', 'IVB', 'HSW', 'BDW', 'SKX', 'KNL', 'KNL7210',
            'ARM',
            'POWER8', 'POWER9']
 
 
-@memoized_func
+def get_host_id():
+    """
+    Identify the current host by its name and last boot time. The hardware
+    can't change without a reboot, so the architecture properties detected on
+    a given host can safely be cached on disk under this identifier.
+    """
+    return (socket.gethostname(), psutil.boot_time())
+
+
+def get_executable_id(cmd):
+    """
+    Identify the executable ``cmd`` by its absolute path and modification
+    time, on the current host.
+    """
+    path = which(cmd)
+    try:
+        mtime = os.path.getmtime(path)
+    except (OSError, TypeError):
+        mtime = None
+    return get_host_id() + (path, mtime)
+
+
+@memoized_on_disk(get_host_id)
 def get_cpu_info():
     try:
         # On linux, the following should work and is super quick
@@ -61,9 +88,55 @@ def get_cpu_info():
             warning("Physical core count autodetection failed")
             cpu_info['physical'] = 1
 
+    # Detect the cache hierarchy
+    cpu_info['caches'] = get_cache_info()
+
     return cpu_info
 
 
+class Cache(namedtuple('Cache', 'level size ways line_size')):
+
+    """
+    A data (or unified) cache of ``size`` bytes, with ``ways``-way set
+    associativity and lines of ``line_size`` bytes.
+    """
+
+    @property
+    def nsets(self):
+        """Number of cache sets."""
+        return max(self.size // (self.ways*self.line_size), 1)
+
+    @property
+    def stride(self):
+        """
+        The critical stride, that is the distance in bytes between two addresses
+        mapped to the same cache set.
+        """
+        return self.nsets*self.line_size
+
+
+default_caches = (Cache(1, 32*1024, 8, 64), Cache(2, 1024*1024, 16, 64))
+"""Fallback cache hierarchy, used if the autodetection fails."""
+
+
+def get_cache_info():
+    """Detect the data (and unified) caches, sorted by level."""
+    caches = []
+    try:
+        for path in glob('/sys/devices/system/cpu/cpu0/cache/index*'):
+            read = lambda k: open(os.path.join(path, k)).read().strip()
+            if read('type') not in ('Data', 'Unified'):
+                continue
+            size = read('size')
+            size = int(size[:-1])*{'K': 2**10, 'M': 2**20}[size[-1]]
+            caches.append(Cache(int(read('level')), size,
+                                int(read('ways_of_associativity')),
+                                int(read('coherency_line_size'))))
+    except:
+        caches = []
+    return tuple(sorted(caches)) or default_caches
+
+
 @memoized_func
 def lscpu():
     p1 = Popen(['lscpu'], stdout=PIPE, stderr=PIPE)
@@ -84,6 +157,15 @@ def lscpu():
 @memoized_func
 def get_platform():
     """Attempt Platform autodetection."""
+    return platform_registry.get(detect_platform(), CPU64)
+
+
+@memoized_on_disk(lambda: get_executable_id('gcc'))
+def detect_platform():
+    """
+    Attempt Platform autodetection. Return the name of the detected Platform,
+    or None if the autodetection fails.
+    """
 
     # TODO: cannot autodetect the following platforms yet:
     # ['arm', 'power8', 'power9']
@@ -98,9 +180,8 @@ def get_platform():
         platform = output.decode("utf-8").split()[1]
         # Full list of possible `platform` values at this point at:
         # https://gcc.gnu.org/onlinedocs/gcc/x86-Options.html
-        platform = {'sandybridge': 'snb', 'ivybridge': 'ivb', 'haswell': 'hsw',
-                    'broadwell': 'bdw', 'skylake': 'skx', 'knl': 'knl'}[platform]
-        return platform_registry[platform]
+        return {'sandybridge': 'snb', 'ivybridge': 'ivb', 'haswell': 'hsw',
+                'broadwell': 'bdw', 'skylake': 'skx', 'knl': 'knl'}[platform]
     except:
         pass
 
@@ -108,13 +189,12 @@ def get_platform():
     try:
         cpu_info = get_cpu_info()
         platform = cpu_info['brand'].split()[4]
-        platform = {'v2': 'ivb', 'v3': 'hsw', 'v4': 'bdw', 'v5': 'skx'}[platform]
-        return platform_registry[platform]
+        return {'v2': 'ivb', 'v3': 'hsw', 'v4': 'bdw', 'v5': 'skx'}[platform]
     except:
         pass
 
     # Stick to default
-    return CPU64
+    return None
 
 
 class Platform(object):
@@ -127,6 +207,7 @@ class Platform(object):
         self.cores_logical = kwargs.get('cores_logical', cpu_info['logical'])
         self.cores_physical = kwargs.get('cores_physical', cpu_info['physical'])
         self.isa = kwargs.get('isa', self._detect_isa())
+        self.caches = kwargs.get('caches', cpu_info['caches'])
 
     def __call__(self):
         return self
@@ -185,12 +266,14 @@ class Power(Cpu64):
 
 class Device(Platform):
 
-    def __init__(self, name, cores_logical=1, cores_physical=1, isa='cpp'):
+    def __init__(self, name, cores_logical=1, cores_physical=1, isa='cpp',
+                 caches=default_caches):
         self.name = name
 
         self.cores_logical = cores_logical
         self.cores_physical = cores_physical
         self.isa = isa
+        self.caches = caches
 
 
 # CPUs
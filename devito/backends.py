@@ -12,6 +12,9 @@ from devito.logger import warning
 
 backends = {}
 
+_pending = None
+"""The backend selected via ``init_backend``, but not imported yet."""
+
 backends_registry = ('core', 'yask', 'void', 'ops')
 
 
@@ -63,11 +66,12 @@ class _BackendSelector(FunctionClass):
         """
 
         # Try the selected backend first
+        backend = load_backend()
         try:
-            t = cls._backend.__dict__[cls.__name__]
+            t = backend.__dict__[cls.__name__]
         except KeyError as e:
             warning('Backend %s does not appear to implement class %s'
-                    % (cls._backend.__name__, cls.__name__))
+                    % (backend.__name__, cls.__name__))
             raise e
         # Invoke the constructor with the arguments given
         return t(*args, **kwargs)
@@ -82,7 +86,7 @@ class _BackendSelector(FunctionClass):
         type(function.Function) is ``_BackendSelector`` and so by default
         ``isinstance(function.Function(...), function.Function)`` is False.
         """
-        return isinstance(instance, cls._backend.__dict__[cls.__name__])
+        return isinstance(instance, load_backend().__dict__[cls.__name__])
 
     def __subclasscheck__(cls, subclass):
         """
@@ -93,14 +97,14 @@ class _BackendSelector(FunctionClass):
         ``type(function.Function)`` is ``_BackendSelector`` and so by default
         ``isinstance(type(function.Function(...)), function.Function)`` is False.
         """
-        return issubclass(subclass, cls._backend.__dict__[cls.__name__])
+        return issubclass(subclass, load_backend().__dict__[cls.__name__])
 
 
 def get_backend():
     """
     Get the Devito backend.
     """
-    return _BackendSelector._backend.__name__
+    return load_backend().__name__
 
 
 def set_backend(backend):
@@ -131,11 +135,32 @@ def initialised_backend():
 def init_backend(backend):
     """
     Initialise Devito: select the backend and other configuration options.
+
+    The backend is only imported upon first use, that is when the first object
+    depending on it (e.g., a Grid, a Function, an Operator) gets created. This
+    keeps ``import devito`` cheap.
     """
+    global _pending
     if backend not in backends_registry:
         raise RuntimeError("Calling init() for a different backend is illegal.")
 
-    try:
-        set_backend(backend)
-    except (ImportError, RuntimeError):
-        raise DevitoError("Couldn't initialize Devito.")
+    _pending = backend
+
+
+def load_backend():
+    """
+    Import the backend selected via ``init_backend``, if not imported yet.
+
+    Returns
+    -------
+    module
+        The current backend.
+    """
+    global _pending
+    if _pending is not None:
+        backend, _pending = _pending, None
+        try:
+            set_backend(backend)
+        except (ImportError, RuntimeError):
+            raise DevitoError("Couldn't initialize Devito.")
+    return _BackendSelector._backend
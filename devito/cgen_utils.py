@@ -58,7 +58,8 @@ class Allocator(object):
 
 class CodePrinter(C99CodePrinter):
 
-    custom_functions = {'INT': '(int)', 'FLOAT': '(float)', 'DOUBLE': '(double)'}
+    custom_functions = {'INT': '(int)', 'FLOAT': '(float)', 'DOUBLE': '(double)',
+                        'UINTP': '(uintptr_t)'}
 
     """
     Decorator for sympy.printing.ccode.CCodePrinter.
@@ -162,10 +163,19 @@ class CodePrinter(C99CodePrinter):
         return "{%s}" % ', '.join([self._print(i) for i in expr.params])
 
     def _print_IntDiv(self, expr):
-        return expr.__str__()
+        lhs = self._print(expr.lhs)
+        if expr.lhs.is_Add:
+            lhs = "(%s)" % lhs
+        return "%s / %s" % (lhs, self._print(expr.rhs))
+
+    def _print_Byref(self, expr):
+        if expr.base.is_Symbol:
+            return "&%s" % self._print(expr.base)
+        else:
+            return "&(%s)" % self._print(expr.base)
 
-    _print_Byref = _print_IntDiv
-    _print_IndexedPointer = _print_IntDiv
+    def _print_IndexedPointer(self, expr):
+        return expr.__str__()
 
     def _print_TrigonometricFunction(self, expr):
         func_name = str(expr.func)
@@ -199,6 +209,7 @@ printvar = lambda i: c.Statement('printf("%s=%%s\\n", %s); fflush(stdout);' % (i
 INT = Function('INT')
 FLOAT = Function('FLOAT')
 DOUBLE = Function('DOUBLE')
+UINTP = Function('UINTP')
 FLOOR = Function('floor')
 
 cast_mapper = {np.float32: FLOAT, float: DOUBLE, np.float64: DOUBLE}
@@ -0,0 +1,3 @@
+from devito.checkpointing.schedule import *  # noqa
+from devito.checkpointing.storage import *  # noqa
+from devito.checkpointing.checkpointer import *  # noqa
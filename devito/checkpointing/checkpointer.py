@@ -0,0 +1,169 @@
+from devito.checkpointing.schedule import (ADVANCE, TAKESHOT, RESTORE, REVERSE,
+                                           RevolveSchedule, UniformSchedule)
+from devito.checkpointing.storage import CheckpointStorage
+from devito.logger import perf
+
+__all__ = ['SegmentedOperator', 'Checkpointer']
+
+
+class SegmentedOperator(object):
+
+    """
+    Run an Operator over arbitrary segments of its time loop.
+
+    The runtime arguments are processed once, upon construction; each segment
+    then only updates the time bounds within a cached argument vector before
+    invoking the JIT-compiled function, thus bypassing ``Operator.arguments``.
+
+    Parameters
+    ----------
+    op : Operator
+        The Operator to be run in segments.
+    **kwargs
+        The runtime arguments, as in ``op.apply(**kwargs)``. They are bound
+        once and for all, so any data they carry must stay alive and must not
+        be reallocated while the SegmentedOperator is in use.
+    """
+
+    def __init__(self, op, **kwargs):
+        self.op = op
+
+        try:
+            time_dim = [i for i in op.dimensions if i.is_Time and not i.is_Derived][0]
+        except IndexError:
+            raise ValueError("Operator `%s` has no time Dimension" % op.name)
+
+        # WARNING: `self.args` keeps references to the ctypes objects (e.g.,
+        # the DiscreteFunctions' dataobjs) within the argument vector
+        self.args = op.arguments(**kwargs)
+        self._arg_values = [self.args[p.name] for p in op.parameters]
+
+        names = [p.name for p in op.parameters]
+        self._index_min = names.index(time_dim.min_name)
+        self._index_max = names.index(time_dim.max_name)
+
+        # Logical timestep 0 maps to the Operator's default `time_m`
+        self.offset = self.args[time_dim.min_name]
+
+    def apply(self, t_start, t_end):
+        """Run the timesteps in the half-open interval ``[t_start, t_end)``."""
+        self._arg_values[self._index_min] = t_start + self.offset
+        self._arg_values[self._index_max] = t_end - 1 + self.offset
+        self.op.cfunction(*self._arg_values)
+
+    def finalize(self):
+        """Post-process the runtime arguments, as done by ``Operator.apply``."""
+        self.op._postprocess_arguments(self.args)
+
+
+class Checkpointer(object):
+
+    """
+    Drive an adjoint computation through checkpointing.
+
+    Only a limited number of states of the forward computation (the
+    "checkpoints") are stored; the forward computation is rerun from the
+    checkpoints whenever a state is required by the reverse computation.
+
+    Parameters
+    ----------
+    functions : list of DiscreteFunction
+        The DiscreteFunctions carrying the state of the forward computation,
+        typically the buffered TimeFunctions.
+    forward : SegmentedOperator
+        The forward computation.
+    reverse : SegmentedOperator
+        The reverse computation. The reverse step ``t`` consumes the forward
+        state produced by the forward step ``t``.
+    n_timesteps : int
+        Number of timesteps of the forward computation.
+    n_checkpoints : int, optional
+        Number of checkpoints. Defaults to a schedule-dependent value.
+    schedule : str or Schedule, optional
+        The checkpointing schedule, either 'revolve' (binomial checkpointing,
+        the default) or 'uniform', or a Schedule object.
+    memory : int, optional
+        Max number of bytes of checkpoints kept in memory; any further
+        checkpoints are stored on disk. Defaults to
+        ``configuration['checkpointing-memory']``, where 0 means unlimited.
+    path : str, optional
+        Directory for the on-disk checkpoints.
+
+    Examples
+    --------
+    >>> from devito import Grid, TimeFunction, Function, Eq, Operator
+    >>> grid = Grid(shape=(4, 4))
+    >>> u = TimeFunction(name='u', grid=grid)
+    >>> v = TimeFunction(name='v', grid=grid)
+    >>> g = Function(name='g', grid=grid)
+    >>> fwd = Operator(Eq(u.forward, u + 1))
+    >>> rev = Operator([Eq(v.backward, v + 1), Eq(g, g + u*v)])
+    >>> cp = Checkpointer([u], SegmentedOperator(fwd, time_M=10),
+    ...                   SegmentedOperator(rev, time_M=10), n_timesteps=10,
+    ...                   n_checkpoints=3)
+    >>> cp.apply_forward()
+    >>> cp.apply_reverse()
+    """
+
+    def __init__(self, functions, forward, reverse, n_timesteps, n_checkpoints=None,
+                 schedule='revolve', memory=None, path=None):
+        if schedule == 'revolve':
+            schedule = RevolveSchedule(n_timesteps, n_checkpoints)
+        elif schedule == 'uniform':
+            interval = None
+            if n_checkpoints is not None:
+                # Smallest interval such that `nsegments + interval - 1` fits
+                interval = 1
+                while (-(-n_timesteps // interval) + interval - 1 > n_checkpoints and
+                       interval < n_timesteps):
+                    interval += 1
+            schedule = UniformSchedule(n_timesteps, interval)
+        elif schedule.n_timesteps != n_timesteps:
+            raise ValueError("`schedule` spans %d timesteps, while `n_timesteps=%d`"
+                             % (schedule.n_timesteps, n_timesteps))
+        self.schedule = schedule
+
+        self.forward = forward
+        self.reverse = reverse
+        self.n_timesteps = n_timesteps
+
+        self.storage = CheckpointStorage(functions, schedule.n_checkpoints,
+                                         memory, path)
+
+        steps = list(schedule)
+        nfwd = [i.action for i in steps].index(REVERSE)
+        self._forward_steps = steps[:nfwd]
+        self._reverse_steps = steps[nfwd:]
+
+    def _run(self, steps):
+        for action, start, end, slot in steps:
+            if action == ADVANCE:
+                self.forward.apply(start, end)
+            elif action == TAKESHOT:
+                self.storage.save(slot)
+            elif action == RESTORE:
+                self.storage.load(slot)
+            elif action == REVERSE:
+                self.reverse.apply(start, end)
+
+    def apply_forward(self):
+        """Run the forward computation, taking checkpoints along the way."""
+        self._run(self._forward_steps)
+        self.forward.finalize()
+
+    def apply_reverse(self):
+        """
+        Run the reverse computation, rerunning forward segments from the
+        checkpoints as needed.
+        """
+        self._run(self._reverse_steps)
+        self.forward.finalize()
+        self.reverse.finalize()
+        self.storage.close()
+
+        nfwd = sum(i.end - i.start for i in self._forward_steps + self._reverse_steps
+                   if i.action == ADVANCE)
+        perf("Checkpointing: %d forward timesteps for %d reverse timesteps, "
+             "%d checkpoints of %.2f MB" % (nfwd, self.n_timesteps,
+                                            self.schedule.n_checkpoints,
+                                            self.storage.nbytes / 10**6))
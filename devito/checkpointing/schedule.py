@@ -0,0 +1,228 @@
+from collections import namedtuple
+
+from devito.tools import Tag
+
+__all__ = ['ADVANCE', 'TAKESHOT', 'RESTORE', 'REVERSE', 'Schedule',
+           'RevolveSchedule', 'UniformSchedule']
+
+
+class Action(Tag):
+    pass
+
+
+ADVANCE = Action('advance')  # Run the forward Operator over [start, end)
+TAKESHOT = Action('takeshot')  # Store the live state at `start` into `slot`
+RESTORE = Action('restore')  # Load the state at `start` from `slot`
+REVERSE = Action('reverse')  # Run the reverse Operator over [start, start+1)
+
+
+Step = namedtuple('Step', 'action start end slot')
+
+
+def binomial(s, r):
+    """
+    The number of timesteps that can be reversed with ``s`` checkpoints and
+    at most ``r`` forward recomputations of each timestep, that is the
+    binomial coefficient ``(s + r)! / (s! r!)``.
+    """
+    ret = 1
+    for i in range(1, min(s, r) + 1):
+        ret = ret * (s + r - i + 1) // i
+    return ret
+
+
+class Schedule(object):
+
+    """
+    Abstract base class for checkpointing schedules.
+
+    A Schedule is an iterable of Steps, that is (action, start, end, slot)
+    tuples, telling a Checkpointer how to interleave the forward and reverse
+    computations over ``n_timesteps`` timesteps. The Steps preceding the first
+    REVERSE constitute the forward sweep.
+
+    Parameters
+    ----------
+    n_timesteps : int
+        Number of timesteps of the forward computation.
+    """
+
+    def __init__(self, n_timesteps):
+        if n_timesteps < 1:
+            raise ValueError("Expected at least one timestep, got `%d`" % n_timesteps)
+        self.n_timesteps = n_timesteps
+
+    def __iter__(self):
+        self._capo = 0
+        return self._generate()
+
+    @property
+    def n_checkpoints(self):
+        """The number of checkpoint slots required by the Schedule."""
+        raise NotImplementedError
+
+    def _generate(self):
+        raise NotImplementedError
+
+    def _advance(self, start, end):
+        if start < end:
+            self._capo = end
+            yield Step(ADVANCE, start, end, None)
+
+    def _takeshot(self, t, slot):
+        yield Step(TAKESHOT, t, t, slot)
+
+    def _restore(self, t, slot):
+        if self._capo != t:
+            self._capo = t
+            yield Step(RESTORE, t, t, slot)
+
+    def _reverse(self, t, origin, slot):
+        """
+        Perform the reverse step ``t``. If necessary, the forward step ``t`` is
+        first recomputed starting from the state at ``origin``, stored in ``slot``.
+        """
+        if self._capo != t + 1:
+            if not origin <= self._capo <= t:
+                yield from self._restore(origin, slot)
+            yield from self._advance(self._capo, t + 1)
+        yield Step(REVERSE, t, t + 1, None)
+
+
+class RevolveSchedule(Schedule):
+
+    """
+    A binomial checkpointing Schedule, as described in: ::
+
+        A. Griewank and A. Walther, "Algorithm 799: revolve", ACM TOMS, 2000.
+
+    Given ``s`` checkpoints, the number of forward recomputations of each
+    timestep is kept as low as possible, that is to the smallest ``r`` such
+    that ``binomial(s, r) >= n_timesteps``.
+
+    Parameters
+    ----------
+    n_timesteps : int
+        Number of timesteps of the forward computation.
+    n_checkpoints : int, optional
+        Number of checkpoint slots. Defaults to the smallest number of
+        checkpoints for which no timestep is recomputed more than twice.
+    """
+
+    def __init__(self, n_timesteps, n_checkpoints=None):
+        super(RevolveSchedule, self).__init__(n_timesteps)
+        if n_checkpoints is None:
+            n_checkpoints = 1
+            while binomial(n_checkpoints, 2) < n_timesteps:
+                n_checkpoints += 1
+        if n_checkpoints < 1:
+            raise ValueError("Expected at least one checkpoint, got `%d`"
+                             % n_checkpoints)
+        self._n_checkpoints = min(n_checkpoints, n_timesteps)
+
+    @property
+    def n_checkpoints(self):
+        return self._n_checkpoints
+
+    @property
+    def n_recomputations(self):
+        """Max number of times a timestep is recomputed during the reverse sweep."""
+        r = 0
+        while binomial(self.n_checkpoints, r) < self.n_timesteps:
+            r += 1
+        return r
+
+    def _generate(self):
+        yield from self._takeshot(0, 0)
+        yield from self._treeverse(0, self.n_timesteps, 0)
+
+    def _treeverse(self, start, end, slot):
+        """
+        Reverse [start, end), with the state at ``start`` stored in ``slot``
+        and the slots above ``slot`` available.
+        """
+        s = self.n_checkpoints - slot
+        n = end - start
+        if n == 1:
+            yield from self._reverse(start, start, slot)
+        elif s == 1:
+            # Out of checkpoints -- quadratic recomputation
+            for t in reversed(range(start, end)):
+                yield from self._reverse(t, start, slot)
+        else:
+            r = 0
+            while binomial(s, r) < n:
+                r += 1
+            # Any split with `n - m <= beta(s-1, r)` and `m <= beta(s, r-1)` is
+            # optimal; we pick the one minimizing the initial advance
+            m = max(1, n - binomial(s - 1, r))
+            yield from self._restore(start, slot)
+            yield from self._advance(start, start + m)
+            yield from self._takeshot(start + m, slot + 1)
+            yield from self._treeverse(start + m, end, slot + 1)
+            yield from self._treeverse(start, start + m, slot)
+
+
+class UniformSchedule(Schedule):
+
+    """
+    A two-level uniform checkpointing Schedule.
+
+    In the forward sweep, a checkpoint is taken every ``interval`` timesteps.
+    In the reverse sweep, each interval is recomputed once, storing all of its
+    intermediate states, so that each timestep is recomputed at most once.
+
+    Parameters
+    ----------
+    n_timesteps : int
+        Number of timesteps of the forward computation.
+    interval : int, optional
+        Number of timesteps between two consecutive checkpoints of the forward
+        sweep. Defaults to ``sqrt(n_timesteps)``, which minimizes the number of
+        checkpoint slots.
+    """
+
+    def __init__(self, n_timesteps, interval=None):
+        super(UniformSchedule, self).__init__(n_timesteps)
+        if interval is None:
+            interval = max(1, int(round(n_timesteps ** 0.5)))
+        if interval < 1:
+            raise ValueError("Expected a positive interval, got `%d`" % interval)
+        self.interval = min(interval, n_timesteps)
+
+    @property
+    def n_segments(self):
+        return -(-self.n_timesteps // self.interval)
+
+    @property
+    def n_checkpoints(self):
+        return self.n_segments + self.interval - 1
+
+    def _generate(self):
+        bounds = [(i*self.interval, min((i+1)*self.interval, self.n_timesteps))
+                  for i in range(self.n_segments)]
+
+        # Forward sweep
+        for n, (start, end) in enumerate(bounds):
+            yield from self._takeshot(start, n)
+            yield from self._advance(start, end)
+
+        # Reverse sweep
+        for n, (start, end) in reversed(list(enumerate(bounds))):
+            if self._capo == end:
+                # The live state already follows the last step of the segment
+                yield from self._reverse(end - 1, start, n)
+                end -= 1
+            if start == end:
+                continue
+            # Recompute the segment, storing the state following each step
+            yield from self._restore(start, n)
+            slots = {}
+            for t in range(start + 1, end):
+                yield from self._advance(t - 1, t)
+                slots[t] = self.n_segments + t - start - 1
+                yield from self._takeshot(t, slots[t])
+            for t in reversed(range(start, end)):
+                if t + 1 in slots:
+                    yield from self._restore(t + 1, slots[t + 1])
+                yield from self._reverse(t, t, None)
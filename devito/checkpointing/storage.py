@@ -0,0 +1,201 @@
+from concurrent.futures import ThreadPoolExecutor
+from ctypes import memmove
+from tempfile import mkstemp
+import os
+
+import numpy as np
+
+from devito.logger import debug
+from devito.parameters import configuration
+
+__all__ = ['CheckpointStorage']
+
+
+class MemoryTier(object):
+
+    """
+    A contiguous chunk of memory holding ``nslots`` checkpoints of
+    ``nbytes`` bytes each.
+    """
+
+    is_Disk = False
+
+    def __init__(self, nslots, nbytes):
+        self.nslots = nslots
+        self.nbytes = nbytes
+        self._buffer = np.empty((nslots, nbytes), dtype=np.uint8)
+
+    def address(self, slot):
+        return self._buffer.ctypes.data + slot*self.nbytes
+
+    def close(self):
+        self._buffer = None
+
+
+class DiskTier(MemoryTier):
+
+    """
+    A memory-mapped file holding ``nslots`` checkpoints of ``nbytes`` bytes each.
+    """
+
+    is_Disk = True
+
+    def __init__(self, nslots, nbytes, path=None):
+        self.nslots = nslots
+        self.nbytes = nbytes
+        fd, self.filename = mkstemp(prefix='devito-checkpoints-', suffix='.bin',
+                                    dir=path)
+        os.close(fd)
+        self._buffer = np.memmap(self.filename, dtype=np.uint8, mode='w+',
+                                 shape=(nslots, nbytes))
+
+    def close(self):
+        self._buffer = None
+        try:
+            os.remove(self.filename)
+        except OSError:
+            pass
+
+
+class CheckpointStorage(object):
+
+    """
+    A two-level storage for the checkpoints of a set of DiscreteFunctions.
+
+    Checkpoints are snapshots of the allocated data (domain, halo and padding)
+    of the DiscreteFunctions, taken through raw ``memcpy``s, thus without any
+    intermediate copy. The first checkpoint slots reside in memory; if the
+    memory budget is exceeded, the remaining slots are backed by a file on disk.
+    Writes to the disk tier are staged in memory and then completed by a
+    background thread, to overlap I/O with computation.
+
+    Parameters
+    ----------
+    functions : list of DiscreteFunction
+        The DiscreteFunctions whose data is checkpointed.
+    n_checkpoints : int
+        Number of checkpoint slots.
+    memory : int, optional
+        Max number of bytes in the memory tier. Defaults to
+        ``configuration['checkpointing-memory']``, where 0 means unlimited.
+    path : str, optional
+        Directory for the disk tier. Defaults to the system temporary directory.
+    """
+
+    _nstaging = 2
+    """Number of staging buffers for asynchronous writes to the disk tier."""
+
+    def __init__(self, functions, n_checkpoints, memory=None, path=None):
+        self.functions = tuple(functions)
+        if not self.functions:
+            raise ValueError("Need at least one DiscreteFunction to checkpoint")
+
+        # The data buffers never move, so their addresses can be fetched once
+        self._live = [(i._data_allocated.ctypes.data, i._data_allocated.nbytes)
+                      for i in self.functions]
+        self.nbytes = sum(i for _, i in self._live)
+
+        if memory is None:
+            memory = configuration['checkpointing-memory']
+        if memory:
+            nmemory = min(n_checkpoints, int(memory // self.nbytes))
+        else:
+            nmemory = n_checkpoints
+        ndisk = n_checkpoints - nmemory
+
+        self._memory = MemoryTier(nmemory, self.nbytes)
+        if ndisk > 0:
+            debug("Checkpointing: %d slots in memory, %d slots on disk"
+                  % (nmemory, ndisk))
+            self._disk = DiskTier(ndisk, self.nbytes, path)
+            self._staging = [MemoryTier(1, self.nbytes) for _ in range(self._nstaging)]
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        else:
+            self._disk = None
+            self._staging = []
+            self._executor = None
+        self._pending = {}
+
+    def __del__(self):
+        self.close()
+
+    @property
+    def n_checkpoints(self):
+        return self._memory.nslots + (self._disk.nslots if self._disk else 0)
+
+    @property
+    def nbytes_memory(self):
+        return self._memory.nslots*self.nbytes
+
+    @property
+    def nbytes_disk(self):
+        return self._disk.nslots*self.nbytes if self._disk else 0
+
+    def _locate(self, slot):
+        if not 0 <= slot < self.n_checkpoints:
+            raise IndexError("Checkpoint slot `%d` out of range" % slot)
+        if slot < self._memory.nslots:
+            return self._memory, slot
+        else:
+            return self._disk, slot - self._memory.nslots
+
+    def _gather(self, dst):
+        for src, nbytes in self._live:
+            memmove(dst, src, nbytes)
+            dst += nbytes
+
+    def _scatter(self, src):
+        for dst, nbytes in self._live:
+            memmove(dst, src, nbytes)
+            src += nbytes
+
+    def _wait(self, slot):
+        try:
+            _, future = self._pending.pop(slot)
+            future.result()
+        except KeyError:
+            pass
+
+    def save(self, slot):
+        """Take a snapshot of the live data into the checkpoint ``slot``."""
+        tier, index = self._locate(slot)
+        if not tier.is_Disk:
+            self._gather(tier.address(index))
+            return
+
+        # Make sure no earlier write to `slot` is still in flight
+        self._wait(slot)
+
+        # Pick a free staging buffer; as the background thread completes writes
+        # in order, waiting for the oldest pending write frees up one buffer
+        busy = {id(i[0]) for i in self._pending.values()}
+        free = [i for i in self._staging if id(i) not in busy]
+        if not free:
+            self._wait(next(iter(self._pending)))
+            busy = {id(i[0]) for i in self._pending.values()}
+            free = [i for i in self._staging if id(i) not in busy]
+        staging = free[0]
+
+        self._gather(staging.address(0))
+
+        dst, src = tier.address(index), staging.address(0)
+        future = self._executor.submit(memmove, dst, src, self.nbytes)
+        self._pending[slot] = (staging, future)
+
+    def load(self, slot):
+        """Restore the live data from the checkpoint ``slot``."""
+        tier, index = self._locate(slot)
+        if tier.is_Disk:
+            self._wait(slot)
+        self._scatter(tier.address(index))
+
+    def close(self):
+        """Release all resources held by the storage."""
+        for slot in list(getattr(self, '_pending', [])):
+            self._wait(slot)
+        if getattr(self, '_executor', None) is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if getattr(self, '_disk', None) is not None:
+            self._disk.close()
+            self._disk = None
@@ -9,23 +9,27 @@ import warnings
 import sys
 
 import numpy.ctypeslib as npct
-from codepy.jit import compile_from_string
+from codepy.jit import CacheLockManager, CleanupManager, compile_from_string
 from codepy.toolchain import GCCToolchain
 
-from devito.archinfo import NVIDIAX, SKX, POWER8, POWER9
+from devito.archinfo import NVIDIAX, SKX, POWER8, POWER9, get_executable_id
 from devito.exceptions import CompilationError
 from devito.logger import debug, warning, error
 from devito.parameters import configuration
 from devito.tools import (as_tuple, change_directory, filter_ordered,
-                          memoized_meth, make_tempdir)
+                          memoized_meth, memoized_on_disk, make_tempdir)
 
 __all__ = ['GNUCompiler']
 
 
+@memoized_on_disk(get_executable_id)
 def sniff_compiler_version(cc):
     """
     Detect the compiler version.
 
+    The detected version is cached on disk, and only re-detected if the
+    compiler executable changes.
+
     Adapted from: ::
 
         https://github.com/OP2/PyOP2/
@@ -75,9 +79,13 @@ def sniff_compiler_version(cc):
     return ver
 
 
+@memoized_on_disk(get_executable_id)
 def sniff_mpi_distro(mpiexec):
     """
     Detect the MPI version.
+
+    The detected version is cached on disk, and only re-detected if the
+    ``mpiexec`` executable changes.
     """
     try:
         ver = check_output([mpiexec, "--version"]).decode("utf-8")
@@ -257,17 +265,30 @@ class Compiler(GCCToolchain):
         ----------
         soname : str
             Name of the .so file (w/o the suffix).
-        code : str
-            The source code to be JIT compiled.
+        code : str or callable
+            The source code to be JIT compiled, or a callable returning it. In
+            the latter case, ``soname`` must uniquely identify the source code
+            and the toolchain, and the source code is only generated if the
+            shared object isn't in the JIT cache already.
         """
         target = str(self.get_jit_dir().joinpath(soname))
         src_file = "%s.%s" % (target, self.src_ext)
 
+        # Spinlock in case of MPI
+        sleep_delay = 0 if configuration['mpi'] else 1
+
         cache_dir = self.get_codepy_dir().joinpath(soname[:7])
         if configuration['jit-backdoor'] is False:
             # Typically we end up here
             # Make a suite of cache directories based on the soname
             cache_dir.mkdir(parents=True, exist_ok=True)
+            if callable(code):
+                tic = time()
+                if self._is_cached(target, cache_dir, sleep_delay):
+                    toc = time()
+                    debug("%s: cache hit `%s` [%.2f s]" % (self, target, toc-tic))
+                    return
+                code = code()
         else:
             # Warning: dropping `code` on the floor in favor to whatever is written
             # within `src_file`
@@ -292,8 +313,6 @@ class Compiler(GCCToolchain):
             warnings.simplefilter('ignore')
 
             tic = time()
-            # Spinlock in case of MPI
-            sleep_delay = 0 if configuration['mpi'] else 1
             _, _, _, recompiled = compile_from_string(
                 self, target, code, src_file,
                 cache_dir=cache_dir,
@@ -306,6 +325,25 @@ class Compiler(GCCToolchain):
         else:
             debug("%s: cache hit `%s` [%.2f s]" % (self, src_file, toc-tic))
 
+    def _is_cached(self, target, cache_dir, sleep_delay):
+        """
+        True if the shared object ``target`` (w/o the suffix) has already been
+        JIT-compiled, False otherwise.
+        """
+        # The same lock as in codepy's ``compile_from_string``, so that we never
+        # see a shared object while it's being written by another process
+        cleanup_m = CleanupManager()
+        try:
+            CacheLockManager(cleanup_m, str(cache_dir), sleep_delay)
+            return path.isfile(target + self.so_ext)
+        finally:
+            cleanup_m.clean_up()
+
+    def _signature_items(self):
+        # Identifies the toolchain, as codepy's ``abi_id`` does, but without
+        # querying the compiler version again
+        return tuple(str(i) for i in [self, self.version] + self._cmdline([]))
+
     def __lookup_cmds__(self):
         self.CC = 'unknown'
         self.CXX = 'unknown'
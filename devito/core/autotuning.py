@@ -6,7 +6,7 @@ import resource
 import psutil
 
 from devito.archinfo import KNL
-from devito.dle import BlockDimension
+from devito.dle import BlockDimension, NTStores, PrefetchDistance, UnrollFactor
 from devito.ir import Backward, retrieve_iteration_tree
 from devito.logger import perf, warning as _warning
 from devito.mpi.distributed import MPI, MPINeighborhood
@@ -73,14 +73,19 @@ def autotune(operator, args, level, mode):
     trees = filter_ordered(retrieve_iteration_tree(roots), key=lambda i: i.root)
 
     # Detect the time-stepping Iteration; shrink its iteration range so that
-    # each autotuning run only takes a few iterations
-    steppers = {i for i in flatten(trees) if i.dim.is_Time}
+    # each autotuning run only takes a few iterations. With time blocking, the
+    # shrunk range must still fit the deepest time tile attempted
+    steppers = {i for i in flatten(trees)
+                if i.dim.is_Time and not isinstance(i.dim, BlockDimension)}
+    tblocked = any(isinstance(i.dim, BlockDimension) and i.dim.is_Time
+                   for i in flatten(trees))
+    squeezer = max([options['squeezer']] + (options['blockdepth'] if tblocked else []))
     if len(steppers) == 0:
         stepper = None
         timesteps = 1
     elif len(steppers) == 1:
         stepper = steppers.pop()
-        timesteps = init_time_bounds(stepper, at_args)
+        timesteps = init_time_bounds(stepper, at_args, squeezer)
         if timesteps is None:
             return args, {}
     else:
@@ -90,20 +95,29 @@ def autotune(operator, args, level, mode):
     # Perform autotuning
     timings = {}
     for n, tree in enumerate(trees):
-        blockable = [i.dim for i in tree if isinstance(i.dim, BlockDimension)]
+        # With multi-level blocking, only the outermost level is tuned, as the
+        # inner levels are clamped to the enclosing blocks anyway
+        blockable = [i.dim for i in tree if isinstance(i.dim, BlockDimension) and
+                     not isinstance(i.dim.parent, BlockDimension)]
 
         # Tunable arguments
         try:
             tunable = []
             tunable.append(generate_block_shapes(blockable, args, level))
-            tunable.append(generate_nthreads(operator.nthreads, args, level))
+            tunable.append([i + j for i, j in
+                            product(generate_nthreads(operator.nthreads, args, level),
+                                    generate_codegen(operator, args, level))])
             tunable = list(product(*tunable))
         except ValueError:
             # Some arguments are cumpolsory, otherwise autotuning is skipped
             continue
 
-        # Symbolic number of loop-blocking blocks per thread
-        nblocks_per_thread = calculate_nblocks(tree, blockable) / operator.nthreads
+        # Symbolic number of loop-blocking blocks per thread. Time-blocked trees
+        # are parallel within the tiles, so there's no such constraint
+        if tree[0].is_Parallel:
+            nblocks_per_thread = calculate_nblocks(tree, blockable) / operator.nthreads
+        else:
+            nblocks_per_thread = None
 
         for bs, nt in tunable:
             # Can we safely autotune over the given time range?
@@ -115,7 +129,8 @@ def autotune(operator, args, level, mode):
             at_args.update(dict(run))
 
             # Drop run if not at least one block per thread
-            if not configuration['develop-mode'] and nblocks_per_thread.subs(at_args) < 1:
+            if not configuration['develop-mode'] and nblocks_per_thread is not None \
+                    and nblocks_per_thread.subs(at_args) < 1:
                 continue
 
             # Make sure we remain within stack bounds, otherwise skip run
@@ -198,17 +213,18 @@ class Record(object):
         return self.time < other.time
 
 
-def init_time_bounds(stepper, at_args):
+def init_time_bounds(stepper, at_args, squeezer=None):
     if stepper is None:
         return
+    squeezer = options['squeezer'] if squeezer is None else squeezer
     dim = stepper.dim.root
     if stepper.direction is Backward:
-        at_args[dim.min_name] = at_args[dim.max_name] - options['squeezer']
+        at_args[dim.min_name] = at_args[dim.max_name] - squeezer
         if at_args[dim.max_name] < at_args[dim.min_name]:
             warning("too few time iterations; skipping")
             return False
     else:
-        at_args[dim.max_name] = at_args[dim.min_name] + options['squeezer']
+        at_args[dim.max_name] = at_args[dim.min_name] + squeezer
         if at_args[dim.min_name] > at_args[dim.max_name]:
             warning("too few time iterations; skipping")
             return False
@@ -269,6 +285,20 @@ def generate_block_shapes(blockable, args, level):
     if not blockable:
         raise ValueError
 
+    # The time-tile depths (time blocking) are tuned independently of the
+    # space block shapes
+    tblockable = [d for d in blockable if d.root.is_Time]
+    sblockable = [d for d in blockable if not d.root.is_Time]
+    if tblockable:
+        depths = [tuple((d.step.name, v) for d in tblockable)
+                  for v in options['blockdepth']]
+        max_depth = tuple((d.step.name, d.max_step.subs(args)) for d in tblockable)
+        depths = [i for i in depths if all(dict(i)[k] <= v for k, v in max_depth)]
+        if not sblockable:
+            return depths or [max_depth]
+        shapes = generate_block_shapes(sblockable, args, level)
+        return [i + j for i, j in product(depths or [max_depth], shapes)]
+
     # Max attemptable block shape
     max_bs = tuple((d.step.name, d.max_step.subs(args)) for d in blockable)
 
@@ -329,9 +359,36 @@ def generate_nthreads(nthreads, args, level):
     return filter_ordered(ret)
 
 
+def generate_codegen(operator, args, level):
+    # The nontemporal stores, the software prefetch distance and the unroll
+    # factor are not specific to any Iteration tree, so they are tuned along
+    # with the number of threads
+    ret = [()]
+    for p in operator.parameters:
+        if isinstance(p, NTStores):
+            values = [args[p.name], 1 - args[p.name]]
+            ret = [i + ((p.name, v),) for i in ret for v in values]
+        elif isinstance(p, PrefetchDistance):
+            values = [args[p.name]]
+            if level in ['aggressive', 'max']:
+                values.extend(options['pfdistance'])
+            ret = [i + ((p.name, v),) for i in ret for v in filter_ordered(values)]
+        elif isinstance(p, UnrollFactor):
+            # Unroll-and-jam may well be counterproductive, so the original
+            # Iterations (i.e., an unroll factor of 1) are always tried too
+            values = [args[p.name], 1]
+            if level in ['aggressive', 'max']:
+                values.extend(options['unroll'])
+            ret = [i + ((p.name, v),) for i in ret for v in filter_ordered(values)]
+    return ret
+
+
 options = {
     'squeezer': 4,
     'blocksize': sorted({8, 16, 24, 32, 40, 64, 128}),
+    'blockdepth': [2, 4, 8],
+    'pfdistance': [1, 2, 4, 8],
+    'unroll': [1, 2, 4],
     'stack_limit': resource.getrlimit(resource.RLIMIT_STACK)[0] / 4
 }
 """Autotuning options."""
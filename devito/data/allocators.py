@@ -14,7 +14,7 @@ from devito.tools import dtype_to_ctype
 
 __all__ = ['ALLOC_FLAT', 'ALLOC_NUMA_LOCAL', 'ALLOC_NUMA_ANY',
            'ALLOC_KNL_MCDRAM', 'ALLOC_KNL_DRAM', 'ALLOC_GUARD',
-           'default_allocator']
+           'ExternalAllocator', 'default_allocator']
 
 
 class MemoryAllocator(object):
@@ -25,6 +25,7 @@ class MemoryAllocator(object):
 
     is_Posix = False
     is_Numa = False
+    is_External = False
 
     _attempted_init = False
     lib = None
@@ -300,6 +301,130 @@ class NumaAllocator(MemoryAllocator):
         return self._node == 'local'
 
 
+class ExternalAllocator(MemoryAllocator):
+
+    """
+    A "memory allocator" adopting an externally owned buffer, rather than
+    allocating new memory. No data is copied, so the buffer must already be
+    laid out as the allocated data of the Function adopting it, that is,
+    in C order, including the halo and padding regions (see
+    ``shape_allocated``). Further, the buffer must be aligned to
+    ``guaranteed_alignment`` bytes, as the generated code relies on it.
+
+    Parameters
+    ----------
+    buffer : numpy.ndarray or buffer-like or int or PyCapsule
+        The external buffer. This can be either a C-contiguous numpy.ndarray,
+        any object exposing the buffer interface (e.g., a memoryview, an
+        mmap.mmap), a raw pointer (an int) or a PyCapsule wrapping a raw pointer.
+    nbytes : int, optional
+        The size of the buffer in bytes. Only required for raw pointers and
+        PyCapsules.
+    owner : object, optional
+        Any object whose lifetime determines that of the buffer, for example
+        a PyCapsule whose destructor releases the memory pointed to by a raw
+        pointer. A reference to ``owner`` is held as long as the buffer is in
+        use. Unnecessary with a PyCapsule ``buffer``, as that is the owner.
+
+    Notes
+    -----
+    An ExternalAllocator can only be used by a single DiscreteFunction.
+
+    Examples
+    --------
+    Adopting an anonymous memory map, which is page-aligned
+
+    >>> import mmap
+    >>> import numpy as np
+    >>> from devito import Grid, Function, ExternalAllocator
+    >>> grid = Grid(shape=(4, 4))
+    >>> shape = Function(name='f', grid=grid, space_order=1).shape_allocated
+    >>> shape
+    (6, 6)
+    >>> buffer = mmap.mmap(-1, 6*6*4)
+    >>> f = Function(name='f', grid=grid, space_order=1,
+    ...              allocator=ExternalAllocator(buffer))
+    >>> f.data[0, 0] = 2.
+    >>> np.frombuffer(buffer, dtype=np.float32).reshape(shape)[1, 1]
+    2.0
+    """
+
+    is_External = True
+
+    def __init__(self, buffer, nbytes=None, owner=None):
+        self._dtype = None
+        self._shape = None
+
+        if type(buffer).__name__ == 'PyCapsule':
+            owner = buffer
+            buffer = capsule_to_pointer(buffer)
+        if isinstance(buffer, int):
+            if nbytes is None:
+                raise ValueError("`nbytes` must be provided along with a raw pointer")
+            buffer = (ctypes.c_byte*nbytes).from_address(buffer)
+        elif isinstance(buffer, np.ndarray):
+            if not buffer.flags.c_contiguous:
+                raise ValueError("Cannot adopt a non C-contiguous numpy.ndarray")
+            self._dtype = buffer.dtype
+            self._shape = buffer.shape
+
+        try:
+            self._buffer = np.frombuffer(buffer, dtype=np.uint8)
+        except (TypeError, ValueError) as e:
+            raise ValueError("Cannot adopt buffer of type `%s` (%s)"
+                             % (type(buffer), e))
+        self._owner = owner
+
+    @property
+    def address(self):
+        """The address of the external buffer."""
+        return self._buffer.ctypes.data
+
+    @property
+    def nbytes(self):
+        """The size of the external buffer in bytes."""
+        return self._buffer.nbytes
+
+    def alloc(self, shape, dtype):
+        """
+        Adopt the external buffer, without any copy.
+
+        Raises
+        ------
+        ValueError
+            If the buffer size, shape, dtype or alignment are incompatible
+            with the requested allocation.
+        """
+        nbytes = int(reduce(mul, shape, 1))*np.dtype(dtype).itemsize
+        if self._dtype is not None and self._dtype != np.dtype(dtype):
+            raise ValueError("Expected a buffer of dtype `%s`, got `%s`"
+                             % (np.dtype(dtype), self._dtype))
+        if self._shape is not None and len(self._shape) > 1 and \
+                tuple(self._shape) != tuple(shape):
+            raise ValueError("Expected a buffer of shape %s, including halo and "
+                             "padding, got %s" % (tuple(shape), tuple(self._shape)))
+        if self.nbytes != nbytes:
+            raise ValueError("Expected a buffer of %d bytes, for a shape %s "
+                             "including halo and padding, got %d bytes"
+                             % (nbytes, tuple(shape), self.nbytes))
+        if self.address % self.guaranteed_alignment != 0:
+            raise ValueError("Expected a buffer aligned to %d bytes, got address "
+                             "`%#x`" % (self.guaranteed_alignment, self.address))
+
+        # NOTE: `self._buffer` remains alive as long as the returned view does,
+        # while `self._owner` remains alive as long as the Data object built
+        # on top of the returned view, which holds a reference to `self`
+        return (self._buffer.view(dtype).reshape(shape), None)
+
+    def _alloc_C_libcall(self, size, ctype):
+        # Never reached, as `alloc` is overridden
+        raise RuntimeError("An ExternalAllocator never allocates memory, it only "
+                           "adopts the buffer it was created with")
+
+    def free(self, *args):
+        return
+
+
 ALLOC_GUARD = GuardAllocator(1048576)
 ALLOC_FLAT = PosixAllocator()
 ALLOC_KNL_DRAM = NumaAllocator(0)
@@ -308,6 +433,20 @@ ALLOC_NUMA_ANY = NumaAllocator('any')
 ALLOC_NUMA_LOCAL = NumaAllocator('local')
 
 
+# Private prototypes, so that the functions exposed by `ctypes.pythonapi`
+# (shared by all users) are left untouched
+_capsule_get_name = ctypes.PYFUNCTYPE(ctypes.c_char_p, ctypes.py_object)(
+    ('PyCapsule_GetName', ctypes.pythonapi))
+_capsule_get_pointer = ctypes.PYFUNCTYPE(ctypes.c_void_p, ctypes.py_object,
+                                         ctypes.c_char_p)(
+    ('PyCapsule_GetPointer', ctypes.pythonapi))
+
+
+def capsule_to_pointer(capsule):
+    """The raw pointer, as an int, wrapped by a PyCapsule."""
+    return _capsule_get_pointer(capsule, _capsule_get_name(capsule))
+
+
 def infer_knl_mode():
     path = os.path.join('/sys', 'bus', 'node', 'devices', 'node1')
     return 'flat' if os.path.exists(path) else 'cache'
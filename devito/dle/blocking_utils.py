@@ -1,24 +1,37 @@
+from collections import OrderedDict
 from itertools import groupby
 
 import cgen as c
 import numpy as np
 from cached_property import cached_property
-
-from devito.ir.iet import (Expression, Iteration, List, FindAdjacent,
-                           FindNodes, IsPerfectIteration, Transformer,
-                           compose_nodes, retrieve_iteration_tree)
+import sympy
+from sympy import And, Max, Min, Or
+from sympy.core.cache import cacheit
+
+from devito.cgen_utils import INT
+from devito.ir.iet import (Call, Conditional, Expression, Iteration, List, Node,
+                           SEQUENTIAL, FindAdjacent, FindNodes, IsPerfectIteration,
+                           Transformer, compose_nodes, retrieve_iteration_tree)
+from devito.ir.clusters import Cluster
+from devito.ir.support import Backward, IntervalGroup, Scope
 from devito.logger import warning
-from devito.symbolics import as_symbol, xreplace_indices
-from devito.tools import as_tuple, flatten
+from devito.symbolics import CondEq, retrieve_indexed, xreplace_indices
+from devito.tools import (as_tuple, filter_ordered, flatten, is_integer, memoized_meth,
+                          prod)
 from devito.types import IncrDimension, Scalar
 
-__all__ = ['BlockDimension', 'fold_blockable_tree', 'unfold_blocked_tree']
+__all__ = ['BlockDimension', 'BlockShapeHeuristic', 'fold_blockable_tree',
+           'unfold_blocked_tree', 'sink_invariant_trees', 'time_block_tree']
 
 
 def fold_blockable_tree(iet, blockinner=True):
     """
     Create IterationFolds from sequences of nested Iterations.
     """
+    # Iterations within already blocked trees (e.g., time-blocked) are left alone
+    blocked = set(flatten(i for i in retrieve_iteration_tree(iet)
+                          if any(isinstance(j.dim, BlockDimension) for j in i)))
+
     mapper = {}
     for k, sequence in FindAdjacent(Iteration).visit(iet).items():
         # Group based on Dimension
@@ -32,6 +45,8 @@ def fold_blockable_tree(iet, blockinner=True):
             # Pre-condition: they all must be perfect iterations
             if any(not IsPerfectIteration().visit(j) for j in i):
                 continue
+            if any(j in blocked for j in i):
+                continue
             # Only retain consecutive trees having same depth
             trees = [retrieve_iteration_tree(j)[0] for j in i]
             handle = []
@@ -59,9 +74,10 @@ def fold_blockable_tree(iet, blockinner=True):
                 continue
             # Perform folding
             for j in pairwise_folds:
+                # Note: the folds must retain the original execution order
                 r, remainder = j[0], j[1:]
                 folds = [(tuple(y-x for x, y in zip(i.offsets, r.offsets)), i.nodes)
-                         for i in remainder]
+                         for i in reversed(remainder)]
                 mapper[r] = IterationFold(folds=folds, **r.args)
                 for k in remainder:
                     mapper[k] = None
@@ -72,10 +88,14 @@ def fold_blockable_tree(iet, blockinner=True):
     return iet
 
 
-def unfold_blocked_tree(iet):
+def unfold_blocked_tree(iet, scope='stack'):
     """
     Unfold nested IterationFolds.
 
+    The temporary Arrays computed by the unfolded trees are shrunk to the block
+    shape and given the memory ``scope`` -- either 'stack' or 'heap'; in both
+    cases, each thread gets its own copy.
+
     Examples
     --------
 
@@ -107,7 +127,7 @@ def unfold_blocked_tree(iet):
     mapper = {}
     for tree in candidates:
         trees = list(zip(*[i.unfold() for i in tree]))
-        trees = optimize_unfolded_tree(trees[:-1], trees[-1])
+        trees = optimize_unfolded_tree(trees[:-1], trees[-1], scope)
         mapper[tree[0]] = List(body=trees)
 
     # Insert the unfolded Iterations in the Iteration/Expression tree
@@ -129,7 +149,83 @@ def is_foldable(nodes):
                and i.properties == main.properties for i in nodes)
 
 
-def optimize_unfolded_tree(unfolded, root):
+def sink_invariant_trees(iet):
+    """
+    Move the Iteration trees computing time-invariant temporaries, such as those
+    introduced by the DSE, right before the Iteration trees reading them within
+    the time-stepping Iterations. The time-invariant temporaries are thus
+    recomputed at every timestep, but as the moved trees are then folded along
+    with the reading trees, they can eventually be shrunk to the block shape.
+
+    A tree is moved only if all of the trees reading its temporaries are adjacent
+    and can be folded with it.
+    """
+    def accesses(exprs):
+        return {i.function for e in exprs for i in retrieve_indexed(e.expr)}
+
+    while True:
+        trees = retrieve_iteration_tree(iet)
+        exprs = [FindNodes(Expression).visit(i.inner) for i in trees]
+        reads = [accesses(i) for i in exprs]
+        calls = FindNodes(Call).visit(iet)
+        everything = FindNodes(Expression).visit(iet)
+
+        for n, tree in enumerate(trees):
+            # Only perfect, PARALLEL trees computing Arrays, outside of any
+            # time-stepping Iteration, are moved
+            arrays = {e.write for e in exprs[n] if e.is_tensor}
+            if not arrays or not all(i.is_Array and i._mem_heap for i in arrays):
+                continue
+            if not all(i.is_Parallel for i in tree):
+                continue
+            if not IsPerfectIteration().visit(tree.root):
+                continue
+            # The read data must not be written anywhere else, and vice versa
+            others = {e.write for e in everything if e not in exprs[n]}
+            if reads[n] & others:
+                continue
+
+            # The reading trees must be adjacent, foldable trees within the same
+            # sequential Iteration
+            readers = [k for k in range(len(trees)) if k != n and arrays & reads[k]]
+            users = [e for e in everything if arrays & accesses([e])]
+            if set(users) - set().union(*[exprs[k] for k in readers + [n]]):
+                continue
+            if any(arrays & set(i.functions) for i in calls):
+                continue
+            readers = [trees[k] for k in readers]
+            if not readers or any(len(t) <= len(tree) for t in readers):
+                continue
+            roots = [t[-len(tree)] for t in readers]
+            prefixes = {tuple(t[:-len(tree)]) for t in readers}
+            if len(prefixes) != 1 or not any(i.is_Sequential for i in prefixes.pop()):
+                continue
+            subtrees = [t[-len(tree):] for t in readers]
+            if any(not is_foldable(i) for i in zip(tree, *subtrees)):
+                continue
+            if any(not IsPerfectIteration().visit(i) for i in roots):
+                continue
+            parents = [(i, c) for i in FindNodes(Node).visit(iet) for c in i.children
+                       if isinstance(c, tuple) and roots[0] in c]
+            if len(parents) != 1:
+                continue
+            parent, children = parents[0]
+            index = children.index(roots[0])
+            if set(roots) != set(children[index:index + len(set(roots))]):
+                continue
+
+            # Move the tree
+            sunk = children[:index] + (tree.root,) + children[index:]
+            handle = parent._rebuild(*[sunk if c is children else c
+                                       for c in parent.children],
+                                     **parent.args_frozen)
+            iet = Transformer({tree.root: None, parent: handle}).visit(iet)
+            break
+        else:
+            return iet
+
+
+def optimize_unfolded_tree(unfolded, root, scope='stack'):
     """
     Transform folded trees to reduce the memory footprint.
 
@@ -161,8 +257,13 @@ def optimize_unfolded_tree(unfolded, root):
                 i' = i - x_block
                 j' = j - j_block
                 ... = ... tmp[i',j'] ...
+
+    The shrunk temporaries are given the memory ``scope`` -- either 'stack' or
+    'heap'; in both cases, each thread gets its own copy.
     """
     processed = []
+    shrunk = []
+    mapper = {}
     for i, tree in enumerate(unfolded):
         assert len(tree) == len(root)
 
@@ -172,51 +273,301 @@ def optimize_unfolded_tree(unfolded, root):
         writes = [j.write for j in exprs if j.is_tensor]
         if not all(j.is_Array for j in writes):
             processed.append(compose_nodes(tree))
-            root = compose_nodes(root)
             continue
 
         # Shrink the iteration space
         modified_tree = []
-        modified_root = []
         modified_dims = {}
-        mapper = {}
+        subs = {}
         for t, r in zip(tree, root):
             udim0 = IncrDimension(t.dim, t.symbolic_min, 1, "%ss%d" % (t.index, i))
             modified_tree.append(t._rebuild(limits=(0, t.limits[1] - t.limits[0], t.step),
                                             uindices=t.uindices + (udim0,)))
 
-            mapper[t.dim] = udim0
+            subs[t.dim] = udim0
 
-            udim1 = IncrDimension(t.dim, 0, 1, "%ss%d" % (t.index, i))
-            modified_root.append(r._rebuild(uindices=r.uindices + (udim1,)))
+            # The iteration variables within /root/ are shared by all folded trees
+            mapper.setdefault(r.dim, IncrDimension(t.dim, 0, 1, "%ss%d" % (t.index, i)))
 
             d = r.limits[0]
             assert isinstance(d, BlockDimension)
-            modified_dims[d.parent] = d
+            modified_dims[d.root] = d
 
-        # Temporary arrays can now be moved onto the stack
+        # Temporary arrays can now be shrunk to the block shape
         for w in writes:
             dims = tuple(modified_dims.get(d, d) for d in w.dimensions)
             shape = tuple(d.symbolic_size for d in dims)
-            w.update(shape=shape, dimensions=dims, scope='stack')
+            w.update(shape=shape, dimensions=dims, scope=scope)
+        shrunk.extend(writes)
 
-        # Substitute iteration variables within the folded trees
+        # Substitute iteration variables within the folded trees. The temporaries
+        # computed by this or the previous folded trees are already accessed
+        # through the iteration variables within a block
         modified_tree = compose_nodes(modified_tree)
-        replaced = xreplace_indices([j.expr for j in exprs], mapper, only_rhs=True)
+        replaced = xreplace_indices([j.expr for j in exprs], subs,
+                                    lambda j: j.function not in shrunk, True)
         subs = [j._rebuild(expr=k) for j, k in zip(exprs, replaced)]
         processed.append(Transformer(dict(zip(exprs, subs))).visit(modified_tree))
 
-        # Introduce the new iteration variables within /root/
-        modified_root = compose_nodes(modified_root)
-        exprs = FindNodes(Expression).visit(modified_root)
-        candidates = [as_symbol(j.output) for j in subs]
-        replaced = xreplace_indices([j.expr for j in exprs], mapper, candidates)
+    # Introduce the new iteration variables within /root/
+    if shrunk:
+        root = [r._rebuild(uindices=r.uindices + (mapper[r.dim],)) for r in root]
+        root = compose_nodes(root)
+        exprs = FindNodes(Expression).visit(root)
+        replaced = xreplace_indices([j.expr for j in exprs], mapper,
+                                    lambda j: j.function in shrunk)
         subs = [j._rebuild(expr=k) for j, k in zip(exprs, replaced)]
-        root = Transformer(dict(zip(exprs, subs))).visit(modified_root)
+        root = Transformer(dict(zip(exprs, subs))).visit(root)
+    else:
+        root = compose_nodes(root)
 
     return processed + [root]
 
 
+def time_block_tree(iteration, key, blockinner=False):
+    """
+    Apply time blocking (or time skewing) to the time-stepping ``iteration``.
+
+    The time loop is tiled together with the outermost PARALLEL Iterations of
+    its loop nests. The tiles are skewed along space by the dependence distances
+    across timesteps, so that a tile can be advanced by several timesteps before
+    moving on to the next one, while the data it accesses is still in cache.
+
+    Parameters
+    ----------
+    iteration : Iteration
+        The sequential time-stepping Iteration.
+    key : int
+        A suffix for the names of the new BlockDimensions.
+    blockinner : bool, optional
+        True to block the innermost PARALLEL Iterations as well.
+
+    Returns
+    -------
+    The time-blocked Iteration tree and the newly introduced BlockDimensions.
+
+    Raises
+    ------
+    ValueError
+        If ``iteration`` cannot be time-blocked.
+
+    Examples
+    --------
+    Given the time loop: ::
+
+        for time = time_m to time_M
+          for x = x_m to x_M
+            for y = y_m to y_M
+              u[t1][x][y] = f(u[t0][x-2][y], u[t0][x+2][y], u[t2][x][y], ...)
+          for p = p_m to p_M
+            u[t1][g(p)][h(p)] += ...
+
+    ``x`` and ``y`` are skewed by ``s``, the dependence distance along space
+    over one timestep (2) plus the width of the sparse footprint along
+    ``x`` and ``y``. The sparse Iterations are executed, at each timestep,
+    only for the points falling within the tile: ::
+
+        for time_blk = time_m to time_M step time_blk_size
+          for x_blk = x_m to x_M + s*(time_blk_size-1) step x_blk_size
+            for y_blk = y_m to y_M + s*(time_blk_size-1) step y_blk_size
+              for time = time_blk to min(time_blk + time_blk_size - 1, time_M)
+                for x = max(x_m, x_blk - s*(time - time_blk)) to min(...)
+                  for y = max(y_m, y_blk - s*(time - time_blk)) to min(...)
+                    u[t1][x][y] = ...
+                for p = p_m to p_M
+                  if (g(p), h(p) within the tile at time)
+                    u[t1][g(p)][h(p)] += ...
+    """
+    root = iteration.dim.root
+
+    # The loop nests within the time loop, in program order
+    nests = filter_ordered(i[1] for i in retrieve_iteration_tree(iteration) if len(i) > 1)
+    if not nests:
+        raise ValueError("no loop nests within the time loop")
+    types = (Expression, Conditional, Call)
+    inner = set(flatten(FindNodes(types).visit(i) for i in nests))
+    if any(i not in inner for i in FindNodes(types).visit(iteration)):
+        raise ValueError("statements outside of the loop nests")
+    if any(FindNodes(Call).visit(i) for i in nests):
+        raise ValueError("calls within the loop nests")
+
+    # Stencil loop nests iterate over space, the others (e.g., sparse injection
+    # and interpolation) over non-space Dimensions
+    stencils = [i for i in nests if all(j.dim.root.is_Space and j.is_Affine
+                                        for j in FindNodes(Iteration).visit(i))]
+    sparse = [i for i in nests if i not in stencils]
+    if not stencils:
+        raise ValueError("no stencil loop nests")
+
+    # The space Iterations to be blocked must be the same in all stencil loop nests
+    tree = retrieve_iteration_tree(stencils[0])[0]
+    iterations = [i for i in tree if i.is_Parallel]
+    if not blockinner:
+        iterations = iterations[:-1]
+    if not iterations or list(tree[:len(iterations)]) != iterations:
+        raise ValueError("no blockable space Iterations")
+    dims = [i.dim for i in iterations]
+    bounds = [(i.symbolic_min, i.symbolic_max) for i in iterations]
+    for n in stencils:
+        if not IsPerfectIteration().visit(n):
+            raise ValueError("imperfect loop nest")
+        handle = retrieve_iteration_tree(n)[0][:len(dims)]
+        if [i.dim for i in handle] != dims or not all(i.is_Parallel for i in handle) or \
+                [(i.symbolic_min, i.symbolic_max) for i in handle] != bounds:
+            raise ValueError("loop nests over different space Iterations")
+
+    # Data dependence analysis. The ModuloDimensions are replaced by the logical
+    # time indices they stand for, so that the distances along time are known
+    subs = {i: i.origin for i in iteration.uindices if i.is_Modulo}
+    scope = Scope([e.expr.xreplace(subs) for n in stencils
+                   for e in FindNodes(Expression).visit(n)])
+    for f in scope.writes:
+        if f.is_Tensor and all(d.root is not root for d in f.indices):
+            raise ValueError("`%s` is overwritten at each timestep" % f.name)
+
+    # Distances (along time, along `dims`) of the dependences
+    distances = []
+    for dep in scope.d_all:
+        if dep.source.is_scalar:
+            continue
+        if len(dep.distance) < len(dep.findices):
+            raise ValueError("non-comparable accesses to `%s`" % dep.function.name)
+        mapper = {i.root: v for i, v in zip(dep.findices, dep.distance)}
+        distances.append((mapper.get(root, 0), [mapper.get(d.root, 0) for d in dims]))
+    # Buffered TimeFunctions also carry the dependences due to the slot reuse;
+    # that is, an access to a slot precedes the write to the same slot,
+    # `time_size` timesteps later
+    sign = -1 if iteration.direction is Backward else 1
+    for f, writes in scope.writes.items():
+        if not getattr(f, '_time_buffering', False):
+            continue
+        t = f.indices[f._time_position]
+        for w in writes:
+            for a in scope[f]:
+                delta = a[t] - w[t]
+                if not is_integer(delta):
+                    raise ValueError("non-constant accesses to `%s`" % f.name)
+                distances.append((sign*delta + f._time_size,
+                                  [_component(a, d) - _component(w, d) for d in dims]))
+
+    # A skew of `s` makes all dependences point forward in all tiled Dimensions,
+    # as long as `s*dt >= -dx` for all dependences with distance `(dt, dx)`
+    skews = [0]*len(dims)
+    for dt, v in distances:
+        if not is_integer(dt) or not all(is_integer(i) for i in v):
+            raise ValueError("non-constant dependence distances")
+        for k, i in enumerate(v):
+            if dt > 0:
+                skews[k] = max(skews[k], int(-(i // dt)))
+            elif i < 0:
+                raise ValueError("dependence against the blocking direction")
+
+    # The sparse loop nests must access the blocked DiscreteFunctions at points
+    # within a fixed distance of a single anchor (e.g., the grid point closest
+    # to the sparse point); they are then executed within the tile holding the
+    # farthest point. The skew is widened by the footprint so that the points
+    # within the tile are final and not yet consumed by the next timestep
+    footprints = []
+    widths = [0]*len(dims)
+    for n in sparse:
+        if len(FindNodes(Iteration).visit(n)) > 1:
+            raise ValueError("nested sparse Iterations")
+        points = [[] for _ in dims]
+        defs = {}
+        for e in FindNodes(Expression).visit(n):
+            if e.write.is_Tensor and all(d.root is not root for d in e.write.indices) \
+                    and any(d.root in [i.root for i in dims] for d in e.write.indices):
+                raise ValueError("`%s` is overwritten at each timestep" % e.write.name)
+            for indexed in retrieve_indexed(e.expr, mode='unique'):
+                f = indexed.function
+                for v, d in zip(points, dims):
+                    for i, (fd, index) in enumerate(zip(f.dimensions, indexed.indices)):
+                        if fd.root is not d.root:
+                            continue
+                        shift, anchor = _resolve(index, defs).as_coeff_Add()
+                        if not is_integer(shift):
+                            raise ValueError("non-constant access to `%s`" % f.name)
+                        v.append((anchor, int(shift) - f._offset_domain[i]))
+            if e.is_scalar:
+                defs[e.expr.lhs.name] = _resolve(e.expr.rhs, defs)
+        farthest = []
+        for i, v in enumerate(points):
+            anchors = set(a for a, _ in v)
+            if len(anchors) != 1:
+                raise ValueError("sparse accesses without a unique anchor")
+            offsets = [o for _, o in v]
+            widths[i] = max(widths[i], max(offsets) - min(offsets))
+            farthest.append(anchors.pop() + max(offsets))
+        footprints.append((n, farthest))
+    skews = [i + j for i, j in zip(skews, widths)]
+
+    # The BlockDimensions
+    tdim = BlockDimension(iteration.dim, name="%s%s_tblk" % (iteration.dim.name, key))
+    bdims = [BlockDimension(d, name="%s%s_tblk" % (d.name, key)) for d in dims]
+
+    # The number of timesteps since the beginning of the time tile. The clamped
+    # bounds are cast to int, or OpenMP would reject the resulting loops
+    if iteration.direction is Backward:
+        elapsed = tdim - iteration.dim
+        limits = (INT(Max(tdim - tdim.step + 1, iteration.symbolic_min)), tdim, 1)
+    else:
+        elapsed = iteration.dim - tdim
+        limits = (tdim, INT(Min(tdim + tdim.step - 1, iteration.symbolic_max)), 1)
+
+    # The tile bounds at the current timestep
+    lower = [b - s*elapsed for b, s in zip(bdims, skews)]
+    upper = [i + b.step - 1 for i, b in zip(lower, bdims)]
+
+    mapper = {}
+    for n in stencils:
+        tree = retrieve_iteration_tree(n)[0]
+        rebuilt = [i._rebuild([], limits=(INT(Max(i.symbolic_min, l)),
+                                          INT(Min(i.symbolic_max, u)), i.step),
+                              offsets=(0, 0))
+                   for i, l, u in zip(tree, lower, upper)]
+        mapper[n] = compose_nodes(rebuilt + [tree[len(dims) - 1].nodes])
+    for n, farthest in footprints:
+        # The first and last tiles also own the points outside of the domain
+        condition = []
+        for i, b, s, p, l, u in zip(iterations, bdims, skews, farthest, lower, upper):
+            last = b + b.step > i.symbolic_max + s*(tdim.step - 1)
+            condition.extend([Or(CondEq(b, i.symbolic_min), p >= l), Or(last, p <= u)])
+        mapper[n] = n._rebuild(nodes=Conditional(And(*condition), n.nodes))
+
+    # Construct the time-blocked tree
+    blocks = [Iteration([], tdim, (iteration.symbolic_min, iteration.symbolic_max,
+                                   tdim.step), direction=iteration.direction,
+                        properties=SEQUENTIAL)]
+    for i, b, s in zip(iterations, bdims, skews):
+        blimits = (i.symbolic_min, i.symbolic_max + s*(tdim.step - 1), b.step)
+        blocks.append(Iteration([], b, blimits, properties=SEQUENTIAL))
+    body = Transformer(mapper).visit(iteration)._rebuild(limits=limits, offsets=(0, 0))
+
+    return compose_nodes(blocks + [body]), [tdim] + bdims
+
+
+def _resolve(expr, defs):
+    """Replace the scalars in ``expr`` with their definitions in ``defs``."""
+    expr = expr.xreplace({i: defs[i.name] for i in expr.free_symbols if i.name in defs})
+    # The IET expressions are frozen (i.e., not re-evaluated upon replacement),
+    # so the nested additions must be flattened explicitly
+    terms = []
+    queue = [expr]
+    while queue:
+        i = queue.pop(0)
+        if i.is_Add:
+            queue.extend(i.args)
+        else:
+            terms.append(i)
+    return sympy.Add(*terms)
+
+
+def _component(vector, dim):
+    """The entry of the LabeledVector ``vector`` along ``dim``; 0 if absent."""
+    v = vector[dim]
+    return 0 if v is None else v
+
+
 class IterationFold(Iteration):
 
     """
@@ -275,8 +626,189 @@ class IterationFold(Iteration):
         return folds + as_tuple(root)
 
 
+class BlockShapeHeuristic(object):
+
+    """
+    Derive default block shapes from the cache hierarchy, the working set of a
+    blocked Iteration tree, and the number of threads.
+
+    At each blocking level, starting from the whole iteration space, the longest
+    side of the block is halved, rounding to powers of two, until the working
+    set of a block fits in the target capacity (and, at the outermost level,
+    until there are at least as many blocks as threads). The outer sides are
+    halved first on ties, so that the innermost, contiguous, side stays long.
+
+    Parameters
+    ----------
+    dims : tuple of Dimension
+        The blocked Dimensions, outermost first.
+    inner : tuple of Dimension
+        The Dimensions of the non-blocked Iterations within the blocks.
+    footprint : tuple
+        The data footprint of the blocked tree, as a tuple of 2-tuples
+        ``(itemsize, extents)``, one for each Function accessed within the tree.
+        ``extents`` is a tuple of 3-tuples ``(Dimension, lower, upper)``, that is
+        the Interval accessed along each Dimension.
+    capacities : tuple of int
+        The target working set size, in bytes, of each blocking level, outermost
+        first.
+    nthreads : str, optional
+        The name of the runtime argument providing the number of threads.
+    """
+
+    MIN_BLOCK = 8
+    """Block sides are never shrunk below this value."""
+
+    def __init__(self, dims, inner, footprint, capacities, nthreads=None):
+        self.dims = as_tuple(dims)
+        self.inner = as_tuple(inner)
+        self.footprint = as_tuple(footprint)
+        self.capacities = as_tuple(capacities)
+        self.nthreads = nthreads
+
+    def __repr__(self):
+        return "BlockShapeHeuristic[%s]" % ','.join(str(i) for i in self.dims)
+
+    def __eq__(self, other):
+        return isinstance(other, BlockShapeHeuristic) and self._key == other._key
+
+    def __hash__(self):
+        return hash(self._key)
+
+    @property
+    def _key(self):
+        return (self.dims, self.inner, self.footprint, self.capacities, self.nthreads)
+
+    @classmethod
+    def make(cls, dims, inner, exprs, caches, levels=1, nthreads=None):
+        """
+        Create a BlockShapeHeuristic for the blocked tree computing ``exprs``.
+        The working set is derived from the traffic of the Clusters the
+        Expressions stem from, while ``levels`` blocking levels target,
+        respectively, half of the L2 and of the L1 caches in ``caches``.
+        """
+        # Each Function is accounted once, over the union of its accesses
+        mapper = OrderedDict()
+        for e in exprs:
+            cluster = Cluster([e.expr], e.expr.ispace, e.expr.dspace)
+            for (f, _), intervals in cluster.traffic.items():
+                mapper.setdefault(f, []).append(intervals)
+        footprint = []
+        for f, v in mapper.items():
+            intervals = IntervalGroup.generate('union', *v)
+            extents = tuple((i.dim.root, i.lower, i.upper) for i in intervals
+                            if i.is_Defined)
+            footprint.append((np.dtype(f.dtype).itemsize, extents))
+
+        sizes = OrderedDict((i.level, i.size) for i in sorted(caches))
+        sizes = [sizes.get(2, max(sizes.values())), sizes.get(1, min(sizes.values()))]
+        capacities = [i // 2 for i in sizes[:levels]]
+
+        return BlockShapeHeuristic([d.root for d in dims], [d.root for d in inner],
+                                   footprint, capacities, nthreads)
+
+    def working_set(self, shape, sizes):
+        """
+        The working set, in bytes, of a block of shape ``shape``, given the
+        ``sizes`` of the non-blocked Dimensions.
+        """
+        ret = 0
+        for itemsize, extents in self.footprint:
+            npoints = 1
+            for d, lower, upper in extents:
+                if d in shape:
+                    npoints *= shape[d] + upper - lower
+                elif d in sizes:
+                    npoints *= sizes[d] + upper - lower
+                else:
+                    # E.g., the timeslots of a TimeFunction
+                    npoints *= upper - lower + 1
+            ret += itemsize*npoints
+        return ret
+
+    @memoized_meth
+    def shape(self, sizes, nthreads=1):
+        """
+        The block shape at each blocking level.
+
+        Parameters
+        ----------
+        sizes : tuple of int
+            The iteration space size along ``self.dims + self.inner``.
+        nthreads : int, optional
+            The number of threads sharing the blocks.
+        """
+        sizes = OrderedDict(zip(self.dims + self.inner, sizes))
+
+        ret = []
+        shape = OrderedDict((d, sizes[d]) for d in self.dims)
+        for n, capacity in enumerate(self.capacities):
+            nblocks = nthreads if n == 0 else 1
+            while True:
+                fits = self.working_set(shape, sizes) <= capacity
+                busy = prod([-(-sizes[d] // v) for d, v in shape.items()]) >= nblocks
+                if fits and busy:
+                    break
+                candidates = [d for d, v in shape.items() if v > self.MIN_BLOCK]
+                if not candidates:
+                    break
+                d = max(candidates, key=lambda i: shape[i])
+                shape[d] = max(2**(int(shape[d] - 1).bit_length() - 1), self.MIN_BLOCK)
+            ret.append(tuple(shape.values()))
+
+        return tuple(ret)
+
+    def default(self, d, level, args):
+        """The default block size along ``d`` at the given blocking ``level``."""
+        sizes = tuple(args[i.max_name] - args[i.min_name] + 1
+                      for i in self.dims + self.inner)
+        nthreads = args.get(self.nthreads, 1) if self.nthreads else 1
+        return self.shape(sizes, nthreads)[level][self.dims.index(d)]
+
+
 class BlockDimension(IncrDimension):
 
+    """
+    Dimension symbol representing the blocks of a given ``parent`` Dimension.
+
+    Parameters
+    ----------
+    parent : Dimension
+        The blocked Dimension. This is a BlockDimension itself with multi-level
+        blocking.
+    _min : int, optional
+        The minimum point of the sequence. Defaults to the parent's
+        symbolic minimum.
+    step : int, optional
+        The block size. Defaults to the symbolic size.
+    name : str, optional
+        To force a different Dimension name.
+    heuristic : BlockShapeHeuristic, optional
+        Used to pick the default block size. If not provided, defaults to 8.
+    level : int, optional
+        The blocking level, 0 being the outermost.
+    """
+
+    def __new__(cls, parent, _min=None, step=None, name=None, heuristic=None, level=0):
+        return BlockDimension.__xnew_cached_(cls, parent, _min, step, name,
+                                             heuristic, level)
+
+    def __new_stage2__(cls, parent, _min, step, name, heuristic, level):
+        newobj = IncrDimension.__new_stage2__(cls, parent, _min, step, name)
+        newobj._heuristic = heuristic
+        newobj._level = level
+        return newobj
+
+    __xnew_cached_ = staticmethod(cacheit(__new_stage2__))
+
+    @property
+    def heuristic(self):
+        return self._heuristic
+
+    @property
+    def level(self):
+        return self._level
+
     @cached_property
     def symbolic_min(self):
         return Scalar(name=self.min_name, dtype=np.int32, is_const=True)
@@ -285,9 +817,11 @@ class BlockDimension(IncrDimension):
     def _arg_names(self):
         return (self.step.name,) + self.parent._arg_names
 
-    def _arg_defaults(self, **kwargs):
-        # TODO: need a heuristic to pick a default block size
-        return {self.step.name: 8}
+    def _arg_defaults(self, args=None, **kwargs):
+        if self.heuristic is None or args is None:
+            return {self.step.name: 8}
+        else:
+            return {self.step.name: self.heuristic.default(self.root, self.level, args)}
 
     def _arg_values(self, args, interval, grid, **kwargs):
         if self.step.name in kwargs:
@@ -304,9 +838,12 @@ class BlockDimension(IncrDimension):
                         % (self.step.name, value, self.step.name))
                 return {self.step.name: 1}
         else:
-            value = self._arg_defaults()[self.step.name]
+            value = self._arg_defaults(args=args)[self.step.name]
             if value <= args[self.root.max_name] - args[self.root.min_name] + 1:
                 return {self.step.name: value}
             else:
                 # Avoid OOB
                 return {self.step.name: 1}
+
+    # Pickling support
+    _pickle_kwargs = IncrDimension._pickle_kwargs + ['heuristic', 'level']
@@ -5,13 +5,17 @@ import numpy as np
 import cgen as c
 from sympy import Function, Or
 
-from devito.ir import (Call, Conditional, Block, Expression, List, Prodder,
-                       FindSymbols, FindNodes, Return, COLLAPSED, Transformer,
+from devito.ir import (Call, Conditional, Block, Expression, Increment, Iteration, List,
+                       Prodder, FindSymbols, FindNodes, Return, COLLAPSED, Transformer,
                        IsPerfectIteration, retrieve_iteration_tree, filter_iterations)
+from devito.cgen_utils import Allocator, ccode
+from devito.data import FULL
+from devito.dle.blocking_utils import BlockDimension
+from devito.ir.equations import DummyEq
 from devito.symbolics import CondEq
 from devito.parameters import configuration
-from devito.tools import is_integer, prod
-from devito.types import Constant, Symbol
+from devito.tools import as_tuple, filter_ordered, flatten, is_integer, prod
+from devito.types import Constant, Scalar, Symbol
 
 
 def ncores():
@@ -35,10 +39,11 @@ class NThreads(Constant):
 
 class ParallelRegion(Block):
 
-    def __init__(self, body, nthreads, private=None):
+    def __init__(self, body, nthreads, private=None, scratch=None):
         header = ParallelRegion._make_header(nthreads, private)
         super(ParallelRegion, self).__init__(header=header, body=body)
         self.nthreads = nthreads
+        self.scratch = as_tuple(scratch)
 
     @classmethod
     def _make_header(cls, nthreads, private):
@@ -49,6 +54,11 @@ class ParallelRegion(Block):
     def functions(self):
         return (self.nthreads,)
 
+    @property
+    def defines(self):
+        # The thread-private Arrays allocated on the heap within the region
+        return self.scratch
+
 
 class SingleThreadProdder(Conditional, Prodder):
 
@@ -82,6 +92,13 @@ class Ompizer(object):
     compilation time (e.g., this may happen when DefaultDimensions are used).
     """
 
+    REDUCTION_ARRAY_SIZE = 2**16
+    """
+    Max size, in bytes, of an array target of an array reduction. Each thread
+    gets a private copy of the array, usually on its stack; beyond this size,
+    atomic increments are used instead.
+    """
+
     lang = {
         'for-static': lambda i: c.Pragma('omp for collapse(%d) schedule(static)' % i),
         'for-static-1': lambda i: c.Pragma('omp for collapse(%d) schedule(static,1)' % i),
@@ -107,16 +124,121 @@ class Ompizer(object):
         else:
             self.key = lambda i: i.is_ParallelRelaxed and not i.is_Vectorizable
         self.nthreads = NThreads(name='nthreads')
+        self.nreductions = 0
 
-    def _make_atomic_incs(self, partree):
+    def _make_reductions(self, partree):
+        """
+        Turn the increments of a PARALLEL_IF_ATOMIC tree into OpenMP reductions,
+        whenever possible, rather than protecting each of them with an `omp atomic`
+        pragma. The target of an increment may be:
+
+            * loop-invariant (e.g., `n[0] += ...`): the partial sums are accumulated
+              into a Scalar, reduced through a `reduction(+:...)` clause, and
+              eventually added to the target after the parallel region;
+            * a small array whose indices only vary along the sequential Iterations
+              within the tree (e.g., `h[y] += ...` with a parallel `x` loop): the
+              whole array is reduced through an array-section `reduction` clause.
+
+        In all other cases (e.g., indirect accesses), atomic increments are used.
+
+        Returns
+        -------
+        The transformed tree, plus the Expressions initializing and combining the
+        Scalar accumulators, to be placed before and after the parallel region.
+        """
         if not partree.is_ParallelAtomic:
-            return partree
-        # Introduce one `omp atomic` pragma for each increment
+            return partree, [], []
+
         exprs = FindNodes(Expression).visit(partree)
-        exprs = [i for i in exprs if i.is_Increment and not i.is_ForeignExpression]
-        mapper = {i: List(header=self.lang['atomic'], body=i) for i in exprs}
-        partree = Transformer(mapper).visit(partree)
-        return partree
+        incs = [i for i in exprs if i.is_Increment and not i.is_ForeignExpression]
+
+        # The parallel Iterations, i.e. the collapsed ones
+        parallel = set()
+        for tree in retrieve_iteration_tree(partree):
+            for n, i in enumerate(tree):
+                parallel.update(tree[n:n + i.ncollapsed])
+        nested = [i for i in FindNodes(Iteration).visit(partree)
+                  if i.ncollapsed and i is not partree]
+
+        # The symbols varying within `partree`
+        iterations = FindNodes(Iteration).visit(partree)
+        varying = set(flatten((i.dim,) + i.uindices for i in iterations))
+        varying.update(i.write for i in exprs if i.is_scalar)
+        sequential = {i.dim for i in iterations if i not in parallel}
+
+        scalars = OrderedDict()
+        arrays = OrderedDict()
+        atomics = []
+        for e in incs:
+            target = e.output
+            f = e.write
+            if e.is_scalar:
+                if f not in varying:
+                    atomics.append(e)
+                # Otherwise, a thread-private temporary, no need for atomics
+                continue
+            symbols = set(flatten(i.free_symbols for i in target.indices))
+            if f in e.reads:
+                # E.g., `u[x] += u[x-1]`
+                atomics.append(e)
+            elif not symbols & varying:
+                scalars.setdefault(target, []).append(e)
+            elif symbols & varying <= sequential and \
+                    prod(f.shape_allocated)*np.dtype(f.dtype).itemsize <= \
+                    Ompizer.REDUCTION_ARRAY_SIZE and \
+                    not any(e in FindNodes(Expression).visit(i) for i in nested):
+                arrays.setdefault(f, []).append(e)
+            else:
+                atomics.append(e)
+        # Reductions are possible only if the target is solely accessed by increments
+        for f, v in list(arrays.items()):
+            if any(i not in v for i in exprs if f in i.functions):
+                atomics.extend(arrays.pop(f))
+        # Scalar reductions must also use the same target
+        for target, v in list(scalars.items()):
+            if any(i not in v for i in exprs if target.function in i.functions):
+                atomics.extend(scalars.pop(target))
+
+        # Scalar accumulators
+        mapper = {}
+        inits = []
+        combines = []
+        reductions = OrderedDict()
+        for target, v in scalars.items():
+            acc = Scalar(name='%s_r%d' % (target.function.name, self.nreductions),
+                         dtype=target.function.dtype)
+            self.nreductions += 1
+            for e in v:
+                mapper[e] = e._rebuild(expr=e.expr.xreplace({target: acc}))
+                reductions.setdefault(e, []).append(acc.name)
+            inits.append(Expression(DummyEq(acc, 0.)))
+            combines.append(Increment(DummyEq(target, acc)))
+        # Array sections
+        for f, v in arrays.items():
+            if f.is_Array:
+                shape = f.symbolic_shape
+            else:
+                shape = [f._C_get_field(FULL, d).size for d in f.dimensions]
+            section = ''.join('[0:%s]' % ccode(i) for i in shape)
+            for e in v:
+                reductions.setdefault(e, []).append('%s%s' % (f.name, section))
+        # Atomics
+        mapper.update({e: List(header=self.lang['atomic'], body=e) for e in atomics})
+
+        # Add the `reduction` clauses to the parallel Iterations
+        def clause(i):
+            handle = filter_ordered(flatten(reductions.get(e, [])
+                                            for e in FindNodes(Expression).visit(i)))
+            if not handle:
+                return i.pragmas
+            return i.pragmas[:-1] + (c.Pragma('%s reduction(+:%s)' %
+                                              (i.pragmas[-1].value, ','.join(handle))),)
+        for i in nested:
+            mapper[i] = Transformer(mapper).visit(i)._rebuild(pragmas=clause(i))
+        pragmas = clause(partree)
+        partree = Transformer(mapper).visit(partree)._rebuild(pragmas=pragmas)
+
+        return partree, inits, combines
 
     def _make_atomic_prodders(self, partree):
         # Atomic-ize any single-thread Prodders in the parallel tree
@@ -180,10 +302,20 @@ class Ompizer(object):
 
     def _make_parregion(self, partree):
         # Build the `omp-parallel` region
-        private = [i for i in FindSymbols().visit(partree)
-                   if i.is_Array and i._mem_stack]
-        private = sorted(set([i.name for i in private]))
-        return ParallelRegion(partree, self.nthreads, private)
+        arrays = [i for i in FindSymbols().visit(partree) if i.is_Array]
+        private = sorted(set([i.name for i in arrays if i._mem_stack]))
+
+        # The block-local Arrays on the heap are allocated by each thread
+        scratch = filter_ordered(i for i in arrays if i._mem_heap and
+                                 any(isinstance(d, BlockDimension) for d in i.dimensions))
+        if scratch:
+            allocator = Allocator()
+            for i in scratch:
+                allocator.push_heap(i)
+            decls, allocs, frees = zip(*allocator.onheap)
+            partree = List(header=decls + allocs, body=partree, footer=frees)
+
+        return ParallelRegion(partree, self.nthreads, private, scratch)
 
     def _make_guard(self, partree, collapsed):
         # Do not enter the parallel region if the step increment is 0; this
@@ -255,8 +387,8 @@ class Ompizer(object):
             # Nested parallelism
             partree = self._make_nested_partree(partree)
 
-            # Ensure increments are atomic
-            partree = self._make_atomic_incs(partree)
+            # Ensure increments are either reductions or atomic
+            partree, inits, combines = self._make_reductions(partree)
 
             # Ensure single-thread prodders are atomic
             partree = self._make_atomic_prodders(partree)
@@ -267,6 +399,9 @@ class Ompizer(object):
             # Protect the parallel region in case of 0-valued step increments
             parregion = self._make_guard(parregion, collapsed)
 
+            if inits or combines:
+                parregion = List(body=inits + [parregion] + combines)
+
             mapper[root] = parregion
 
         iet = Transformer(mapper).visit(iet)
@@ -5,20 +5,29 @@ from functools import partial
 from time import time
 
 import cgen
+from sympy import And, Min
 
-from devito.cgen_utils import ccode
-from devito.dle.blocking_utils import (BlockDimension, fold_blockable_tree,
-                                       unfold_blocked_tree)
+from devito.cgen_utils import INT, ccode
+from devito.dle.blocking_utils import (BlockDimension, BlockShapeHeuristic,
+                                       fold_blockable_tree, unfold_blocked_tree,
+                                       sink_invariant_trees, time_block_tree)
 from devito.dle.parallelizer import Ompizer
+from devito.dle.streaming_utils import (NTStores, PrefetchDistance, prefetch_streams,
+                                        stream_stores)
+from devito.dle.unrolling_utils import UnrollFactor, unroll_and_jam
 from devito.exceptions import DLEException
-from devito.ir.iet import (Call, Expression, Iteration, List, HaloSpot, Prodder, PARALLEL,
-                           AFFINE, FindSymbols, FindNodes, FindAdjacent, MapNodes,
-                           Transformer, IsPerfectIteration, compose_nodes, make_efunc,
-                           filter_iterations, retrieve_iteration_tree)
-from devito.logger import perf_adv
+from devito.ir.equations import DummyEq
+from devito.ir.iet import (Call, Conditional, Expression, Iteration, List, HaloSpot,
+                           Prodder, PARALLEL, SEQUENTIAL, AFFINE, FindSymbols,
+                           FindAdjacent, IETIndex, MapNodes, Transformer, XSubs,
+                           IsPerfectIteration, compose_nodes, make_efunc,
+                           filter_iterations, is_wrappable)
+from devito.logger import perf, perf_adv
 from devito.mpi import HaloExchangeBuilder
 from devito.parameters import configuration
+from devito.symbolics import xreplace_indices
 from devito.tools import DAG, as_tuple, filter_ordered, flatten
+from devito.types import ModuloDimension
 
 __all__ = ['PlatformRewriter', 'CPU64Rewriter', 'Intel64Rewriter', 'PowerRewriter',
            'ArmRewriter', 'SpeculativeRewriter', 'DeviceOffloadingRewriter',
@@ -67,7 +76,7 @@ def process(func, state):
     queue = ['root']
     while queue:
         caller = queue.pop(0)
-        callees = FindNodes(Call).visit(state._efuncs[caller])
+        callees = IETIndex.lookup(state._efuncs[caller]).find(Call)
         for callee in filter_ordered([i.name for i in callees]):
             if callee in state._efuncs:  # Exclude foreign Calls, e.g., MPI calls
                 try:
@@ -104,10 +113,10 @@ def process(func, state):
             extif = lambda v: list(v) + [e for e in args if e not in v]
             stack = [i] + dag.all_downstreams(i)
             for n in stack:
-                efunc = state._efuncs[n]
-                calls = [c for c in FindNodes(Call).visit(efunc) if c.name in stack]
+                index = IETIndex.lookup(state._efuncs[n])
+                calls = [c for c in index.find(Call) if c.name in stack]
                 mapper = {c: c._rebuild(arguments=extif(c.arguments)) for c in calls}
-                efunc = Transformer(mapper).visit(efunc)
+                efunc = index.transform(mapper)
                 if efunc.is_Callable:
                     efunc = efunc._rebuild(parameters=extif(efunc.parameters))
                 state._efuncs[n] = efunc
@@ -183,14 +192,60 @@ class PlatformRewriter(AbstractRewriter):
     @dle_pass
     def _loop_wrapping(self, iet):
         """
-        Emit a performance warning if WRAPPABLE Iterations are found,
+        Shrink by one slot the modulo buffers of the TimeFunctions whose oldest
+        timeslot may be overwritten by the newest one (see ``shrinkbuffers``).
+        Otherwise, emit a performance warning if WRAPPABLE Iterations are found,
         as these are a symptom that unnecessary memory is being allocated.
         """
-        for i in FindNodes(Iteration).visit(iet):
-            if not i.is_Wrappable:
-                continue
-            perf_adv("Functions using modulo iteration along Dimension `%s` "
-                     "may safely allocate a one slot smaller buffer" % i.dim)
+        index = IETIndex.lookup(iet)
+
+        if not self.params['shrinkbuffers'] or self.params['mpi']:
+            for i in index.find(Iteration):
+                if not i.is_Wrappable:
+                    continue
+                perf_adv("Functions using modulo iteration along Dimension `%s` "
+                         "may safely allocate a one slot smaller buffer" % i.dim)
+            return iet, {}
+
+        iterations = [i for i in index.find(Iteration)
+                      if any(d.is_Modulo for d in i.uindices)]
+        exprs = set(flatten(index.find(Expression, i) for i in iterations))
+
+        # Only the TimeFunctions not allocated yet, and not used by other Operators,
+        # may change their data layout, and only if they are accessed within
+        # modulo Iterations only
+        candidates = filter_ordered(f for i in iterations for f in FindSymbols().visit(i)
+                                    if f.is_TimeFunction and f._time_buffering_default
+                                    and f._data is None and f._time_size_mutable
+                                    and f._time_size > 1)
+        shrinkable = [f for f in candidates
+                      if all(e in exprs for e in index.find(Expression)
+                             if f in e.functions)
+                      and all(is_wrappable(f, i) for i in iterations)]
+
+        mapper = {}
+        for i in iterations:
+            processed = i
+            uindices = list(i.uindices)
+            for f in shrinkable:
+                size = f._time_size
+                subs = OrderedDict([(d, ModuloDimension(d.parent, d.offset, size - 1))
+                                    for d in i.uindices
+                                    if d.is_Modulo and d.modulo == size])
+                replacer = partial(xreplace_indices, mapper=subs,
+                                   key=lambda j, f=f: j.function is f)
+                processed = XSubs(replacer=replacer).visit(processed)
+                uindices.extend(subs.values())
+            # Drop the ModuloDimensions no longer in use
+            used = set(FindSymbols('free-symbols').visit(processed.nodes))
+            uindices = [d for d in filter_ordered(uindices) if d in used]
+            mapper[i] = processed._rebuild(uindices=uindices)
+        iet = index.transform(mapper)
+
+        for f in shrinkable:
+            perf("Buffer of `%s` shrunk to %d timeslots" % (f.name, f._time_size - 1))
+            f._set_time_size(f._time_size - 1)
+
         return iet, {}
 
     @dle_pass
@@ -204,8 +259,9 @@ class PlatformRewriter(AbstractRewriter):
           that will be required by later Iterations.
         """
         # Drop USELESS HaloSpots
-        mapper = {hs: hs.body for hs in FindNodes(HaloSpot).visit(iet) if hs.is_Useless}
-        iet = Transformer(mapper, nested=True).visit(iet)
+        index = IETIndex.lookup(iet)
+        mapper = {hs: hs.body for hs in index.find(HaloSpot) if hs.is_Useless}
+        iet = index.transform(mapper, nested=True)
 
         # Handle `hoistable` HaloSpots
         mapper = {}
@@ -215,7 +271,7 @@ class PlatformRewriter(AbstractRewriter):
             mapper[root] = root._rebuild(halo_scheme=root.halo_scheme.union(halo_schemes))
             mapper.update({hs: hs._rebuild(halo_scheme=hs.halo_scheme.drop(hs.hoistable))
                            for hs in halo_spots[1:]})
-        iet = Transformer(mapper, nested=True).visit(iet)
+        iet = IETIndex.lookup(iet).transform(mapper, nested=True)
 
         # At this point, some HaloSpots may have become empty (i.e., requiring
         # no communications), hence they can be removed
@@ -224,8 +280,9 @@ class PlatformRewriter(AbstractRewriter):
         #   <A>                       <A>
         # <HaloSpot()>      ---->   <B>
         #   <B>
-        mapper = {i: i.body for i in FindNodes(HaloSpot).visit(iet) if i.is_empty}
-        iet = Transformer(mapper, nested=True).visit(iet)
+        index = IETIndex.lookup(iet)
+        mapper = {i: i.body for i in index.find(HaloSpot) if i.is_empty}
+        iet = index.transform(mapper, nested=True)
 
         # Finally, we try to move HaloSpot-free Iteration nests within HaloSpot
         # subtrees, to overlap as much computation as possible. The HaloSpot-free
@@ -240,6 +297,7 @@ class PlatformRewriter(AbstractRewriter):
         # output of <A>; thus, if we do computation/communication overlap over <A>
         # *and* want to embed <B> within the HaloSpot, then <B>'s iteration space
         # will have to be split as well. For this, <B> must be affine.
+        index = IETIndex.lookup(iet)
         mapper = {}
         for v in FindAdjacent((HaloSpot, Iteration)).visit(iet).values():
             for g in v:
@@ -248,16 +306,46 @@ class PlatformRewriter(AbstractRewriter):
                     if i.is_HaloSpot:
                         root = i
                         mapper[root] = [root.body]
-                    elif root and all(j.is_Affine for j in FindNodes(Iteration).visit(i)):
+                    elif root and all(j.is_Affine for j in index.find(Iteration, i)):
                         mapper[root].append(i)
                         mapper[i] = None
                     else:
                         root = None
         mapper = {k: k._rebuild(body=List(body=v)) if v else v for k, v in mapper.items()}
-        iet = Transformer(mapper).visit(iet)
+        iet = index.transform(mapper)
 
         return iet, {}
 
+    @dle_pass
+    def _time_blocking(self, iet):
+        """
+        Apply time blocking (time skewing) to sequential time-stepping Iterations,
+        so that multiple timesteps are computed over a tile of the iteration space
+        before moving on to the next one.
+        """
+        blockinner = bool(self.params.get('blockinner'))
+
+        index = IETIndex.lookup(iet)
+        mapper = {}
+        block_dims = []
+        for i in index.find(Iteration):
+            if not (i.dim.is_Time and i.is_Sequential):
+                continue
+            if any(j in mapper for j in index.ancestors(i)):
+                # Nested time loops
+                continue
+            try:
+                mapper[i], dims = time_block_tree(i, len(mapper), blockinner)
+            except ValueError as e:
+                perf_adv("Couldn't apply time blocking to the Iteration over `%s` (%s)"
+                         % (i.dim, e))
+                continue
+            block_dims.extend(dims)
+
+        iet = index.transform(mapper)
+
+        return iet, {'dimensions': block_dims}
+
     @dle_pass
     def _loop_blocking(self, iet):
         """
@@ -265,20 +353,31 @@ class PlatformRewriter(AbstractRewriter):
         """
         blockinner = bool(self.params.get('blockinner'))
         blockalways = bool(self.params.get('blockalways'))
+        blocklevels = min(max(int(self.params.get('blocklevels', 1)), 1), 2)
+        scratch = self.params.get('scratch', 'stack')
+        nthreads = 'nthreads' if self.params.get('openmp') else None
+
+        # Recompute the time-invariant temporaries within each block
+        if self.params.get('blocklocal'):
+            iet = sink_invariant_trees(iet)
 
         # Make sure loop blocking will span as many Iterations as possible
         iet = fold_blockable_tree(iet, blockinner)
 
+        index = IETIndex.lookup(iet)
         mapper = {}
         efuncs = []
         block_dims = []
-        for tree in retrieve_iteration_tree(iet):
+        for tree in index.iteration_trees:
             # Is the Iteration tree blockable ?
             iterations = filter_iterations(tree, lambda i: i.is_Parallel)
             if not blockinner:
                 iterations = iterations[:-1]
             if len(iterations) <= 1:
                 continue
+            if any(isinstance(i.dim, BlockDimension) for i in tree):
+                # Already blocked, e.g. by `_time_blocking`
+                continue
             root = iterations[0]
             if not blockalways:
                 # Heuristically bypass loop blocking if we think `tree`
@@ -297,11 +396,19 @@ class PlatformRewriter(AbstractRewriter):
                 # Don't know how to block non-perfect nests
                 continue
 
+            # The default block shape depends on the working set of `tree`
+            inner = [i.dim for i in tree[tree.index(iterations[-1]) + 1:]]
+            heuristic = BlockShapeHeuristic.make([i.dim for i in iterations], inner,
+                                                 index.find(Expression, root),
+                                                 self.platform.caches, blocklevels,
+                                                 nthreads)
+
             # Apply loop blocking to `tree`
             interb = []
             intrab = []
             for i in iterations:
-                d = BlockDimension(i.dim, name="%s%d_blk" % (i.dim.name, len(mapper)))
+                d = BlockDimension(i.dim, name="%s%d_blk" % (i.dim.name, len(mapper)),
+                                   heuristic=heuristic)
                 block_dims.append(d)
                 # Build Iteration over blocks
                 properties = (PARALLEL,) + ((AFFINE,) if i.is_Affine else ())
@@ -309,9 +416,30 @@ class PlatformRewriter(AbstractRewriter):
                 # Build Iteration within a block
                 intrab.append(i._rebuild([], limits=(d, d+d.step-1, 1), offsets=(0, 0)))
 
+            # Multi-level blocking: each level blocks the blocks of the outer level
+            nested = []
+            outer = interb
+            for n in range(1, blocklevels):
+                level = []
+                for bi, i in zip(outer, iterations):
+                    d = BlockDimension(bi.dim, name="%s%d_blk%d" % (i.dim.name,
+                                                                    len(mapper), n),
+                                       heuristic=heuristic, level=n)
+                    block_dims.append(d)
+                    limits = (bi.dim, bi.dim + bi.dim.step - 1, d.step)
+                    level.append(Iteration([], d, limits, properties=bi.properties))
+                nested.extend(level)
+                outer = level
+            if nested:
+                # Iterations within a block must not exceed the enclosing blocks
+                intrab = [i._rebuild(limits=(bi.dim, INT(Min(bi.dim + bi.dim.step - 1,
+                                                             bi.dim.parent +
+                                                             bi.dim.parent.step - 1)), 1))
+                          for i, bi in zip(intrab, outer)]
+
             # Construct the blocked tree
-            blocked = compose_nodes(interb + intrab + [iterations[-1].nodes])
-            blocked = unfold_blocked_tree(blocked)
+            blocked = compose_nodes(interb + nested + intrab + [iterations[-1].nodes])
+            blocked = unfold_blocked_tree(blocked, scratch)
 
             # Promote to a separate Callable
             dynamic_parameters = flatten((bi.dim, bi.dim.symbolic_size) for bi in interb)
@@ -337,7 +465,7 @@ class PlatformRewriter(AbstractRewriter):
 
             mapper[root] = List(body=body)
 
-        iet = Transformer(mapper).visit(iet)
+        iet = index.transform(mapper)
 
         return iet, {'dimensions': block_dims, 'efuncs': efuncs,
                      'args': [i.step for i in block_dims]}
@@ -350,13 +478,14 @@ class PlatformRewriter(AbstractRewriter):
         """
         sync_heb = HaloExchangeBuilder('basic')
         user_heb = HaloExchangeBuilder(self.params['mpi'])
+        index = IETIndex.lookup(iet)
         mapper = {}
-        for i, hs in enumerate(FindNodes(HaloSpot).visit(iet)):
+        for i, hs in enumerate(index.find(HaloSpot)):
             heb = user_heb if hs.is_Overlappable else sync_heb
             mapper[hs] = heb.make(hs, i)
         efuncs = sync_heb.efuncs + user_heb.efuncs
         objs = sync_heb.objs + user_heb.objs
-        iet = Transformer(mapper, nested=True).visit(iet)
+        iet = index.transform(mapper, nested=True)
 
         return iet, {'includes': ['mpi.h'], 'efuncs': efuncs, 'args': objs}
 
@@ -368,8 +497,9 @@ class PlatformRewriter(AbstractRewriter):
         """
         ignore_deps = as_tuple(self._backend_compiler_pragma('ignore-deps'))
 
+        index = IETIndex.lookup(iet)
         mapper = {}
-        for tree in retrieve_iteration_tree(iet):
+        for tree in index.iteration_trees:
             vector_iterations = [i for i in tree if i.is_Vectorizable]
             for i in vector_iterations:
                 aligned = [j for j in FindSymbols('symbolics').visit(i)
@@ -382,7 +512,49 @@ class PlatformRewriter(AbstractRewriter):
                     simd = as_tuple(Ompizer.lang['simd-for'])
                 mapper[i] = i._rebuild(pragmas=i.pragmas + ignore_deps + simd)
 
-        processed = Transformer(mapper).visit(iet)
+        processed = index.transform(mapper)
+
+        return processed, {}
+
+    @dle_pass
+    def _colour_injection(self, iet):
+        """
+        Turn the PARALLEL_IF_ATOMIC Iterations over the points of a SparseFunction
+        (e.g., source injection) into a sequential Iteration over conflict-free
+        colours, each of which is a PARALLEL Iteration over a subset of the points
+        whose injection supports do not overlap. The colouring plan is computed,
+        and cached, by the SparseFunction at runtime; within a colour, points are
+        visited in the order of their position on the grid.
+        """
+        index = IETIndex.lookup(iet)
+        mapper = {}
+        for i in index.find(Iteration):
+            if not i.is_ParallelAtomic or any(j in mapper for j in index.ancestors(i)):
+                continue
+            sparse = filter_ordered(f for f in FindSymbols().visit(i)
+                                    if f.is_SparseFunction and f._sparse_dim is i.dim)
+            if len(sparse) != 1:
+                continue
+            perm, offsets = sparse[0]._colouring
+            p = i.dim
+            c = offsets.indices[0]
+            k = perm.indices[0]
+
+            # The points in the colour `c`, which are guarded as the user may have
+            # restricted the iteration space of `p`
+            body = [Expression(DummyEq(p, perm.indexed[k])),
+                    Conditional(And(p >= i.symbolic_min, p <= i.symbolic_max),
+                                i.nodes)]
+            body = Iteration(body, k, (k.symbolic_min, k.symbolic_max, 1),
+                             properties=PARALLEL)
+
+            body = [Expression(DummyEq(k.symbolic_min, offsets.indexed[c])),
+                    Expression(DummyEq(k.symbolic_max, offsets.indexed[c + 1] - 1)),
+                    body]
+            mapper[i] = Iteration(body, c, (c.symbolic_min, c.symbolic_max - 1, 1),
+                                  properties=SEQUENTIAL)
+
+        processed = index.transform(mapper)
 
         return processed, {}
 
@@ -394,14 +566,111 @@ class PlatformRewriter(AbstractRewriter):
         """
         return self._node_parallelizer.make_parallel(iet)
 
+    @dle_pass
+    def _unroll_jam(self, iet):
+        """
+        Unroll-and-jam the PARALLEL Iterations immediately enclosing the
+        vectorizable Iterations, so that the values loaded by adjacent outer
+        iterations (e.g., the neighbours in a high-order stencil) are reused
+        from registers (see ``unroll_and_jam``). The number of unroll-and-jammed
+        Iterations is given by the ``unroll`` option; the unroll factor is the
+        runtime argument ``ufactor``, which is subject to autotuning.
+        """
+        nlevels = min(max(int(self.params.get('unroll', 1)), 1), 2)
+        switch = UnrollFactor(name='ufactor')
+
+        index = IETIndex.lookup(iet)
+        mapper = {}
+        for tree in index.iteration_trees:
+            if not tree[-1].is_Vectorizable:
+                continue
+            # Fall back to fewer levels if, e.g., the outer candidate is the
+            # OpenMP-parallel Iteration
+            for n in reversed(range(1, nlevels + 1)):
+                v = unroll_and_jam(list(tree), n, switch)
+                if v is not None:
+                    mapper[tree[-n - 1]] = v
+                    break
+        if not mapper:
+            return iet, {}
+        processed = index.transform(mapper)
+
+        return processed, {'args': [switch]}
+
+    @dle_pass
+    def _nontemporal_stores(self, iet):
+        """
+        Generate nontemporal stores (i.e., non-cached stores) for the DiscreteFunctions
+        written within vectorizable Iterations. With backend compilers providing
+        a pragma for this, such as the Intel compiler, the pragma is used. Otherwise,
+        if the target ISA provides nontemporal store instructions, these are emitted
+        through compiler intrinsics (see ``stream_stores``); in this case, the
+        nontemporal stores may be switched off at runtime via the ``ntstores``
+        argument, which is thus subject to autotuning.
+        """
+        pragma = self._backend_compiler_pragma('ntstores')
+        fence = self._backend_compiler_pragma('storefence')
+        if pragma and fence:
+            builder = lambda i: List(header=pragma, body=i) if i.is_Vectorizable else None
+            includes = []
+            args = []
+        else:
+            switch = NTStores(name='ntstores')
+            builder = lambda i: stream_stores(i, self.platform, switch)
+            fence = cgen.Statement('_mm_sfence()')
+            includes = ['immintrin.h', 'stdint.h']
+            args = [switch]
+
+        # The nontemporal stores are weakly ordered, hence a fence is required
+        # once out of the parallel Iterations
+        index = IETIndex.lookup(iet)
+        mapper = OrderedDict()
+        for tree in index.iteration_trees:
+            v = builder(tree[-1])
+            if v is None:
+                continue
+            root = filter_iterations(tree, lambda i: i.is_Parallel) or tree
+            mapper.setdefault(root[0], {})[tree[-1]] = v
+        if not mapper:
+            return iet, {}
+        mapper = {k: List(body=Transformer(v).visit(k), footer=fence)
+                  for k, v in mapper.items()}
+        processed = index.transform(mapper)
+
+        return processed, {'includes': includes, 'args': args}
+
+    @dle_pass
+    def _prefetch(self, iet):
+        """
+        Add software prefetches for the rows of the DiscreteFunctions read within
+        vectorizable Iterations (see ``prefetch_streams``). The prefetch distance
+        is the runtime argument ``pfdistance``, which is subject to autotuning.
+        """
+        distance = PrefetchDistance(name='pfdistance')
+
+        index = IETIndex.lookup(iet)
+        mapper = {}
+        for tree in index.iteration_trees:
+            if len(tree) < 2:
+                continue
+            v = prefetch_streams(tree[-1], tree[-2], self.platform, distance)
+            if v is not None:
+                mapper[tree[-1]] = List(body=[v, tree[-1]])
+        if not mapper:
+            return iet, {}
+        processed = index.transform(mapper)
+
+        return processed, {'args': [distance]}
+
     @dle_pass
     def _hoist_prodders(self, iet):
         """
         Move Prodders within the outer levels of an Iteration tree.
         """
+        index = IETIndex.lookup(iet)
         mapper = {}
-        for tree in retrieve_iteration_tree(iet):
-            for prodder in FindNodes(Prodder).visit(tree.root):
+        for tree in index.iteration_trees:
+            for prodder in index.find(Prodder, tree.root):
                 if prodder._periodic:
                     try:
                         key = lambda i: isinstance(i.dim, BlockDimension)
@@ -413,7 +682,7 @@ class PlatformRewriter(AbstractRewriter):
                                                                   candidate.nodes))
                     mapper[prodder] = None
 
-        iet = Transformer(mapper, nested=True).visit(iet)
+        iet = index.transform(mapper, nested=True)
 
         return iet, {}
 
@@ -425,12 +694,24 @@ class CPU64Rewriter(PlatformRewriter):
     def _pipeline(self, state):
         self._avoid_denormals(state)
         self._optimize_halospots(state)
+        if self.params['shrinkbuffers']:
+            self._loop_wrapping(state)
         if self.params['mpi']:
             self._dist_parallelize(state)
+        elif self.params['blocktime']:
+            self._time_blocking(state)
         self._loop_blocking(state)
         self._simdize(state)
+        if self.params['colouring']:
+            self._colour_injection(state)
         if self.params['openmp']:
             self._node_parallelize(state)
+        if self.params['unroll']:
+            self._unroll_jam(state)
+        if self.params['prefetch']:
+            self._prefetch(state)
+        if self.params['ntstores']:
+            self._nontemporal_stores(state)
         self._hoist_prodders(state)
 
 
@@ -493,41 +774,23 @@ class SpeculativeRewriter(CPU64Rewriter):
         self._loop_wrapping(state)
         if self.params['mpi']:
             self._dist_parallelize(state)
+        elif self.params['blocktime']:
+            self._time_blocking(state)
         self._loop_blocking(state)
         self._simdize(state)
+        if self.params['colouring']:
+            self._colour_injection(state)
         if self.params['openmp']:
             self._node_parallelize(state)
         self._minimize_remainders(state)
+        if self.params['unroll']:
+            self._unroll_jam(state)
+        if self.params['prefetch']:
+            self._prefetch(state)
+        if self.params['ntstores']:
+            self._nontemporal_stores(state)
         self._hoist_prodders(state)
 
-    @dle_pass
-    def _nontemporal_stores(self, nodes):
-        """
-        Add compiler-specific pragmas and instructions to generate nontemporal
-        stores (ie, non-cached stores).
-        """
-        pragma = self._backend_compiler_pragma('ntstores')
-        fence = self._backend_compiler_pragma('storefence')
-        if not pragma or not fence:
-            return {}
-
-        mapper = {}
-        for tree in retrieve_iteration_tree(nodes):
-            for i in tree:
-                if i.is_Parallel:
-                    mapper[i] = List(body=i, footer=fence)
-                    break
-        processed = Transformer(mapper).visit(nodes)
-
-        mapper = {}
-        for tree in retrieve_iteration_tree(processed):
-            for i in tree:
-                if i.is_Vectorizable:
-                    mapper[i] = List(header=pragma, body=i)
-        processed = Transformer(mapper).visit(processed)
-
-        return processed, {}
-
     @dle_pass
     def _minimize_remainders(self, iet):
         """
@@ -537,15 +800,16 @@ class SpeculativeRewriter(CPU64Rewriter):
         # The innermost dimension is the one that might get padded
         p_dim = -1
 
+        index = IETIndex.lookup(iet)
         mapper = {}
-        for tree in retrieve_iteration_tree(iet):
+        for tree in index.iteration_trees:
             vector_iterations = [i for i in tree if i.is_Vectorizable]
             if not vector_iterations or len(vector_iterations) > 1:
                 continue
             root = vector_iterations[0]
 
             # Padding
-            writes = [i.write for i in FindNodes(Expression).visit(root)
+            writes = [i.write for i in index.find(Expression, root)
                       if i.write.is_Array]
             padding = []
             for i in writes:
@@ -590,7 +854,7 @@ class SpeculativeRewriter(CPU64Rewriter):
 
             mapper[tree[0]] = List(header=init, body=compose_nodes(rebuilt))
 
-        processed = Transformer(mapper).visit(iet)
+        processed = index.transform(mapper)
 
         return processed, {}
 
@@ -602,10 +866,15 @@ class CustomRewriter(SpeculativeRewriter):
         'optcomms': SpeculativeRewriter._optimize_halospots,
         'wrapping': SpeculativeRewriter._loop_wrapping,
         'blocking': SpeculativeRewriter._loop_blocking,
+        'timeblocking': SpeculativeRewriter._time_blocking,
         'openmp': SpeculativeRewriter._node_parallelize,
         'mpi': SpeculativeRewriter._dist_parallelize,
         'simd': SpeculativeRewriter._simdize,
+        'colouring': SpeculativeRewriter._colour_injection,
         'minrem': SpeculativeRewriter._minimize_remainders,
+        'unroll': SpeculativeRewriter._unroll_jam,
+        'prefetch': SpeculativeRewriter._prefetch,
+        'ntstores': SpeculativeRewriter._nontemporal_stores,
         'prodders': SpeculativeRewriter._hoist_prodders
     }
 
@@ -0,0 +1,250 @@
+from collections import OrderedDict
+
+import numpy as np
+from sympy import And, Function, Min, Mod, Ne
+
+from devito.cgen_utils import INT, UINTP
+from devito.ir.equations import DummyEq
+from devito.ir.iet import (Call, Conditional, Expression, Iteration, List, FindNodes,
+                           Transformer)
+from devito.symbolics import Byref, CondEq, IntDiv, retrieve_indexed
+from devito.tools import filter_ordered
+from devito.types import Array, Constant, DefaultDimension, Dimension, Scalar
+
+__all__ = ['NTStores', 'PrefetchDistance', 'stream_stores', 'prefetch_streams']
+
+
+class NTStores(Constant):
+
+    """
+    Runtime switch enabling the nontemporal stores (1) or the regular stores (0).
+    """
+
+    @classmethod
+    def default_value(cls):
+        return 1
+
+    def __new__(cls, **kwargs):
+        return super(NTStores, cls).__new__(cls, name=kwargs['name'], dtype=np.int32,
+                                            value=NTStores.default_value())
+
+
+class PrefetchDistance(Constant):
+
+    """
+    The software prefetch distance, as a number of iterations of the loop
+    enclosing the prefetched rows.
+    """
+
+    @classmethod
+    def default_value(cls):
+        return 2
+
+    def __new__(cls, **kwargs):
+        value = PrefetchDistance.default_value()
+        return super(PrefetchDistance, cls).__new__(cls, name=kwargs['name'],
+                                                    dtype=np.int32, value=value)
+
+
+stream_intrinsics = {
+    'sse': '_mm',
+    'avx': '_mm256',
+    'avx2': '_mm256',
+    'avx512': '_mm512'
+}
+"""The prefix of the x86 nontemporal store intrinsics in each known ISA."""
+
+
+def stream_stores(iteration, platform, switch):
+    """
+    Turn the stores to DiscreteFunctions within the innermost, vectorizable,
+    ``iteration`` into nontemporal (or streaming) stores, which bypass the caches
+    and thus avoid the write-allocate traffic.
+
+    The iteration space is split into a peel loop, which reaches the first
+    address aligned to the SIMD register size, a vector loop and a remainder
+    loop. Within the vector loop, each SIMD-register-wide chunk of a row is
+    computed into an aligned, on-stack buffer, which is then streamed to memory
+    through the ``_mm*_stream_p[sd]`` intrinsics. This way, the computation
+    remains subject to auto-vectorization. As the buffers are declared within
+    the vector loop, this must be applied after OpenMP parallelization.
+
+    Parameters
+    ----------
+    iteration : Iteration
+        The innermost Iteration.
+    platform : Platform
+        The target Platform, which provides the ISA.
+    switch : NTStores
+        The runtime switch; the original ``iteration`` is executed when off.
+
+    Returns
+    -------
+    Node or None
+        The Node replacing ``iteration``, or None if no stores could be streamed.
+    """
+    prefix = stream_intrinsics.get(platform.isa)
+    if prefix is None or not iteration.is_Vectorizable or iteration.uindices:
+        return None
+    if any(i.is_Iteration for i in iteration.nodes):
+        return None
+
+    dim = iteration.dim
+    exprs = FindNodes(Expression).visit(iteration)
+    reads = [i for e in exprs for i in retrieve_indexed(e.expr.rhs)]
+
+    # The streamable stores, that is unit-stride, non-accumulating stores to
+    # rows of DiscreteFunctions which aren't read within `iteration`
+    candidates = OrderedDict()
+    for e in exprs:
+        f = e.write
+        if f is None or not f.is_DiscreteFunction or f.is_SparseFunction:
+            continue
+        row = e.output.indices[:-1]
+        if e.is_Increment or f in candidates or \
+                any(i.function is f and i.indices[:-1] == row for i in reads):
+            candidates[f] = None
+            continue
+        if np.dtype(f.dtype) not in (np.float32, np.float64):
+            candidates[f] = None
+            continue
+        index = e.output.indices[-1]
+        if not (index - dim).is_Integer:
+            candidates[f] = None
+            continue
+        candidates[f] = e
+    targets = [e for e in candidates.values() if e is not None]
+    dtypes = filter_ordered(np.dtype(e.write.dtype) for e in targets)
+    if not targets or len(dtypes) > 1:
+        return None
+    dtype = dtypes[0]
+    nitems = platform.simd_reg_size // dtype.itemsize
+    if nitems <= 1:
+        return None
+    suffix = 'ps' if dtype == np.float32 else 'pd'
+
+    # The misalignment, in items, of the first point of each streamed row. This
+    # is computed from the actual addresses, as nothing prevents the data from
+    # being provided by, e.g., unaligned user-allocated arrays
+    def misalignment(e):
+        address = UINTP(Byref(e.output.xreplace({dim: iteration.symbolic_min})))
+        return IntDiv(Mod(address, platform.simd_reg_size, evaluate=False),
+                      dtype.itemsize)
+
+    name = dim.name
+    rem = Scalar(name='%s_ntr' % name, dtype=np.int32)
+    start = Scalar(name='%s_nta' % name, dtype=np.int32)
+    end = Scalar(name='%s_ntb' % name, dtype=np.int32)
+    lower, upper = iteration.symbolic_min, iteration.symbolic_max
+    peel = Mod(nitems - rem, nitems, evaluate=False)
+    header = [Expression(DummyEq(rem, misalignment(targets[0]))),
+              Expression(DummyEq(start, INT(Min(lower + peel, upper + 1)))),
+              Expression(DummyEq(end, upper + 1 - Mod(upper + 1 - start, nitems,
+                                                      evaluate=False)))]
+
+    # All streamed rows must share the same misalignment
+    condition = And(Ne(switch, 0), *[CondEq(misalignment(e), rem) for e in targets[1:]])
+
+    # The vector loop
+    vdim = Dimension(name='%s_nt' % name)
+    buffers = OrderedDict()
+    mapper = {}
+    for e in targets:
+        f = e.write
+        bdim = DefaultDimension(name='%s_ntd' % f.name, default_value=nitems)
+        b = Array(name='%s_nt' % f.name, dimensions=(bdim,), dtype=f.dtype,
+                  scope='stack')
+        buffers[b] = e.output.xreplace({dim: vdim})
+        mapper[e] = e._rebuild(expr=e.expr.xreplace({e.output: b.indexed[dim - vdim]}))
+    body = iteration._rebuild(limits=(vdim, vdim + nitems - 1, 1), offsets=(0, 0))
+    body = Transformer(mapper).visit(body)
+    load = Function('%s_load_%s' % (prefix, suffix))
+    stores = [Call('%s_stream_%s' % (prefix, suffix),
+                   [Byref(v), load(Byref(b.indexed[0]))]) for b, v in buffers.items()]
+    vloop = Iteration([body] + stores, vdim, (start, end - 1, nitems))
+
+    # The peel and remainder loops
+    prologue = iteration._rebuild(limits=(lower, start - 1, 1), offsets=(0, 0))
+    epilogue = iteration._rebuild(limits=(end, upper, 1), offsets=(0, 0))
+
+    streamed = List(body=[prologue, vloop, epilogue])
+    return List(body=header + [Conditional(condition, streamed, iteration)])
+
+
+def prefetch_streams(iteration, parent, platform, distance, locality=3):
+    """
+    Build a loop issuing software prefetches for the rows of the DiscreteFunctions
+    read, but not written, within the innermost ``iteration``. The prefetched rows
+    are those accessed ``distance`` iterations of ``parent`` ahead; that is, the
+    prefetch loop is meant to precede ``iteration`` within ``parent``. One
+    prefetch is issued per cache line.
+
+    Parameters
+    ----------
+    iteration : Iteration
+        The innermost Iteration.
+    parent : Iteration
+        The Iteration immediately enclosing ``iteration``.
+    platform : Platform
+        The target Platform, which provides the cache line size.
+    distance : PrefetchDistance
+        The prefetch distance.
+    locality : int, optional
+        The temporal locality hint of ``__builtin_prefetch``, from 0 (none) to 3
+        (keep in all cache levels).
+
+    Returns
+    -------
+    Iteration or None
+        The prefetch loop, or None if there is nothing to prefetch.
+    """
+    if not iteration.is_Vectorizable or any(i.is_Iteration for i in iteration.nodes):
+        return None
+    if not platform.caches:
+        return None
+    line_size = min(i.line_size for i in platform.caches)
+
+    dim = iteration.dim
+    pdim = parent.dim
+    exprs = FindNodes(Expression).visit(iteration)
+    writes = {e.write for e in exprs}
+
+    # For each stream, i.e. each row of a DiscreteFunction, the leading access
+    # along `pdim`
+    rows = OrderedDict()
+    for e in exprs:
+        for i in retrieve_indexed(e.expr.rhs):
+            f = i.function
+            if not f.is_DiscreteFunction or f.is_SparseFunction or f in writes:
+                continue
+            indices = list(i.indices)
+            try:
+                n = [k for k, v in enumerate(indices) if pdim in v.free_symbols]
+                m = [k for k, v in enumerate(indices) if dim in v.free_symbols]
+                if len(n) != 1 or len(m) != 1 or n == m:
+                    continue
+                n, m = n[0], m[0]
+                ofs = indices[n] - pdim
+                if not ofs.is_Integer or not (indices[m] - dim).is_Integer:
+                    continue
+            except AttributeError:
+                # E.g., an integer index
+                continue
+            key = (f, n, m) + tuple(v for k, v in enumerate(indices) if k not in (n, m))
+            handle = rows.setdefault(key, [ofs, indices])
+            if ofs > handle[0]:
+                rows[key] = [ofs, indices]
+    if not rows:
+        return None
+
+    calls = []
+    for key, (_, indices) in rows.items():
+        f, n, _ = key[:3]
+        indices = list(indices)
+        indices[n] = indices[n] + distance
+        calls.append(Call('__builtin_prefetch', [Byref(f.indexed[tuple(indices)]),
+                                                 0, locality]))
+    step = max(line_size // min(np.dtype(k[0].dtype).itemsize for k in rows), 1)
+    return iteration._rebuild(nodes=calls, limits=(iteration.limits[0],
+                                                   iteration.limits[1], step),
+                              properties=(), pragmas=())
@@ -69,6 +69,39 @@ def transform(iet, mode='advanced', options=None):
         - ``blockalways``: Pass True to unconditionally apply loop blocking, even when
                            the compiler heuristically thinks that it might not be
                            profitable and/or dangerous for performance.
+        - ``blocklevels``: The number of loop blocking levels, either 1 or 2. With
+                           2, the blocks sized for the L2 cache are in turn blocked
+                           for the L1 cache. Defaults to 1.
+        - ``blocklocal``: Pass True to recompute the time-invariant temporaries
+                          introduced by the DSE within each block, rather than
+                          once before time stepping. These temporaries then take
+                          as much memory as a block, rather than the entire grid.
+        - ``scratch``: The memory scope of the temporaries shrunk to the block
+                       shape by loop blocking, either 'stack' (default) or 'heap'.
+                       In both cases, each thread gets its own copy.
+        - ``blocktime``: Pass True to block the time-stepping loops along with the
+                         space loops (time skewing), so that data is reused
+                         across timesteps. Not applied if ``mpi`` is enabled.
+        - ``shrinkbuffers``: Pass True to allocate one slot less for the modulo
+                             buffers of the TimeFunctions whose oldest timeslot
+                             may be overwritten by the newest one. Only applies
+                             to the TimeFunctions whose data isn't allocated yet.
+                             Not applied if ``mpi`` is enabled.
+        - ``colouring``: Pass True to inject the SparseFunctions by conflict-free
+                         colours of points, which are parallelized without atomic
+                         increments, rather than point by point.
+        - ``ntstores``: Pass True to generate nontemporal stores, which bypass the
+                        caches, for the DiscreteFunctions written within vectorizable
+                        loops. Unless the backend compiler provides a pragma for
+                        this, the nontemporal stores are emitted through the SIMD
+                        intrinsics of the platform ISA, and can be switched off at
+                        runtime through the ``ntstores`` argument.
+        - ``prefetch``: Pass True to prefetch in software the rows read within
+                        vectorizable loops, ``pfdistance`` iterations of the
+                        enclosing loop ahead (a runtime argument).
+        - ``unroll``: The number of PARALLEL loops enclosing the vectorizable
+                      loops to unroll-and-jam, either 1 or 2, or False to disable.
+                      The unroll factor is a runtime argument, ``ufactor``.
     """
     assert isinstance(iet, Node)
 
@@ -76,6 +109,15 @@ def transform(iet, mode='advanced', options=None):
     params = {}
     params['blockinner'] = configuration['dle-options'].get('blockinner', False)
     params['blockalways'] = configuration['dle-options'].get('blockalways', False)
+    params['blocklevels'] = configuration['dle-options'].get('blocklevels', 1)
+    params['blocklocal'] = configuration['dle-options'].get('blocklocal', False)
+    params['scratch'] = configuration['dle-options'].get('scratch', 'stack')
+    params['blocktime'] = configuration['dle-options'].get('blocktime', False)
+    params['shrinkbuffers'] = configuration['dle-options'].get('shrinkbuffers', False)
+    params['colouring'] = configuration['dle-options'].get('colouring', False)
+    params['ntstores'] = configuration['dle-options'].get('ntstores', False)
+    params['prefetch'] = configuration['dle-options'].get('prefetch', False)
+    params['unroll'] = configuration['dle-options'].get('unroll', False)
     params['openmp'] = configuration['openmp']
     params['mpi'] = configuration['mpi']
 
@@ -0,0 +1,155 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from devito.ir.equations import DummyEq
+from devito.ir.iet import Conditional, Expression, List
+from devito.symbolics import CondEq, retrieve_indexed
+from devito.types import Constant, Scalar
+
+__all__ = ['UnrollFactor', 'unroll_and_jam']
+
+
+class UnrollFactor(Constant):
+
+    """
+    The unroll factor of the unroll-and-jammed Iterations. Only the factors for
+    which a variant was generated have an effect; any other value (e.g., 1)
+    selects the original Iterations.
+    """
+
+    @classmethod
+    def default_value(cls):
+        return 2
+
+    def __new__(cls, **kwargs):
+        return super(UnrollFactor, cls).__new__(cls, name=kwargs['name'], dtype=np.int32,
+                                                value=UnrollFactor.default_value())
+
+
+def unroll_and_jam(nest, nlevels, switch, factors=(2, 4)):
+    """
+    Unroll-and-jam the ``nlevels`` Iterations enclosing the innermost Iteration
+    of ``nest``. Each of these Iterations is unrolled by a given factor and the
+    resulting copies are jammed within the innermost Iteration, so that the
+    values loaded by more than one copy are loaded only once per iteration
+    (i.e., reused from registers). The iterations falling outside a multiple of
+    the unroll factor are executed by remainder Iterations, as in loop blocking.
+
+    One variant is generated for each of the ``factors``; the variant is
+    selected at runtime through ``switch``, with the original ``nest`` executed
+    when ``switch`` matches none of the ``factors``.
+
+    Parameters
+    ----------
+    nest : list of Iteration
+        A perfect Iteration nest, outermost first.
+    nlevels : int
+        The number of Iterations to unroll-and-jam.
+    switch : UnrollFactor
+        The runtime unroll factor.
+    factors : tuple of int, optional
+        The unroll factors for which a variant is generated.
+
+    Returns
+    -------
+    Node or None
+        The Node replacing ``nest[-nlevels - 1]``, or None if the Iterations
+        cannot be unroll-and-jammed.
+    """
+    if len(nest) < nlevels + 1:
+        return None
+    innermost = nest[-1]
+    jammed = nest[-nlevels - 1:-1]
+
+    # Only PARALLEL, unit-step Iterations in a perfect nest, the limits of which
+    # do not depend on one another, can be unroll-and-jammed
+    for i, j in zip(jammed, nest[-nlevels:]):
+        if not i.is_Parallel or i.is_Vectorizable or i.pragmas or i.uindices:
+            return None
+        if i.step != 1 or len(i.nodes) != 1 or i.nodes[0] is not j:
+            return None
+    dims = {i.dim for i in jammed}
+    if any(dims & (set(i.symbolic_min.free_symbols) | set(i.symbolic_max.free_symbols))
+           for i in jammed + [innermost]):
+        return None
+    # The innermost Iteration may only contain Expressions, possibly grouped
+    # within an ExpressionBundle
+    bundle = None
+    exprs = innermost.nodes
+    if len(exprs) == 1 and exprs[0].is_ExpressionBundle:
+        bundle = exprs[0]
+        exprs = bundle.exprs
+    if not all(isinstance(e, Expression) for e in exprs):
+        return None
+
+    # Scalar temporaries defined more than once (e.g., accumulators) can't be
+    # renamed or shared across the copies
+    scalars = [e.write for e in exprs if e.write is not None and e.write.is_Scalar]
+    if len(scalars) != len(set(scalars)) or \
+            any(e.is_Increment for e in exprs if e.write in scalars):
+        return None
+    functions = {e.write for e in exprs if e.write is not None} - set(scalars)
+
+    def jam(copies):
+        # Within each copy, shift the jammed Dimensions and rename the scalar
+        # temporaries, unless an identical one was defined by a previous copy
+        body = []
+        reads = OrderedDict()
+        writes = set()
+        defined = {}
+        for n, shift in enumerate(copies):
+            mapper = {}
+            for e in exprs:
+                expr = e.expr.xreplace(shift).xreplace(mapper)
+                if e.write in scalars:
+                    if expr.rhs in defined and \
+                            not any(i.function in functions
+                                    for i in retrieve_indexed(expr.rhs)):
+                        mapper[e.write] = defined[expr.rhs]
+                        continue
+                    if n > 0:
+                        mapper[e.write] = Scalar(name='%s_%d' % (e.write.name, n),
+                                                 dtype=e.write.dtype)
+                        expr = expr.func(mapper[e.write], expr.rhs)
+                    defined[expr.rhs] = expr.lhs
+                for i in retrieve_indexed(expr.rhs):
+                    reads.setdefault(i, set()).add(n)
+                if expr.lhs.is_Indexed:
+                    writes.add(expr.lhs)
+                body.append(e._rebuild(expr=expr))
+
+        # The values loaded by more than one copy are loaded only once
+        shared = [i for i, v in reads.items() if len(v) > 1 and i not in writes]
+        mapper = OrderedDict()
+        for i in shared:
+            mapper[i] = Scalar(name='%s_r%d' % (i.function.name, len(mapper)),
+                               dtype=i.function.dtype)
+        loads = [Expression(DummyEq(v, k)) for k, v in mapper.items()]
+        body = [e._rebuild(expr=e.expr.xreplace(mapper)) for e in body]
+
+        if bundle is not None:
+            return innermost._rebuild(nodes=bundle._rebuild(body=loads + body))
+        else:
+            return innermost._rebuild(nodes=loads + body)
+
+    def build(n, copies, factor):
+        if n == len(jammed):
+            return jam(copies)
+        i = jammed[n]
+        lower, upper = i.symbolic_min, i.symbolic_max
+        split = upper - (upper - lower + 1) % factor
+        shifted = [{**shift, i.dim: i.dim + k} for shift in copies
+                   for k in range(factor)]
+        main = i._rebuild(nodes=build(n + 1, shifted, factor),
+                          limits=(lower, split, factor), offsets=(0, 0))
+        remainder = i._rebuild(nodes=build(n + 1, copies, factor),
+                               limits=(split + 1, upper, 1), offsets=(0, 0))
+        return List(body=[main, remainder])
+
+    processed = jammed[0]
+    for factor in reversed(factors):
+        processed = Conditional(CondEq(switch, factor), build(0, [{}], factor),
+                                processed)
+
+    return processed
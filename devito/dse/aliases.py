@@ -46,18 +46,16 @@ def collect(exprs):
             candidates.append(candidate)
 
     # Group together the aliasing expressions (ultimately build an Alias for each
-    # group of aliasing expressions)
-    aliases = Aliases()
-    unseen = list(candidates)
-    while unseen:
-        c = unseen.pop(0)
+    # group of aliasing expressions). Two candidates alias if and only if they have
+    # the same canonical form, so rather than comparing all pairs of candidates we
+    # simply bucket them by canonical form
+    groups = OrderedDict()
+    for c in candidates:
+        groups.setdefault(canonical(c), []).append(c)
 
-        # Find aliasing expressions
-        group = [c]
-        for i in list(unseen):
-            if compare_ops(c.expr, i.expr) and is_translated(c, i):
-                group.append(i)
-                unseen.remove(i)
+    aliases = Aliases()
+    for group in groups.values():
+        c = group[0]
 
         # Try creating a basis spanning the aliasing expressions' iteration vectors
         try:
@@ -167,47 +165,44 @@ def analyze(expr):
     return Candidate(expr.rhs, indexeds, bases, offsets)
 
 
-def compare_ops(e1, e2):
-    """
-    Return True if the two expressions ``e1`` and ``e2`` perform the same arithmetic
-    operations over the same input operands, False otherwise.
-    """
-    if type(e1) == type(e2) and len(e1.args) == len(e2.args):
-        if e1.is_Atom:
-            return True if e1 == e2 else False
-        elif isinstance(e1, Indexed) and isinstance(e2, Indexed):
-            return True if e1.base == e2.base else False
-        else:
-            for a1, a2 in zip(e1.args, e2.args):
-                if not compare_ops(a1, a2):
-                    return False
-            return True
-    else:
-        return False
-
-
-def is_translated(c1, c2):
+def canonical(candidate):
     """
-    Given two potential aliases ``c1`` and ``c2``, return True if ``c1``
-    is translated w.r.t. ``c2``, False otherwise.
+    Return the canonical form of a potential alias ``candidate``, that is a
+    hashable key invariant to translation.
 
-    For example: ::
+    Two candidates have the same canonical form if and only if they perform the
+    same arithmetic operations over the same input operands (see ``canonical_ops``)
+    and one is translated w.r.t. the other. To capture the latter, the access
+    offsets along each Dimension are normalised relative to those of the first
+    Indexed, the reference access. For example: ::
 
         c1 = A[i,j] + A[i,j+1]
         c2 = A[i+1,j] + A[i+1,j+1]
 
-    ``c1``'s Toffsets are ``{i: [0, 0], j: [0, 1]}``, while ``c2``'s Toffsets are
-    ``{i: [1, 1], j: [0, 1]}``. Then, ``c2`` is translated w.r.t. ``c1`` by
-    ``(1, 0)``, and True is returned.
+    ``c1``'s offsets ``{i: [0, 0], j: [0, 1]}`` and ``c2``'s offsets
+    ``{i: [1, 1], j: [0, 1]}`` both normalise to ``{i: [0, 0], j: [0, 1]}``,
+    since ``c2`` is translated w.r.t. ``c1`` by ``(1, 0)``.
     """
-    assert len(c1.offsets) == len(c2.offsets)
-
     # Transpose `offsets` so that
     # offsets = [{x: 2, y: 0}, {x: 1, y: 3}] => {x: [2, 1], y: [0, 3]}
-    Toffsets1 = LabeledVector.transpose(*c1.offsets)
-    Toffsets2 = LabeledVector.transpose(*c2.offsets)
+    Toffsets = LabeledVector.transpose(*candidate.offsets)
+
+    return (canonical_ops(candidate.expr),
+            tuple((l, tuple(i - v[0] for i in v)) for l, v in Toffsets))
+
 
-    return all(len(set(i - j)) == 1 for (_, i), (_, j) in zip(Toffsets1, Toffsets2))
+def canonical_ops(expr):
+    """
+    Return a hashable key capturing the arithmetic operations performed by
+    ``expr`` and their input operands. Indexeds are represented by their
+    base, so the access offsets are disregarded.
+    """
+    if expr.is_Atom:
+        return (type(expr), expr)
+    elif isinstance(expr, Indexed):
+        return (type(expr), len(expr.args), expr.base)
+    else:
+        return (type(expr),) + tuple(canonical_ops(i) for i in expr.args)
 
 
 def calculate_COM(group):
@@ -255,14 +250,33 @@ def calculate_COM(group):
 
 class Aliases(OrderedDict):
 
+    def __init__(self, *args, **kwargs):
+        super(Aliases, self).__init__(*args, **kwargs)
+        self._index = None
+
+    def __setitem__(self, key, value):
+        super(Aliases, self).__setitem__(key, value)
+        self._index = None
+
+    def __delitem__(self, key):
+        super(Aliases, self).__delitem__(key)
+        self._index = None
+
+    def pop(self, *args):
+        self._index = None
+        return super(Aliases, self).pop(*args)
+
     def get(self, key):
         ret = super(Aliases, self).get(key)
         if ret is not None:
             return ret.aliased
-        for v in self.values():
-            if key in v.aliased:
-                return v.aliased
-        return []
+        if self._index is None:
+            # Map each aliasing expression to the first Alias it appears in
+            self._index = {}
+            for v in self.values():
+                for i in v.aliased:
+                    self._index.setdefault(i, v.aliased)
+        return self._index.get(key, [])
 
 
 class Alias(object):
@@ -1,10 +1,9 @@
-from collections import OrderedDict
+from collections import Counter, OrderedDict
 
 from sympy import Add, Mul, collect, collect_const
 
 from devito.ir import FlowGraph
-from devito.symbolics import (Eq, count, estimate_cost, q_xop, q_leaf,
-                              xreplace_constrained)
+from devito.symbolics import Eq, q_xop, q_leaf, xreplace_constrained
 from devito.tools import ReducerMap
 
 __all__ = ['collect_nested', 'common_subexprs_elimination', 'compact_temporaries']
@@ -101,7 +100,8 @@ def common_subexprs_elimination(exprs, make, mode='default'):
     """
     Perform common sub-expressions elimination, or CSE.
 
-    Note: the output is not guranteed to be topologically sorted.
+    The temporaries are returned first, in topological order, followed by
+    the rewritten ``exprs``.
 
     Parameters
     ----------
@@ -111,6 +111,17 @@ def common_subexprs_elimination(exprs, make, mode='default'):
         Build symbols to store temporary, redundant values.
     mode : str, optional
         The CSE algorithm applied. Accepted: ['default'].
+
+    Notes
+    -----
+    The expressions are turned into a DAG in which identical sub-expressions
+    are represented by a single node (i.e., they are hash-consed). Then, in a
+    single pass from the roots, each node is assigned the number of times it
+    would be evaluated; every operation evaluated more than once is assigned to
+    a temporary. Since a temporary is evaluated exactly once, the operations it
+    contains are counted once per temporary, rather than once per use of the
+    temporary. Array index functions are not visited, and therefore never
+    captured.
     """
 
     # Note: not defaulting to SymPy's CSE() function for three reasons:
@@ -121,35 +132,66 @@ def common_subexprs_elimination(exprs, make, mode='default'):
     # also ensuring some sort of post-processing
     assert mode == 'default'  # Only supported mode ATM
 
-    processed = list(exprs)
-    mapped = []
-    while True:
-        # Detect redundancies
-        counted = count(mapped + processed, q_xop).items()
-        targets = OrderedDict([(k, estimate_cost(k, True)) for k, v in counted if v > 1])
-        if not targets:
-            break
-
-        # Create temporaries
-        hit = max(targets.values())
-        picked = [k for k, v in targets.items() if v == hit]
-        mapper = OrderedDict([(e, make()) for i, e in enumerate(picked)])
-
-        # Apply replacements
-        processed = [e.xreplace(mapper) for e in processed]
-        mapped = [e.xreplace(mapper) for e in mapped]
-        mapped = [Eq(v, k) for k, v in reversed(list(mapper.items()))] + mapped
-
-        # Prepare for the next round
-        for k in picked:
-            targets.pop(k)
-    processed = mapped + processed
-
-    # Simply renumber the temporaries in ascending order
-    mapper = {i.lhs: j.lhs for i, j in zip(mapped, reversed(mapped))}
-    processed = [e.xreplace(mapper) for e in processed]
+    exprs = list(exprs)
+
+    # Build the DAG; `dag` lists the (non-leaf) nodes, operands first
+    dag = OrderedDict()
+
+    def build(expr):
+        if expr in dag or q_leaf(expr):
+            return
+        for a in expr.args:
+            build(a)
+        dag[expr] = expr.args
+
+    for e in exprs:
+        build(e.rhs)
+
+    # Count the evaluations of each node, from the roots to the leaves
+    counter = Counter(e.rhs for e in exprs)
+    targets = set()
+    for expr, args in reversed(dag.items()):
+        n = counter[expr]
+        if n > 1 and q_xop(expr):
+            targets.add(expr)
+            n = 1
+        for a in args:
+            counter[a] += n
+
+    # Create the temporaries in topological order, then use them
+    # Note: an unchanged sub-expression is cached as None, so that the very
+    # same object is returned; rebuilding it would trigger SymPy's evaluation
+    # (e.g., `2*(a + b) -> 2*a + 2*b`)
+    cache = {}
+
+    def rebuild(expr):
+        try:
+            ret = cache[expr]
+        except KeyError:
+            if expr not in dag:
+                ret = None
+            else:
+                args = [rebuild(a) for a in expr.args]
+                if all(i is j for i, j in zip(args, expr.args)):
+                    ret = None
+                else:
+                    ret = expr.func(*args)
+            cache[expr] = ret
+        return expr if ret is None else ret
+
+    temporaries = []
+    for expr in dag:
+        if expr in targets:
+            handle = rebuild(expr)
+            cache[expr] = make()
+            temporaries.append(Eq(cache[expr], handle))
 
-    return processed
+    processed = []
+    for e in exprs:
+        rhs = rebuild(e.rhs)
+        processed.append(e if rhs is e.rhs else e.func(e.lhs, rhs))
+
+    return temporaries + processed
 
 
 def compact_temporaries(temporaries, leaves):
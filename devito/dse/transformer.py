@@ -1,8 +1,22 @@
+from io import BytesIO
+import multiprocessing as mp
+import pickle
+import threading
+
 from devito.ir.clusters import ClusterGroup, groupby
-from devito.dse.rewriters import BasicRewriter, AdvancedRewriter, AggressiveRewriter
+from devito.dse.rewriters import (AbstractRewriter, BasicRewriter, AdvancedRewriter,
+                                  AggressiveRewriter, State)
 from devito.logger import dse as log, dse_warning as warning
 from devito.parameters import configuration
+from devito.symbolics import estimate_cost
 from devito.tools import flatten
+from devito.types.basic import (AbstractFunction, AbstractObject, AbstractSymbol,
+                                IndexedData)
+
+try:
+    import cloudpickle
+except ImportError:
+    cloudpickle = None
 
 __all__ = ['dse_registry', 'rewrite']
 
@@ -16,6 +30,13 @@ modes = {
 }
 """The DSE transformation modes."""
 
+PARALLEL_MIN_OPS = 256
+"""
+The minimum operation count of the dense Clusters for the DSE to be run in
+parallel (see ``configuration['dse-jobs']``); below this threshold, spawning
+the worker processes is not worth it.
+"""
+
 
 def rewrite(clusters, mode='advanced'):
     """
@@ -43,6 +64,12 @@ def rewrite(clusters, mode='advanced'):
                           symbolic processing time; it may or may not reduce the
                           JIT-compilation time; it may or may not improve the
                           overall runtime performance.
+
+    Notes
+    -----
+    If ``configuration['dse-jobs'] > 1``, the Clusters are rewritten in a pool
+    of worker processes. The output is identical to that of the sequential
+    rewrite, including the names of the temporaries.
     """
     if not (mode is None or isinstance(mode, str)):
         raise ValueError("Parameter 'mode' should be a string, not %s." % type(mode))
@@ -61,7 +88,11 @@ def rewrite(clusters, mode='advanced'):
     rewriter = modes[mode]()
     fallback = BasicRewriter(False, rewriter.template)
 
-    states = [rewriter.run(c) if c.is_dense else fallback.run(c) for c in clusters]
+    states = None
+    if configuration['dse-jobs'] > 1:
+        states = rewrite_parallel(clusters, mode, configuration['dse-jobs'])
+    if states is None:
+        states = [rewriter.run(c) if c.is_dense else fallback.run(c) for c in clusters]
 
     # Print out the profiling data
     print_profiling(states)
@@ -102,3 +133,212 @@ def print_profiling(states):
             rows.append(row % (i.ops[keys[0]], i.ops[keys[-1]], elapsed))
         rows = "\n     ".join(rows)
         log("%s\n     [Total elapsed: %.2f s]" % (rows, tot_elapsed))
+
+
+# Parallel DSE
+
+_shared = None
+"""The input of the worker processes, which is inherited upon fork."""
+
+
+def rewrite_parallel(clusters, mode, jobs):
+    """
+    Rewrite each Cluster in ``clusters`` in a separate worker process.
+
+    At this stage, the Clusters are independent of each other, apart from the
+    names of the temporaries, which are numbered globally in Cluster order. The
+    workers therefore number the temporaries locally (r0, r1, ...), and the
+    temporaries are renamed once the number of temporaries introduced by each
+    Cluster, and hence the global numbering, is known.
+
+    SymPy orders the arguments of an expression by name, so renaming only
+    preserves the output of the sequential rewrite if the local and the global
+    names of the temporaries sort alike. The few Clusters for which this is not
+    the case are rewritten again, now using the global names straight away.
+
+    The Devito objects (Functions, Dimensions, ...) reachable from ``clusters``
+    are never copied: the rewritten Clusters returned by the workers reference
+    the original objects.
+
+    Return None, meaning that the caller should fall back to a sequential
+    rewrite, if ``clusters`` is too small to benefit from parallelism, or if
+    parallelism is unavailable.
+    """
+    global _shared
+
+    dense = [c for c in clusters if c.is_dense]
+    if len(dense) < 2 or\
+            estimate_cost(flatten(c.exprs for c in dense)) < PARALLEL_MIN_OPS:
+        return None
+    if cloudpickle is None or 'fork' not in mp.get_all_start_methods() or\
+            configuration['mpi'] or mp.current_process().daemon:
+        return None
+
+    # The workers are forked, and a forked process inherits the locks held by the
+    # other threads of its parent, but not the threads themselves, so it could
+    # deadlock. Thus, the pending JIT compilations (see ``Operator._specialize``)
+    # are completed first, and, should any other thread be alive (e.g., one
+    # staging checkpoints), the rewrite is sequential
+    from devito.operator import jit_executor_shutdown
+    jit_executor_shutdown()
+    if threading.active_count() > 1:
+        return None
+
+    # The Devito objects that are already around; as the workers are forked,
+    # these are identified through their `id`
+    registry = _Registry()
+    registry.dump(list(clusters))
+    registry = registry.objects
+
+    _shared = (list(clusters), mode, registry)
+    try:
+        with mp.get_context('fork').Pool(min(jobs, len(clusters))) as pool:
+            ret = pool.map(_rewrite_cluster, [(i, 0) for i in range(len(clusters))],
+                           chunksize=1)
+
+            offsets = [sum(n for n, _ in ret[:i]) for i in range(len(ret))]
+            redo = [i for i, ((n, _), o) in enumerate(zip(ret, offsets))
+                    if not _sort_alike(n, o)]
+            args = [(i, offsets[i]) for i in redo]
+            for i, v in zip(redo, pool.map(_rewrite_cluster, args, chunksize=1)):
+                if v[0] != ret[i][0]:
+                    raise ValueError("inconsistent number of temporaries")
+                ret[i] = v
+
+        states = []
+        for i, ((n, payload), offset) in enumerate(zip(ret, offsets)):
+            if i in redo:
+                mapper = {}
+            else:
+                mapper = {_tempname(j): _tempname(offset + j) for j in range(n)}
+            state = State(clusters[i], None)
+            state.clusters, state.ops, state.timings = \
+                _Unpickler(BytesIO(payload), registry, mapper).load()
+            states.append(state)
+    except Exception as e:
+        warning("Parallel DSE failed (%s), switching to sequential mode" % e)
+        return None
+    finally:
+        _shared = None
+
+    return states
+
+
+def _tempname(i):
+    return "%s%d" % (AbstractRewriter.tempname, i)
+
+
+def _sort_alike(n, offset):
+    """
+    True if the first ``n`` temporary names sort as the ``n`` temporary names
+    starting at ``offset``, False otherwise.
+    """
+    local = sorted(range(n), key=_tempname)
+    final = sorted(range(n), key=lambda i: _tempname(offset + i))
+    return local == final
+
+
+def _rewrite_cluster(args):
+    """
+    Run the DSE over the Cluster in position ``i`` of the shared Clusters,
+    numbering the temporaries from ``offset``.
+    """
+    i, offset = args
+    clusters, mode, registry = _shared
+
+    names = []
+
+    def template():
+        names.append(_tempname(offset + len(names)))
+        return names[-1]
+
+    cluster = clusters[i]
+    if cluster.is_dense:
+        state = modes[mode](True, template).run(cluster)
+    else:
+        state = BasicRewriter(False, template).run(cluster)
+
+    stream = BytesIO()
+    pickler = _Pickler(stream, registry, set(names))
+    pickler.dump((state.clusters, state.ops, state.timings))
+
+    return len(names), stream.getvalue()
+
+
+_devito_types = (AbstractSymbol, AbstractFunction, AbstractObject)
+
+
+if cloudpickle is not None:
+    class _Registry(cloudpickle.CloudPickler):
+
+        """
+        Collect the Devito objects reachable from the pickled objects.
+        """
+
+        def __init__(self):
+            super(_Registry, self).__init__(BytesIO())
+            self.objects = {}
+
+        def persistent_id(self, obj):
+            if isinstance(obj, _devito_types):
+                self.objects[id(obj)] = obj
+                return id(obj)
+            return None
+
+    class _Pickler(cloudpickle.CloudPickler):
+
+        """
+        Pickle the output of a worker, replacing the Devito objects in
+        ``registry`` with a reference and the temporaries named in ``temps``
+        with the arguments needed to rebuild them under a different name.
+        """
+
+        def __init__(self, file, registry, temps):
+            super(_Pickler, self).__init__(file)
+            self.registry = registry
+            self.temps = temps
+
+        def persistent_id(self, obj):
+            if id(obj) in self.registry:
+                return ('obj', id(obj))
+            elif isinstance(obj, IndexedData) and obj.function.name in self.temps:
+                return ('indexed', obj.function)
+            elif isinstance(obj, _devito_types):
+                if obj.name not in self.temps:
+                    raise ValueError("Cannot pickle `%s` by reference" % obj.name)
+                args, kwargs = obj.__getnewargs_ex__()
+                args = list(zip(obj._pickle_args, args))
+                return ('temp', obj._pickle_reconstruct or type(obj), args, kwargs)
+            return None
+
+
+class _Unpickler(pickle.Unpickler):
+
+    """
+    Unpickle the output of a worker, renaming the temporaries as in ``mapper``.
+    """
+
+    def __init__(self, file, registry, mapper):
+        super(_Unpickler, self).__init__(file)
+        self.registry = registry
+        self.mapper = mapper
+        self.temps = {}
+
+    def persistent_load(self, pid):
+        if pid[0] == 'obj':
+            return self.registry[pid[1]]
+        elif pid[0] == 'indexed':
+            return pid[1].indexed
+        else:
+            _, cls, args, kwargs = pid
+            key = kwargs.get('name', dict(args).get('name'))
+            try:
+                return self.temps[key]
+            except KeyError:
+                pass
+            name = self.mapper.get(key, key)
+            args = [name if k == 'name' else v for k, v in args]
+            if 'name' in kwargs:
+                kwargs = dict(kwargs, name=name)
+            self.temps[key] = obj = cls.__new__(cls, *args, **kwargs)
+            return obj
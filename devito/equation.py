@@ -4,7 +4,7 @@ import sympy
 
 from cached_property import cached_property
 
-from devito.finite_differences import default_rules
+from devito.finite_differences import default_rules, evaluate_derivatives
 from devito.tools import as_tuple
 
 __all__ = ['Eq', 'Inc', 'solve']
@@ -49,6 +49,12 @@ class Eq(sympy.Eq):
 
     >>> from sympy import sin
     >>> Eq(f, sin(f.dx)**2)
+    Eq(f(x, y), sin(Derivative(f(x, y), x))**2)
+
+    Derivatives are kept unevaluated until the Eq is lowered by an Operator.
+    Their finite-difference approximations may be retrieved via ``evaluate``.
+
+    >>> Eq(f, sin(f.dx)**2).evaluate
     Eq(f(x, y), sin(f(x, y)/h_x - f(x + h_x, y)/h_x)**2)
 
     Notes
@@ -90,6 +96,14 @@ class Eq(sympy.Eq):
     def implicit_dims(self):
         return self._implicit_dims
 
+    @property
+    def evaluate(self):
+        """
+        The Eq with all of its Derivatives replaced by their finite-difference
+        approximations.
+        """
+        return evaluate_derivatives(self)
+
     @cached_property
     def _uses_symbolic_coefficients(self):
         return bool(self._symbolic_functions)
@@ -188,4 +202,6 @@ def solve(eq, target, **kwargs):
     # turnaround time
     kwargs['rational'] = False  # Avoid float indices
     kwargs['simplify'] = False  # Do not attempt premature optimisation
+    # The target may only appear within the finite-difference approximations
+    eq = evaluate_derivatives(eq)
     return sympy.solve(eq, target, **kwargs)[0]
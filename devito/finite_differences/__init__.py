@@ -2,3 +2,4 @@ from devito.finite_differences.differentiable import *  # noqa
 from devito.finite_differences.finite_difference import *  # noqa
 from devito.finite_differences.finite_difference import generate_fd_shortcuts  # noqa
 from devito.finite_differences.coefficients import *  # noqa
+from devito.finite_differences.derivative import *  # noqa
@@ -0,0 +1,245 @@
+from functools import partial
+
+import sympy
+
+from devito.finite_differences.differentiable import Differentiable
+from devito.finite_differences.finite_difference import (centered, direct,
+                                                         first_derivative,
+                                                         generic_derivative,
+                                                         cross_derivative)
+from devito.tools import Pickable, as_tuple
+
+__all__ = ['Derivative', 'evaluate_derivatives']
+
+
+class Derivative(Differentiable, Pickable):
+
+    """
+    An unevaluated finite-difference derivative.
+
+    A Derivative carries the metadata of its stencil (Dimensions, derivative
+    orders, discretization orders, staggering, ...) but not the stencil itself,
+    so that the symbolic manipulation of expressions with derivatives remains
+    cheap. The finite-difference approximation is only computed upon
+    evaluation, which happens automatically when an Operator is built.
+
+    Parameters
+    ----------
+    expr : expr-like
+        Expression for which the derivative is produced.
+    dims : Dimension or tuple of Dimension
+        The Dimensions w.r.t. which to differentiate.
+    deriv_order : int or tuple of int, optional
+        Derivative order for each Dimension. Defaults to 1.
+    fd_order : int or tuple of int, optional
+        Coefficient discretization order for each Dimension. Defaults to
+        ``expr.time_order`` for time Dimensions and ``expr.space_order``
+        otherwise.
+    stagger : Side or tuple of Side, optional
+        Shift of the finite-difference approximation for each Dimension.
+    side : Side, optional
+        For first-order derivatives w.r.t. a single Dimension, compute
+        the derivative via ``first_derivative`` on the given side.
+    matvec : Transpose, optional
+        Forward or transpose mode of a first-order derivative, as in
+        ``first_derivative``. Defaults to ``direct``.
+
+    Examples
+    --------
+    >>> from devito import Function, Grid, Derivative
+    >>> grid = Grid(shape=(4, 4))
+    >>> x, y = grid.dimensions
+    >>> f = Function(name='f', grid=grid, space_order=2)
+    >>> f.dx2
+    Derivative(f(x, y), (x, 2))
+    >>> Derivative(f, x, deriv_order=2) == f.dx2
+    True
+
+    The finite-difference approximation is obtained via ``evaluate``
+
+    >>> f.dx2.evaluate
+    -2.0*f(x, y)/h_x**2 + f(x - h_x, y)/h_x**2 + f(x + h_x, y)/h_x**2
+    """
+
+    is_commutative = True
+
+    def __new__(cls, expr, dims, deriv_order=1, fd_order=None, stagger=None,
+                side=None, matvec=direct, **kwargs):
+        dims = as_tuple(dims)
+        deriv_order = as_tuple(deriv_order)
+        if fd_order is None:
+            fd_order = tuple(expr.time_order if d.is_Time else expr.space_order
+                             for d in dims)
+        fd_order = as_tuple(fd_order)
+        stagger = as_tuple(stagger) or (None,)
+        if len(dims) > 1:
+            # Broadcast any order or staggering given for a single Dimension
+            deriv_order, fd_order, stagger = [i*len(dims) if len(i) == 1 else i
+                                              for i in (deriv_order, fd_order, stagger)]
+        if not len(dims) == len(deriv_order) == len(fd_order) == len(stagger):
+            raise ValueError("Expected as many derivative orders, FD orders "
+                             "and staggering as Dimensions")
+        if (side is not None or matvec != direct) and\
+                (len(dims) > 1 or deriv_order != (1,)):
+            raise ValueError("`side` and `matvec` are only supported by "
+                             "first-order derivatives w.r.t. a single Dimension")
+
+        obj = sympy.Expr.__new__(cls, expr)
+        obj._dims = dims
+        obj._deriv_order = deriv_order
+        obj._fd_order = fd_order
+        obj._stagger = stagger
+        obj._side = side
+        obj._matvec = matvec
+
+        if getattr(expr, '_uses_symbolic_coefficients', False):
+            # The symbolic coefficients are bound to the expanded stencils (see
+            # ``Eq``), hence the derivative is evaluated straight away
+            return obj.evaluate
+
+        return obj
+
+    @property
+    def expr(self):
+        return self.args[0]
+
+    @property
+    def dims(self):
+        return self._dims
+
+    @property
+    def deriv_order(self):
+        return self._deriv_order
+
+    @property
+    def fd_order(self):
+        return self._fd_order
+
+    @property
+    def stagger(self):
+        return self._stagger
+
+    @property
+    def side(self):
+        return self._side
+
+    @property
+    def matvec(self):
+        return self._matvec
+
+    @property
+    def func(self):
+        # Rebuilding a Derivative (e.g., within `xreplace`) must retain the metadata
+        return partial(self.__class__, dims=self.dims, deriv_order=self.deriv_order,
+                       fd_order=self.fd_order, stagger=self.stagger, side=self.side,
+                       matvec=self.matvec)
+
+    def _hashable_content(self):
+        # Only Basic or natively comparable objects, as required by `Basic.compare`
+        return super(Derivative, self)._hashable_content() +\
+            (sympy.Tuple(*self.dims), self.deriv_order, self.fd_order,
+             str(self.stagger), str(self.side), str(self.matvec))
+
+    def _sympystr(self, printer):
+        variables = []
+        for d, o in zip(self.dims, self.deriv_order):
+            variables.append(printer._print(d) if o == 1 else
+                             '(%s, %d)' % (printer._print(d), o))
+        return 'Derivative(%s, %s)' % (printer._print(self.expr), ', '.join(variables))
+
+    def __str__(self):
+        return sympy.sstr(self)
+
+    __repr__ = __str__
+
+    def _subs_dims(self, keys):
+        """
+        True if any of ``keys`` is one of the Dimensions w.r.t. which we
+        differentiate, or a Dimension derived from one of them.
+        """
+        roots = {d.root for d in self.dims}
+        return any(getattr(k, 'is_Dimension', False) and k.root in roots for k in keys)
+
+    def _eval_subs(self, old, new):
+        # Replacing the differentiation Dimensions (e.g., to place the derivative
+        # at some interpolation point) is only meaningful for the evaluated stencil
+        if self._subs_dims([old]):
+            return self.evaluate._subs(old, new)
+        return None
+
+    def _xreplace(self, rule):
+        if self in rule:
+            return rule[self], True
+        elif self._subs_dims(rule):
+            return self.evaluate._xreplace(rule)
+        return super(Derivative, self)._xreplace(rule)
+
+    def _evaluate(self, mapper):
+        expr = _evaluate(self.expr, mapper)
+        if self.side is not None or self.matvec != direct:
+            return first_derivative(expr, dim=self.dims[0], fd_order=self.fd_order[0],
+                                    side=self.side or centered, matvec=self.matvec)
+        elif len(self.dims) == 1:
+            return generic_derivative(expr, dim=self.dims[0], fd_order=self.fd_order[0],
+                                      deriv_order=self.deriv_order[0],
+                                      stagger=self.stagger[0])
+        else:
+            return cross_derivative(expr, dims=self.dims, fd_order=self.fd_order,
+                                    deriv_order=self.deriv_order, stagger=self.stagger)
+
+    # Pickling support
+    _pickle_args = ['expr']
+    _pickle_kwargs = ['dims', 'deriv_order', 'fd_order', 'stagger', 'side', 'matvec']
+    __reduce_ex__ = Pickable.__reduce_ex__
+
+
+def evaluate_derivatives(exprs):
+    """
+    Replace the Derivatives in ``exprs`` with their finite-difference
+    approximations.
+
+    Derivatives appearing multiple times, also across different expressions,
+    as well as any other repeated sub-expression, are only evaluated once.
+
+    Parameters
+    ----------
+    exprs : expr-like or list of expr-like
+        The expressions to be evaluated.
+
+    Returns
+    -------
+    expr-like or list of expr-like
+        The evaluated expressions.
+    """
+    mapper = {}
+    if isinstance(exprs, (list, tuple)):
+        return type(exprs)(_evaluate(i, mapper) for i in exprs)
+    return _evaluate(exprs, mapper)
+
+
+def _evaluate(expr, mapper):
+    if not isinstance(expr, sympy.Basic) or expr.is_Atom:
+        return expr
+    elif isinstance(expr, sympy.Eq):
+        # Going through `xreplace` retains the attributes of a devito Eq. Also,
+        # Eqs are never memoized, as equality disregards such attributes (e.g.,
+        # two Eqs may only differ in their `implicit_dims`)
+        return expr.xreplace({i: _evaluate(i, mapper) for i in expr.args})
+    try:
+        return mapper[expr]
+    except KeyError:
+        pass
+
+    if isinstance(expr, Derivative):
+        ret = expr._evaluate(mapper)
+    elif getattr(expr, 'is_AbstractFunction', False) or expr.is_Indexed:
+        ret = expr
+    else:
+        args = [_evaluate(i, mapper) for i in expr.args]
+        if all(i is j for i, j in zip(args, expr.args)):
+            ret = expr
+        else:
+            ret = expr.func(*args)
+
+    mapper[expr] = ret
+    return ret
@@ -66,6 +66,15 @@ class Differentiable(sympy.Expr):
     def _uses_symbolic_coefficients(self):
         return bool(self._symbolic_functions)
 
+    @property
+    def evaluate(self):
+        """
+        The finite-difference approximation of ``self``, that is ``self`` with
+        all of its Derivatives evaluated.
+        """
+        from devito.finite_differences.derivative import evaluate_derivatives
+        return evaluate_derivatives(self)
+
     def __hash__(self):
         return super(Differentiable, self).__hash__()
 
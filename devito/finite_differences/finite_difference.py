@@ -1,18 +1,26 @@
-from functools import partial, wraps
+import os
+import pickle
+from functools import lru_cache, partial, wraps
+from tempfile import mkstemp
 
-from sympy import S, finite_diff_weights
+from sympy import Float, Rational, S, finite_diff_weights
 
 from devito.finite_differences import Differentiable
-from devito.tools import Tag
+from devito.finite_differences.differentiable import Add
+from devito.logger import debug
+from devito.tools import Tag, filter_ordered, make_tempdir
 
 __all__ = ['first_derivative', 'second_derivative', 'cross_derivative',
            'generic_derivative', 'left', 'right', 'centered', 'transpose',
-           'generate_indices', 'form_side']
+           'generate_indices', 'form_side', 'fd_weights']
 
 # Number of digits for FD coefficients to avoid roundup errors and non-deterministic
 # code generation
 _PRECISION = 9
 
+# Maximum number of FD weight vectors and derivative shortcut tables kept in memory
+_FD_CACHE_SIZE = 1024
+
 
 class Transpose(Tag):
     """
@@ -117,7 +125,7 @@ def first_derivative(expr, dim, fd_order=None, side=centered, matvec=direct,
 
     This is also more easily obtainable via:
 
-    >>> (f*g).dx
+    >>> (f*g).dx.evaluate
     -f(x, y)*g(x, y)/h_x + f(x + h_x, y)*g(x + h_x, y)/h_x
 
     The adjoint mode
@@ -136,20 +144,9 @@ def first_derivative(expr, dim, fd_order=None, side=centered, matvec=direct,
     # Finite difference weights from Taylor approximation with these positions
     if symbolic:
         c = symbolic_weights(expr, 1, ind, dim)
+        return (matvec.val*instantiate_stencil(expr, dim, ind, c)).evalf(_PRECISION)
     else:
-        c = finite_diff_weights(1, ind, dim)[-1][-1]
-
-    # Loop through positions
-    deriv = 0
-    all_dims = tuple(set((dim,) + tuple([i for i in expr.indices if i.root == dim])))
-    for i in range(len(ind)):
-        subs = dict([(d, ind[i].subs({dim: d})) for d in all_dims])
-        deriv += expr.subs(subs) * c[i]
-
-    # Evaluate up to _PRECISION digits
-    deriv = (matvec.val*deriv).evalf(_PRECISION)
-
-    return deriv
+        return evaluate_stencil(expr, dim, ind, dim, 1, matvec.val)
 
 
 @check_input
@@ -188,7 +185,7 @@ def second_derivative(expr, dim, fd_order, stagger=None, **kwargs):
 
     This is also more easily obtainable via:
 
-    >>> (f*g).dx2
+    >>> (f*g).dx2.evaluate
     -2.0*f(x, y)*g(x, y)/h_x**2 + f(x - h_x, y)*g(x - h_x, y)/h_x**2 +\
  f(x + h_x, y)*g(x + h_x, y)/h_x**2
     """
@@ -236,7 +233,7 @@ def cross_derivative(expr, dims, fd_order, deriv_order, stagger=None, **kwargs):
 
     This is also more easily obtainable via:
 
-    >>> (f*g).dxdy
+    >>> (f*g).dxdy.evaluate
     -0.5*(-0.5*f(x - h_x, y - h_y)*g(x - h_x, y - h_y)/h_x +\
  0.5*f(x + h_x, y - h_y)*g(x + h_x, y - h_y)/h_x)/h_y +\
  0.5*(-0.5*f(x - h_x, y + h_y)*g(x - h_x, y + h_y)/h_x +\
@@ -282,20 +279,146 @@ def generic_derivative(expr, dim, fd_order, deriv_order, stagger=None, symbolic=
     # Finite difference weights from Taylor approximation with these positions
     if symbolic:
         c = symbolic_weights(expr, deriv_order, indices, x0)
+        return instantiate_stencil(expr, dim, indices, c).evalf(_PRECISION)
     else:
-        c = finite_diff_weights(deriv_order, indices, x0)[-1][-1]
+        return evaluate_stencil(expr, dim, indices, x0, deriv_order)
+
+
+def evaluate_stencil(expr, dim, indices, x0, deriv_order, sign=1):
+    """
+    Evaluate, up to ``_PRECISION`` digits, the ``deriv_order`` derivative of
+    ``expr`` w.r.t. ``dim`` at ``x0``, using the stencil points ``indices``.
+
+    The weights are retrieved from the ``fd_weights`` cache. If ``expr`` is
+    unaffected by ``evalf`` (e.g., it is a Function, or it has already been
+    evaluated), the weighted stencil is produced directly; otherwise, as
+    numbers in ``expr`` interact with the weights, the whole derivative is
+    evaluated as well.
+    """
+    diff = dim.spacing
+
+    if expr.evalf(_PRECISION).compare(expr) != 0:
+        c = [sign*i for i in finite_diff_weights(deriv_order, indices, x0)[-1][-1]]
+        return instantiate_stencil(expr, dim, indices, c).evalf(_PRECISION)
 
-    # Loop through positions
-    deriv = 0
-    all_dims = tuple(set((dim,) + tuple(i for i in expr.indices if i.root == dim)))
-    for i in range(len(indices)):
-        subs = dict((d, indices[i].subs({dim: d})) for d in all_dims)
-        deriv += expr.subs(subs) * c[i]
+    # The weights are computed in units of the symbolic part of the spacing,
+    # which, e.g. for ConditionalDimensions, may carry a numeric factor
+    unit = diff.as_coeff_Mul()[1]
+    offsets = tuple((i - dim)/unit for i in indices)
+    weights = fd_weights(deriv_order, offsets, (x0 - dim)/unit, sign)
 
-    # Evaluate up to _PRECISION digits
-    deriv = deriv.evalf(_PRECISION)
+    return instantiate_stencil(expr, dim, indices, [i*unit**-deriv_order
+                                                    for i in weights])
 
-    return deriv
+
+def instantiate_stencil(expr, dim, indices, weights):
+    """
+    Build the weighted sum of the copies of ``expr`` shifted, along ``dim``
+    as well as any Dimension derived from it, to each of the ``indices``.
+    """
+    dims = filter_ordered((dim,) + tuple(i for i in expr.indices if i.root == dim))
+    terms = []
+    for i, c in zip(indices, weights):
+        if c == 0:
+            continue
+        mapper = {d: i.xreplace({dim: d}) for d in dims}
+        terms.append(expr.xreplace(mapper)*c)
+    return Add(*terms)
+
+
+class FDWeightsCache(object):
+
+    """
+    An on-disk cache of finite-difference weights, shared by all processes on
+    the same machine. Unless a ``path`` is given, the cache lives in the Devito
+    temporary directory. The file is rewritten atomically whenever new weights
+    are added.
+    """
+
+    def __init__(self, path=None):
+        self._path = path
+        self._mapper = None
+
+    @property
+    def path(self):
+        if self._path is None:
+            self._path = os.path.join(str(make_tempdir('fdcache')),
+                                      'fd-weights-p%d.pkl' % _PRECISION)
+        return self._path
+
+    @property
+    def mapper(self):
+        if self._mapper is None:
+            try:
+                with open(self.path, 'rb') as f:
+                    self._mapper = pickle.load(f)
+            except (OSError, EOFError, pickle.UnpicklingError, AttributeError):
+                self._mapper = {}
+        return self._mapper
+
+    def get(self, key):
+        return self.mapper.get(key)
+
+    def put(self, key, weights):
+        self.mapper[key] = weights
+        try:
+            # Atomic update: concurrent readers see either the old or the new file
+            fd, tmp = mkstemp(dir=os.path.dirname(self.path))
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(self.mapper, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            debug("Couldn't update the FD weights cache [%s]" % e)
+
+
+_fd_weights_cache = FDWeightsCache()
+
+
+@lru_cache(maxsize=_FD_CACHE_SIZE)
+def fd_weights(deriv_order, offsets, x0=0, sign=1):
+    """
+    Finite-difference weights, rounded to ``_PRECISION`` digits, for a
+    stencil on a uniform grid.
+
+    The weights are computed once and then cached, both in memory and on
+    disk, so that identical stencils are only ever derived once. As would
+    ``evalf``, the weights equal to 0, 1 or -1 are returned as exact numbers.
+
+    Parameters
+    ----------
+    deriv_order : int
+        Derivative order, e.g. 2 for a second-order derivative.
+    offsets : tuple of numbers
+        The stencil points, in units of the grid spacing.
+    x0 : number, optional
+        The point, in units of the grid spacing, at which the derivative is
+        approximated. Defaults to 0.
+    sign : int, optional
+        Either 1 or -1, the sign of the weights. Defaults to 1.
+
+    Returns
+    -------
+    tuple of Number
+        The weights, in units of ``spacing**-deriv_order``.
+
+    Examples
+    --------
+    >>> from devito.finite_differences import fd_weights
+    >>> fd_weights(2, (-1, 0, 1))
+    (1, -2.00000000, 1)
+    """
+    offsets = tuple(Rational(i) for i in offsets)
+    x0 = Rational(x0)
+    key = (deriv_order, offsets, x0, sign)
+
+    weights = _fd_weights_cache.get(key)
+    if weights is None:
+        weights = finite_diff_weights(deriv_order, offsets, x0)[-1][-1]
+        weights = tuple(sign*i if i in (0, 1, -1) else Float(sign*i, _PRECISION)
+                        for i in weights)
+        _fd_weights_cache.put(key, weights)
+
+    return weights
 
 
 def generate_fd_shortcuts(function):
@@ -304,11 +427,22 @@ def generate_fd_shortcuts(function):
     space_fd_order = function.space_order
     time_fd_order = function.time_order if (function.is_TimeFunction or
                                             function.is_SparseTimeFunction) else 0
+    side = form_side(dimensions, function)
 
-    deriv_function = generic_derivative
-    c_deriv_function = cross_derivative
+    # The derivatives only depend on these properties, hence they are shared
+    # by all Functions with the same Dimensions, orders and staggering
+    return dict(_generate_fd_shortcuts(dimensions, space_fd_order, time_fd_order,
+                                       tuple(side[d] for d in dimensions),
+                                       function.is_Staggered))
 
-    side = form_side(dimensions, function)
+
+@lru_cache(maxsize=_FD_CACHE_SIZE)
+def _generate_fd_shortcuts(dimensions, space_fd_order, time_fd_order, side,
+                           is_Staggered):
+    # The shortcuts produce unevaluated Derivatives, expanded upon lowering
+    from devito.finite_differences.derivative import Derivative
+
+    side = dict(zip(dimensions, side))
 
     derivatives = dict()
     done = []
@@ -321,7 +455,7 @@ def generate_fd_shortcuts(function):
         name = 't' if d.is_Time else d.root.name
         # All possible derivatives go up to the dimension FD order
         for o in range(1, dim_order + 1):
-            deriv = partial(deriv_function, deriv_order=o, dim=d,
+            deriv = partial(Derivative, deriv_order=o, dims=d,
                             fd_order=dim_order, stagger=side[d])
             name_fd = 'd%s%d' % (name, o) if o > 1 else 'd%s' % name
             desciption = 'derivative of order %d w.r.t dimension %s' % (o, d)
@@ -333,7 +467,7 @@ def generate_fd_shortcuts(function):
                 dim_order2 = time_fd_order if d2.is_Time else space_fd_order
                 name2 = 't' if d2.is_Time else d2.root.name
                 for o2 in range(1, dim_order2 + 1):
-                    deriv = partial(c_deriv_function, deriv_order=(o, o2), dims=(d, d2),
+                    deriv = partial(Derivative, deriv_order=(o, o2), dims=(d, d2),
                                     fd_order=(dim_order, dim_order2),
                                     stagger=(side[d], side[d2]))
                     name_fd2 = 'd%s%d' % (name, o) if o > 1 else 'd%s' % name
@@ -345,9 +479,9 @@ def generate_fd_shortcuts(function):
     # Add non-conventional, non-centered first-order FDs
     for d in dimensions:
         name = 't' if d.is_Time else d.root.name
-        if function.is_Staggered:
+        if is_Staggered:
             # Add centered first derivatives if staggered
-            deriv = partial(deriv_function, deriv_order=1, dim=d,
+            deriv = partial(Derivative, deriv_order=1, dims=d,
                             fd_order=dim_order, stagger=centered)
             name_fd = 'd%sc' % name
             desciption = 'centered derivative staggered w.r.t dimension %s' % d
@@ -356,12 +490,12 @@ def generate_fd_shortcuts(function):
         else:
             # Left
             dim_order = time_fd_order if d.is_Time else space_fd_order
-            deriv = partial(first_derivative, fd_order=dim_order, dim=d, side=left)
+            deriv = partial(Derivative, fd_order=dim_order, dims=d, side=left)
             name_fd = 'd%sl' % name
             desciption = 'left first order derivative w.r.t dimension %s' % d
             derivatives[name_fd] = (deriv, desciption)
             # Right
-            deriv = partial(first_derivative, fd_order=dim_order, dim=d, side=right)
+            deriv = partial(Derivative, fd_order=dim_order, dims=d, side=right)
             name_fd = 'd%sr' % name
             desciption = 'right first order derivative w.r.t dimension %s' % d
             derivatives[name_fd] = (deriv, desciption)
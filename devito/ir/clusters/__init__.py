@@ -1,3 +1,5 @@
 from devito.ir.clusters.cluster import *  # noqa
 from devito.ir.clusters.algorithms import *  # noqa
 from devito.ir.clusters.graph import *  # noqa
+from devito.ir.clusters.padding import *  # noqa
+from devito.ir.clusters.subdomains import *  # noqa
@@ -22,6 +22,10 @@ def groupby(clusters):
     """
     clusters = clusters.unfreeze()
 
+    # The Scope of each PartialCluster in `processed`. These are extended, rather
+    # than rebuilt, to test fusion with subsequent PartialClusters
+    scopes = {}
+
     processed = ClusterGroup()
     for c in clusters:
         fused = False
@@ -31,7 +35,9 @@ def groupby(clusters):
                 break
 
             # Collect all relevant data dependences
-            scope = Scope(exprs=candidate.exprs + c.exprs)
+            if candidate not in scopes:
+                scopes[candidate] = Scope(exprs=candidate.exprs)
+            scope = scopes[candidate].extend(c.exprs)
 
             # Collect anti-dependences preventing grouping
             anti = scope.d_anti.carried() - scope.d_anti.increment
@@ -54,8 +60,14 @@ def groupby(clusters):
                 funcs.update({i.function for i in scope.d_flow.independent()
                               if is_local(i.function, candidate, c, clusters)})
 
+                nexprs = len(candidate.exprs) + len(c.exprs)
                 bump_and_contract(funcs, candidate, c)
                 candidate.squash(c)
+                if funcs or len(candidate.exprs) != nexprs:
+                    # The expressions changed, so `scope` is stale
+                    scopes.pop(candidate)
+                else:
+                    scopes[candidate] = scope
                 fused = True
                 break
             elif anti:
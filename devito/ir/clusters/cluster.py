@@ -210,6 +210,11 @@ class Cluster(PartialCluster):
         """
         return Cluster(exprs, self.ispace, self.dspace, self.atomics, self.guards)
 
+    def __getstate__(self):
+        # Drop the cached properties (e.g., the FlowGraph), which get recomputed
+        # if and when needed
+        return {k: v for k, v in self.__dict__.items() if k.startswith('_')}
+
     @PartialCluster.exprs.setter
     def exprs(self, val):
         raise AttributeError
@@ -0,0 +1,156 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from devito.logger import perf
+from devito.symbolics import retrieve_indexed
+from devito.tools import filter_ordered, filter_sorted
+
+__all__ = ['autopad']
+
+
+def autopad(clusters, platform, npoints=4, ncandidates=32):
+    """
+    Pick the padding of the innermost Dimension of the DiscreteFunctions
+    accessed in ``clusters`` so as to minimize cache-set conflicts.
+
+    With grid sizes such as large powers of two, the many streams read by
+    a stencil (neighbouring rows and planes, time buffers, model fields) end
+    up mapped to the same few cache sets, causing conflict misses well before
+    the cache capacity is exhausted. For each DiscreteFunction, in turn, the
+    padding is chosen among multiples of the SIMD vector length (so the
+    alignment of each row is preserved) to minimize the number of lines
+    exceeding the associativity of the private caches of ``platform``, over
+    the streams of all co-accessed DiscreteFunctions.
+
+    Parameters
+    ----------
+    clusters : list of Cluster
+        The Clusters whose memory accesses are analyzed.
+    platform : Platform
+        The target Platform, which provides the cache geometry.
+    npoints : int, optional
+        Number of iteration points at which the streams are sampled.
+    ncandidates : int, optional
+        Max number of padding values tried for each DiscreteFunction.
+
+    Returns
+    -------
+    list of DiscreteFunction
+        The DiscreteFunctions whose padding has changed.
+
+    Notes
+    -----
+    Only DiscreteFunctions whose data hasn't been allocated yet and whose
+    padding wasn't explicitly provided are padded; the others contribute to
+    the analysis with their current layout. As the padding only extends the
+    innermost Dimension rightwards, the generated code is unaffected.
+    """
+    # The streams of each Cluster; Clusters with the same streams (e.g., the
+    # same stencil in different sub-regions) only need to be analyzed once
+    streams = OrderedDict()
+    for c in clusters:
+        v = _streams(c)
+        if v:
+            streams[tuple((f, i.tobytes()) for f, i in v.items())] = v
+    streams = list(streams.values())
+
+    caches = [i for i in platform.caches if i.level <= 2]
+    if not caches or not streams:
+        return []
+    functions = filter_sorted({f for i in streams for f in i})
+
+    # The allocated shape of each DiscreteFunction
+    layouts = OrderedDict((f, list(f.shape_allocated)) for f in functions)
+
+    # Iteration points at which the streams are sampled, far from the origin
+    # so that no stream is artificially aligned
+    dimensions = sorted({d.root for f in functions for d in f.dimensions},
+                        key=lambda d: d.name)
+    rng = np.random.RandomState(0)
+    points = [{d: rng.randint(0, 2**20) for d in dimensions} for _ in range(npoints)]
+
+    candidates = [f for f in functions if f._padding_auto and f._data is None and
+                  f.dimensions[-1].is_Space]
+    # Functions accessed the most first, as they weigh the most on the conflicts
+    candidates.sort(key=lambda f: -sum(len(i.get(f, ())) for i in streams))
+
+    padded = []
+    for f in candidates:
+        involved = [i for i in streams if f in i]
+
+        # Padding granularity, so that each row stays aligned
+        nitems = max(platform.simd_items_per_reg(f.dtype), 1)
+        nbytes = nitems*np.dtype(f.dtype).itemsize
+        npad = min(max(caches[0].stride // nbytes, 1), ncandidates)
+
+        nopad = f.shape_allocated[-1] - f.padding[-1][1]
+        costs = []
+        for i in range(npad):
+            layouts[f][-1] = nopad + i*nitems
+            costs.append(sum(_cost(s, layouts, caches, points) for s in involved))
+            if costs[-1] == 0:
+                break
+        pad = int(np.argmin(costs))*nitems
+        layouts[f][-1] = nopad + pad
+
+        if pad != f.padding[-1][1]:
+            perf("Autopadding: `%s` padded by %d points along `%s` (conflicts: "
+                 "%d -> %d)" % (f.name, pad, f.dimensions[-1], costs[0], min(costs)))
+            f._set_padding(f.padding[:-1] + ((f.padding[-1][0], pad),))
+            padded.append(f)
+
+    return padded
+
+
+def _streams(cluster):
+    """
+    The streams of ``cluster``, that is its distinct DiscreteFunction accesses,
+    as a mapper from DiscreteFunctions to arrays of access offsets.
+    """
+    ret = OrderedDict()
+    for e in cluster.exprs:
+        for indexed in retrieve_indexed(e):
+            f = indexed.function
+            if not f.is_DiscreteFunction or not f.dimensions[-1].is_Space:
+                continue
+            offsets = []
+            for i in indexed.indices:
+                shift, var = i.as_coeff_Add()
+                if not (var.is_Symbol or var == 0) or not shift.is_Integer:
+                    # E.g., indirect or non-affine accesses
+                    break
+                offsets.append(int(shift))
+            else:
+                ret.setdefault(f, []).append(tuple(offsets))
+    return OrderedDict((k, np.array(filter_ordered(v))) for k, v in ret.items())
+
+
+def _cost(streams, layouts, caches, points):
+    """
+    The number of cache lines, over all sets of all ``caches``, in excess of the
+    associativity, when ``streams`` are accessed at the given ``points``.
+    """
+    ret = 0
+    for p in points:
+        owners = []
+        addresses = []
+        for n, (f, offsets) in enumerate(streams.items()):
+            shape = np.array(layouts[f])
+            strides = np.append(np.cumprod(shape[:0:-1])[::-1], 1)
+            # The Function's base address, or the worst-case alignment (i.e.,
+            # a page boundary) if not allocated yet
+            base = f._data.ctypes.data if f._data is not None else 0
+            start = np.array([p[d.root] % i for d, i in zip(f.dimensions, f.shape)])
+            index = (start + offsets) % shape
+            addresses.append(base + index.dot(strides)*np.dtype(f.dtype).itemsize)
+            owners.append(np.full(len(offsets), n))
+        owners = np.concatenate(owners)
+        addresses = np.concatenate(addresses)
+        for cache in caches:
+            # Distinct DiscreteFunctions never share a line, even if their
+            # (assumed) base addresses coincide
+            lines = np.unique(np.stack([owners, addresses // cache.line_size]), axis=1)
+            _, counts = np.unique(lines[1] % cache.nsets, return_counts=True)
+            ret += int(np.maximum(counts - cache.ways, 0).sum())
+    return ret
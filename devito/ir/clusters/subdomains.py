@@ -0,0 +1,114 @@
+from collections import OrderedDict
+
+from devito.ir.clusters.cluster import Cluster, ClusterGroup
+from devito.ir.support import Any, DataSpace, Interval, IntervalGroup, IterationSpace
+from devito.symbolics import FrozenExpr, retrieve_indexed
+from devito.tools import filter_ordered, flatten
+
+__all__ = ['split_subdomains']
+
+
+def split_subdomains(clusters):
+    """
+    Split the Clusters reading, at the iteration point, Functions which are
+    constant over some SubDomain (see the ``constant_on`` argument of Function)
+    into: ::
+
+        * a Cluster iterating over the SubDomain, in which the constants are
+          folded in (e.g., ``damp*u.dt`` vanishes where ``damp`` is 0);
+        * one Cluster for each slab of the SubDomain's complement, in which
+          the expressions retain their original form.
+
+    Only Clusters carrying no data dependences along the SubDomain Dimensions
+    are split, so that the slabs can be computed in any order. The accesses to
+    the temporaries produced by the DSE are unaffected, as these still span
+    the entire Grid.
+
+    Parameters
+    ----------
+    clusters : ClusterGroup
+        The Clusters to be split.
+
+    Returns
+    -------
+    ClusterGroup
+        The Clusters after the split.
+    """
+    writes = {e.lhs.function for c in clusters for e in c.exprs if e.lhs.is_Indexed}
+
+    processed = ClusterGroup()
+    for c in clusters:
+        if c.is_sparse or c.guards:
+            processed.append(c)
+            continue
+
+        # The constant Functions read at the iteration point, grouped by the
+        # SubDomains in which they are constant
+        mapper = OrderedDict()
+        for i in filter_ordered(flatten(retrieve_indexed(e.rhs) for e in c.exprs)):
+            f = i.function
+            if f in writes or not getattr(f, 'constant_on', None):
+                continue
+            if i.indices != tuple(d + o for d, o in zip(f.dimensions, f._offset_domain)):
+                continue
+            for k, v in f.constant_on.items():
+                if all(c.ispace.directions.get(d.root) is Any for d in k.dimensions):
+                    mapper.setdefault(k, OrderedDict())[i] = v
+        if not mapper:
+            processed.append(c)
+            continue
+
+        # Pick the SubDomain folding in the most Functions
+        subdomain, rules = max(mapper.items(), key=lambda i: len(i[1]))
+        processed.append(_specialize(c, subdomain.dimension_map, rules))
+        processed.extend(_specialize(c, i.dimension_map) for i in subdomain.complement)
+
+    return processed
+
+
+def _specialize(cluster, mapper, rules=None):
+    """
+    Rebuild ``cluster`` so that it iterates over the Dimensions in ``mapper``,
+    with the objects in ``rules`` replaced by the given constants.
+    """
+    rules = dict(rules or {})
+    exprs = []
+    for e in cluster.exprs:
+        rhs = _fold(e.rhs, rules)
+        if e.lhs.is_Symbol and rhs.is_Number:
+            # Propagate the scalar temporaries reduced to constants
+            rules[e.lhs] = rhs
+            continue
+        exprs.append(e.func(e.lhs, rhs).xreplace(mapper))
+
+    ispace = cluster.ispace
+    sub_iterators = {mapper.get(k, k): v for k, v in ispace.sub_iterators.items()}
+    directions = {mapper.get(k, k): v for k, v in ispace.directions.items()}
+    ispace = IterationSpace(_remap(ispace.intervals, mapper), sub_iterators, directions)
+    dspace = cluster.dspace
+    dspace = DataSpace(_remap(dspace.intervals, mapper),
+                       {k: _remap(v, mapper) for k, v in dspace.parts.items()})
+
+    return Cluster(exprs, ispace, dspace, cluster.atomics, cluster.guards)
+
+
+def _fold(expr, rules):
+    """
+    Replace the objects in ``rules`` within ``expr``, re-evaluating (and thus
+    simplifying) only the sub-expressions affected by the replacement.
+    """
+    if expr in rules:
+        return rules[expr]
+    if expr.is_Atom or expr.is_Indexed:
+        return expr
+    args = [_fold(i, rules) for i in expr.args]
+    if all(i is j for i, j in zip(args, expr.args)):
+        return expr
+    func = expr.func.__base__ if isinstance(expr, FrozenExpr) else expr.func
+    return func(*args)
+
+
+def _remap(intervals, mapper):
+    relations = [tuple(mapper.get(d, d) for d in i) for i in intervals.relations]
+    return IntervalGroup([Interval(mapper.get(i.dim, i.dim), i.lower, i.upper)
+                          for i in intervals], relations=relations)
@@ -5,3 +5,4 @@ from devito.ir.iet.utils import *  # noqa
 from devito.ir.iet.analysis import *  # noqa
 from devito.ir.iet.scheduler import *  # noqa
 from devito.ir.iet.efunc import *  # noqa
+from devito.ir.iet.index import *  # noqa
@@ -1,13 +1,15 @@
 from collections import OrderedDict
 from functools import cmp_to_key
 
-from devito.ir.iet import (Iteration, HaloSpot, SEQUENTIAL, PARALLEL, PARALLEL_IF_ATOMIC,
-                           VECTOR, WRAPPABLE, AFFINE, USELESS, OVERLAPPABLE, hoistable,
-                           MapNodes, Transformer, retrieve_iteration_tree)
-from devito.ir.support import Scope
-from devito.tools import as_tuple, filter_ordered, flatten
+from devito.ir.iet import (Conditional, Expression, Iteration, HaloSpot, SEQUENTIAL,
+                           PARALLEL, PARALLEL_IF_ATOMIC, VECTOR, WRAPPABLE, AFFINE,
+                           USELESS, OVERLAPPABLE, hoistable, FindNodes, MapNodes,
+                           Transformer, retrieve_iteration_tree)
+from devito.ir.support import Backward, Scope
+from devito.symbolics import retrieve_indexed
+from devito.tools import as_tuple, filter_ordered, flatten, is_integer
 
-__all__ = ['iet_analyze']
+__all__ = ['iet_analyze', 'is_wrappable']
 
 
 class Analysis(object):
@@ -306,3 +308,93 @@ def mark_halospot_overlappable(analysis):
             properties[hs] = OVERLAPPABLE
 
     analysis.update(properties)
+
+
+def is_wrappable(function, iteration):
+    """
+    Return True if, within the modulo Iteration ``iteration``, the buffer of the
+    TimeFunction ``function`` may be one slot smaller, that is if its oldest
+    timeslot (the `back`) may share the same slot as its newest one (the `front`).
+
+    This is the case if, at each timestep, the back is never written, the front is
+    written before being read, and the back is entirely read before the front is
+    written. The latter holds if the back is read within loop nests preceding those
+    writing to the front, or within the same innermost Iteration as the write,
+    at the same point, and not after it.
+    """
+    if any(function in i.functions for i in FindNodes(Conditional).visit(iteration)):
+        return False
+
+    # Each Expression is assigned its position in program order, the loop nest
+    # (i.e., child Iteration of `iteration`) it belongs to, and its innermost Iteration
+    exprs = FindNodes(Expression).visit(iteration)
+    position = {e: n for n, e in enumerate(exprs)}
+    nests = filter_ordered(i[1] for i in retrieve_iteration_tree(iteration) if len(i) > 1)
+    nest = {e: i for i in nests for e in FindNodes(Expression).visit(i)}
+    owner = {}
+    for i in retrieve_iteration_tree(iteration):
+        for e in FindNodes(Expression).visit(i[-1].nodes):
+            owner.setdefault(e, i[-1])
+
+    # The accesses to `function`, as (timeslot, point, Expression, is_write)
+    subs = {d: d.origin for d in iteration.uindices if d.is_Modulo}
+    stepping = function.indices[function._time_position]
+    accesses = []
+    for e in exprs:
+        writes = [e.expr.lhs] if e.write is function else []
+        reads = retrieve_indexed(e.expr.rhs)
+        if e.is_Increment:
+            reads += writes
+        reads = [(i, False) for i in reads]
+        writes = [(i, True) for i in writes]
+        for indexed, is_write in reads + writes:
+            if indexed.function is not function:
+                continue
+            indices = [i.xreplace(subs) for i in indexed.indices]
+            slot = indices.pop(function._time_position) - stepping
+            if not is_integer(slot):
+                return False
+            accesses.append((int(slot), tuple(indices), e, is_write))
+    if not accesses:
+        return True
+
+    back = min(i[0] for i in accesses)
+    front = max(i[0] for i in accesses)
+    span = front - back + 1
+    if span > function._time_size:
+        return False
+    if iteration.direction is Backward:
+        back, front = front, back
+
+    # The front must be written before being read, as otherwise the value read
+    # would depend on the buffer size
+    front_writes = [(p, e) for slot, p, e, is_write in accesses
+                    if slot == front and is_write]
+    if not front_writes:
+        return False
+    first = min(position[e] for _, e in front_writes)
+    if any(position[e] <= first for slot, _, e, is_write in accesses
+           if slot == front and not is_write):
+        return False
+
+    if span < function._time_size:
+        # The back and the front already fit in a smaller buffer
+        return True
+
+    # There must be NO writes to the back
+    if any(is_write for slot, _, _, is_write in accesses if slot == back):
+        return False
+
+    # There must be NO accesses to the back after the front is written
+    for slot, point, e, _ in accesses:
+        if slot != back:
+            continue
+        for p, w in front_writes:
+            if nest.get(e, e) is not nest.get(w, w):
+                if position[w] < position[e]:
+                    return False
+            elif owner.get(e) is None or owner.get(e) is not owner.get(w) or \
+                    point != p or position[w] < position[e]:
+                return False
+
+    return True
@@ -0,0 +1,206 @@
+from bisect import bisect_left
+from heapq import merge
+
+from devito.ir.iet.nodes import Node
+from devito.ir.iet.visitors import FindNodes, Transformer
+from devito.ir.iet.utils import retrieve_iteration_tree
+
+__all__ = ['IETIndex']
+
+
+class IETIndex(object):
+
+    """
+    An index over the nodes of an Iteration/Expression tree (IET).
+
+    The index provides node lookups by type, parent links and the Iteration
+    trees, without any traversal of the IET after construction. Further, an
+    IET can be transformed through its IETIndex, in which case only the nodes
+    along the paths from the root to the replaced nodes are visited and
+    rebuilt, while the index of the transformed IET is derived incrementally.
+
+    Parameters
+    ----------
+    root : Node
+        The root of the indexed IET.
+
+    Notes
+    -----
+    IETs are immutable, so an IETIndex is never invalidated. The IETIndex of
+    a given IET is cached on its root; use ``IETIndex.lookup`` to retrieve it.
+    """
+
+    def __init__(self, root, _reuse=None):
+        self.root = root
+
+        # Preorder (that is, the `FindNodes` order) arrays. The same Node may
+        # appear multiple times in an IET, hence nodes are identified by position
+        self._nodes = []
+        self._parents = []
+        self._ends = []
+
+        stack = [(root, -1)]
+        while stack:
+            o, parent = stack.pop()
+            if isinstance(o, Node):
+                start = len(self._nodes)
+                if _reuse is not None and o in _reuse:
+                    # An unchanged sub-tree, copied over from the original index
+                    self._extend(_reuse, _reuse._positions[o], parent)
+                    continue
+                self._nodes.append(o)
+                self._parents.append(parent)
+                self._ends.append(None)
+                stack.append((_Close(start), None))
+                stack.extend((i, start) for i in reversed(o.children))
+            elif isinstance(o, _Close):
+                # All of the descendants have been indexed
+                self._ends[o.position] = len(self._nodes)
+            elif isinstance(o, (tuple, list)):
+                stack.extend((i, parent) for i in reversed(o))
+
+        self._positions = {}
+        for n, i in enumerate(self._nodes):
+            self._positions.setdefault(i, n)
+
+        self._types = {}
+        for n, i in enumerate(self._nodes):
+            self._types.setdefault(type(i), []).append(n)
+
+        self._trees = None
+
+    def _extend(self, other, start, parent):
+        end = other._ends[start]
+        shift = len(self._nodes) - start
+        self._nodes.extend(other._nodes[start:end])
+        self._parents.append(parent)
+        self._parents.extend(i + shift for i in other._parents[start + 1:end])
+        self._ends.extend(i + shift for i in other._ends[start:end])
+
+    @classmethod
+    def lookup(cls, iet):
+        """
+        Return the IETIndex of ``iet``, building it if necessary.
+        """
+        try:
+            return iet._iet_index
+        except AttributeError:
+            index = iet._iet_index = cls(iet)
+            return index
+
+    def __contains__(self, node):
+        return node in self._positions
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def find(self, match, within=None):
+        """
+        Find all nodes of type ``match``, in the same order as ``FindNodes``.
+
+        Parameters
+        ----------
+        match : type or tuple of type
+            The searched type(s).
+        within : Node, optional
+            Restrict the search to the sub-tree rooted in ``within``. Defaults
+            to the whole IET.
+        """
+        if within is None:
+            start, end = 0, len(self._nodes)
+        elif within in self._positions:
+            start = self._positions[within]
+            end = self._ends[start]
+        else:
+            return FindNodes(match).visit(within)
+
+        found = []
+        for k, v in self._types.items():
+            if issubclass(k, match):
+                found.append(v[bisect_left(v, start):bisect_left(v, end)])
+        return [self._nodes[i] for i in merge(*found)]
+
+    def parent(self, node):
+        """
+        The parent of ``node``, or None if ``node`` is the root. If ``node``
+        appears multiple times in the IET, its first occurrence is considered.
+        """
+        parent = self._parents[self._positions[node]]
+        return self._nodes[parent] if parent >= 0 else None
+
+    def ancestors(self, node):
+        """
+        The ancestors of ``node``, from the root down to its parent. If
+        ``node`` appears multiple times in the IET, its first occurrence is
+        considered.
+        """
+        ancestors = []
+        parent = self._parents[self._positions[node]]
+        while parent >= 0:
+            ancestors.append(self._nodes[parent])
+            parent = self._parents[parent]
+        return tuple(reversed(ancestors))
+
+    @property
+    def iteration_trees(self):
+        """The Iteration trees in the IET, as in ``retrieve_iteration_tree``."""
+        if self._trees is None:
+            self._trees = retrieve_iteration_tree(self.root)
+        return list(self._trees)
+
+    def transform(self, mapper, nested=False):
+        """
+        Apply a ``Transformer(mapper, nested)`` to the IET.
+
+        Only the nodes along the paths from the root to the nodes in ``mapper``
+        are visited. The IETIndex of the transformed IET, retrievable through
+        ``IETIndex.lookup``, is derived incrementally from ``self``.
+
+        Returns
+        -------
+        Node
+            The root of the transformed IET.
+        """
+        if not any(k in self._positions for k in mapper):
+            return self.root
+
+        # All occurrences of the nodes in `mapper`, and all of their ancestors
+        spine = set()
+        for n, i in enumerate(self._nodes):
+            if i not in mapper:
+                continue
+            while n >= 0 and n not in spine:
+                spine.add(n)
+                n = self._parents[n]
+        spine = {self._nodes[i] for i in spine}
+
+        root = _SpineTransformer(mapper, nested, self._positions, spine).visit(self.root)
+        if isinstance(root, Node):
+            root._iet_index = IETIndex(root, _reuse=self)
+        return root
+
+
+class _Close(object):
+
+    """Marker for the end of the traversal of the node at ``position``."""
+
+    def __init__(self, position):
+        self.position = position
+
+
+class _SpineTransformer(Transformer):
+
+    """
+    A Transformer that doesn't descend into the sub-trees known not to contain
+    any of the nodes to be replaced.
+    """
+
+    def __init__(self, mapper, nested, known, spine):
+        super(_SpineTransformer, self).__init__(mapper, nested)
+        self.known = known
+        self.spine = spine
+
+    def visit_Node(self, o, **kwargs):
+        if o in self.known and o not in self.spine:
+            return o
+        return super(_SpineTransformer, self).visit_Node(o, **kwargs)
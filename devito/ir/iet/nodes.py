@@ -125,7 +125,10 @@ class Node(Signer):
         raise NotImplementedError()
 
     def _signature_items(self):
-        return (str(self.ccode),)
+        # Computed from the structure of the IET, which is way cheaper than
+        # generating the C code
+        from devito.ir.iet.visitors import CSignature
+        return tuple(CSignature().visit(self))
 
 
 # Some useful mixins
@@ -644,15 +647,26 @@ class ArrayCast(Node):
 
     """
     A node encapsulating a cast of a raw C pointer to a multi-dimensional array.
+
+    Parameters
+    ----------
+    function : DiscreteFunction or Array
+        The object whose raw pointer is cast.
+    shape : tuple of expr-like, optional
+        The shape of the cast, excluding the outermost Dimension. Defaults to the
+        runtime shape of ``function``.
     """
 
-    def __init__(self, function):
+    def __init__(self, function, shape=None):
         self.function = function
+        self.shape = shape
 
     @property
     def castshape(self):
         """The shape used in the left-hand side and right-hand side of the ArrayCast."""
-        if self.function.is_Array:
+        if self.shape is not None:
+            return self.shape
+        elif self.function.is_Array:
             return self.function.symbolic_shape[1:]
         else:
             return tuple(self.function._C_get_field(FULL, d).size
@@ -121,6 +121,9 @@ def iet_insert_decls(iet, external):
     # Classify and then schedule declarations to stack/heap
     allocator = Allocator()
     mapper = OrderedDict()
+    # Some Arrays may be declared by the enclosing Nodes (e.g., thread-private
+    # Arrays allocated within a parallel region)
+    defined = [i for i in FindSymbols('defines').visit(iet) if i.is_Array]
     for k, v in MapSections().visit(iet).items():
         if k.is_Expression:
             if k.is_scalar_assign:
@@ -141,6 +144,9 @@ def iet_insert_decls(iet, external):
                     if i in as_tuple(external):
                         # The Array is defined in some other IET
                         continue
+                    elif i in defined:
+                        # The Array is declared by an enclosing Node
+                        continue
                     elif i._mem_stack:
                         # On the stack
                         key = lambda i: not i.is_Parallel
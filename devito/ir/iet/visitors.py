@@ -5,11 +5,14 @@ The main Visitor class is adapted from https://github.com/coneoproject/COFFEE.
 """
 
 from collections import Iterable, OrderedDict
+from hashlib import sha1
 from operator import attrgetter
 
 import cgen as c
+import numpy as np
+from sympy import Add, Basic, Indexed, Mul, Pow
 
-from devito.cgen_utils import blankline, ccode
+from devito.cgen_utils import CodePrinter, blankline, ccode
 from devito.exceptions import VisitorException
 from devito.ir.iet.nodes import Node, Iteration, Expression, Call
 from devito.ir.support.space import Backward
@@ -17,8 +20,8 @@ from devito.tools import GenericVisitor, as_tuple, filter_sorted, flatten, dtype
 
 
 __all__ = ['FindNodes', 'FindSections', 'FindSymbols', 'MapSections', 'MapNodes',
-           'IsPerfectIteration', 'XSubs', 'printAST', 'CGen', 'Transformer',
-           'FindAdjacent']
+           'IsPerfectIteration', 'XSubs', 'Specializer', 'printAST', 'CGen',
+           'CSignature', 'Transformer', 'FindAdjacent']
 
 
 class Visitor(GenericVisitor):
@@ -329,6 +332,166 @@ class CGen(Visitor):
                         esigns + [blankline, kernel] + efuncs)
 
 
+class CSignature(Visitor):
+
+    """
+    Return the items from which the signature of the C code generated for an
+    Iteration/Expression tree is computed, without generating the C code.
+
+    Each visit method mirrors its counterpart in :class:`CGen`, so two trees
+    with the same items are guaranteed to produce the same C code. Expressions
+    are signed structurally, each distinct sub-expression being signed once.
+    """
+
+    _structural = {'Add': Add, 'Mul': Mul, 'Pow': Pow, 'Indexed': Indexed}
+    """
+    The expression types whose C code is fully determined by their type and
+    the C code of their arguments.
+    """
+
+    def __init__(self):
+        super(CSignature, self).__init__()
+        self._memo = {}
+        self._printers = {}
+
+    @classmethod
+    def default_retval(cls):
+        return []
+
+    def _sign(self, expr, dtype=np.float32):
+        """A unique, deterministic string representing the C code of ``expr``."""
+        key = (id(expr), dtype)
+        try:
+            return self._memo[key][1]
+        except KeyError:
+            pass
+
+        cls = expr.__class__
+        if not isinstance(expr, Basic):
+            ret = '%s:%s' % (cls.__name__, expr)
+        elif isinstance(expr, self._structural.get(cls.__name__, ())):
+            if expr.is_Indexed:
+                args = [self._sign(expr.base.label, dtype)]
+                args.extend(self._sign(i, dtype) for i in expr.indices)
+            else:
+                args = [self._sign(i, dtype) for i in expr.args]
+            ret = '%s(%s)' % (cls.__name__, ','.join(args))
+            ret = sha1(ret.encode()).hexdigest()
+        elif expr.is_Float:
+            # The C code of a Float depends on its nesting level, while the
+            # precision always is part of the signature
+            ret = 'Float:%s:%d:%s' % (expr._mpf_, expr._prec, dtype)
+        else:
+            # Instantiating a printer is expensive, so the same one is reused
+            try:
+                printer = self._printers[dtype]
+            except KeyError:
+                printer = self._printers[dtype] = CodePrinter(dtype=dtype)
+            ret = '%s.%s:%s' % (cls.__module__, cls.__name__, printer.doprint(expr, None))
+
+        # Keep `expr` alive, so that its `id` can't be reused
+        self._memo[key] = (expr, ret)
+        return ret
+
+    def _args_decl(self, args):
+        ret = []
+        for i in args:
+            if i.is_Tensor:
+                ret.append('%srestrict %s' % (i._C_typename, i._C_name))
+            elif i.is_AbstractObject or i.is_Symbol:
+                ret.append('%s %s' % (i._C_typename, i._C_name))
+            else:
+                ret.append('void *_%s' % i._C_name)
+        return ret
+
+    def _args_call(self, args):
+        ret = []
+        for i in args:
+            try:
+                if i.is_LocalObject:
+                    ret.append('&%s' % i._C_name)
+                elif i.is_Array:
+                    ret.append("(%s)%s" % (i._C_typename, i.name))
+                else:
+                    ret.append(i._C_name)
+            except AttributeError:
+                ret.append(self._sign(i))
+        return ret
+
+    def visit_object(self, o):
+        return [str(o)]
+
+    def visit_tuple(self, o):
+        return flatten(self._visit(i) for i in o)
+
+    visit_list = visit_tuple
+
+    def visit_Node(self, o):
+        return [o.__class__.__name__] + self._visit(o.children)
+
+    def visit_Block(self, o):
+        return ([o.__class__.__name__] + [str(i) for i in o.header] +
+                self._visit(o.children) + [str(i) for i in o.footer])
+
+    def visit_Section(self, o):
+        return [o.name] + self.visit_Block(o)
+
+    def visit_Element(self, o):
+        return ['Element', str(o.element)]
+
+    def visit_Expression(self, o):
+        return [o.__class__.__name__, str(o.dtype), self._sign(o.expr.lhs, o.dtype),
+                self._sign(o.expr.rhs, o.dtype)]
+
+    def visit_ForeignExpression(self, o):
+        return [o.__class__.__name__, self._sign(o.expr)]
+
+    def visit_Call(self, o):
+        return [o.__class__.__name__, o.name] + self._args_call(o.arguments)
+
+    def visit_Conditional(self, o):
+        ret = ['Conditional', self._sign(o.condition)] + self._visit(o.then_body)
+        if o.else_body:
+            ret += ['else'] + self._visit(o.else_body)
+        return ret
+
+    def visit_ArrayCast(self, o):
+        f = o.function
+        ret = ['ArrayCast', f.name, f._C_name, f._C_typedata, str(f._data_alignment)]
+        if f.is_DiscreteFunction:
+            ret.append(f._C_field_data)
+        return ret + [self._sign(i) for i in o.castshape]
+
+    def visit_Iteration(self, o):
+        ret = ['Iteration', str(o.index), str(o.direction)]
+        ret.extend(self._sign(i) for i in o.limits + o.offsets)
+        for i in o.uindices:
+            ret.extend([i.name, self._sign(i.symbolic_min), self._sign(i.symbolic_incr)])
+        ret.extend(str(i) for i in o.pragmas)
+        return ret + self._visit(o.children)
+
+    def visit_Callable(self, o):
+        return (['Callable', str(o.retval), o.name] + self._args_decl(o.parameters) +
+                self._visit(o.children))
+
+    def visit_Operator(self, o):
+        ret = self.visit_Callable(o)
+
+        # Elemental functions
+        for i in o._func_table.values():
+            if i.local:
+                ret.extend(self._visit(i.root))
+
+        # Header files, extra definitions, ...
+        ret.extend(o._headers)
+        ret.extend(o._includes)
+        cdefs = [i._C_typedecl for i in o.parameters if i._C_typedecl is not None]
+        ret.extend(str(i) for i in filter_sorted(cdefs, key=lambda i: i.tpname))
+        ret.append(o._compiler.src_ext)
+
+        return ret
+
+
 class FindSections(Visitor):
 
     @classmethod
@@ -668,6 +831,10 @@ class Transformer(Visitor):
 
     In the special case in which ``M[n]`` is an iterable of nodes, ``n`` is
     "extended" by pre-pending to its body the nodes in ``M[n]``.
+
+    Only the nodes along the paths from the root of T to the nodes in N are
+    rebuilt; the sub-trees of T not containing any node in N are retained as
+    they are in T'.
     """
 
     def __init__(self, mapper={}, nested=False):
@@ -680,6 +847,8 @@ class Transformer(Visitor):
 
     def visit_tuple(self, o, **kwargs):
         visited = tuple(self._visit(i, **kwargs) for i in o)
+        if isinstance(o, tuple) and all(i is j for i, j in zip(o, visited)):
+            return o
         return tuple(i for i in visited if i is not None)
 
     visit_list = visit_tuple
@@ -709,6 +878,9 @@ class Transformer(Visitor):
                     return handle._rebuild(**handle.args)
         else:
             children = [self._visit(i, **kwargs) for i in o.children]
+            if all(i is j for i, j in zip(o.children, children)):
+                # Nothing changed below `o`, hence there's no need to rebuild it
+                return o
             return o._rebuild(*children, **o.args_frozen)
 
     def visit_Operator(self, o, **kwargs):
@@ -736,5 +908,42 @@ class XSubs(Transformer):
         return o._rebuild(expr=self.replacer(o.expr))
 
 
+class Specializer(Transformer):
+    """
+    :class:`Transformer` that replaces the symbols in ``mapper`` with the given
+    values (typically, literals) throughout a tree. Unlike :class:`XSubs`, which
+    only acts on the :class:`Expression`s, this also processes the Iteration
+    bounds, the Conditionals, the Call arguments and the ArrayCasts.
+
+    Parameters
+    ----------
+    mapper : dict
+        The substitution rules, to be applied through SymPy's ``xreplace``.
+    """
+
+    def __init__(self, mapper):
+        super(Specializer, self).__init__()
+        self.replacer = lambda i: i.xreplace(mapper) if isinstance(i, Basic) else i
+
+    def visit_Expression(self, o):
+        return o._rebuild(expr=self.replacer(o.expr))
+
+    def visit_Iteration(self, o):
+        nodes = self._visit(o.nodes)
+        limits = tuple(self.replacer(i) for i in o.limits)
+        return o._rebuild(nodes, limits=limits)
+
+    def visit_Conditional(self, o):
+        then_body = self._visit(o.then_body)
+        else_body = self._visit(o.else_body)
+        return o._rebuild(then_body, else_body, condition=self.replacer(o.condition))
+
+    def visit_Call(self, o):
+        return o._rebuild(arguments=tuple(self.replacer(i) for i in o.arguments))
+
+    def visit_ArrayCast(self, o):
+        return o._rebuild(shape=tuple(self.replacer(i) for i in o.castshape))
+
+
 def printAST(node, verbose=True):
     return PrintAST(verbose=verbose)._visit(node)
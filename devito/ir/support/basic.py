@@ -794,14 +794,17 @@ class DependenceGroup(list):
         """Return the increment-induced dependences."""
         return DependenceGroup(i for i in self if i.is_increment)
 
+    @memoized_meth
     def carried(self, dim=None):
         """Return the dimension-carried dependences."""
         return DependenceGroup(i for i in self if i.is_carried(dim))
 
+    @memoized_meth
     def independent(self, dim=None):
         """Return the dimension-independent dependences."""
         return DependenceGroup(i for i in self if i.is_indep(dim))
 
+    @memoized_meth
     def inplace(self, dim=None):
         """Return the in-place dependences."""
         return DependenceGroup(i for i in self if i.is_inplace(dim))
@@ -812,6 +815,7 @@ class DependenceGroup(list):
 
     def __sub__(self, other):
         assert isinstance(other, DependenceGroup)
+        other = set(other)
         return DependenceGroup([i for i in self if i not in other])
 
     def project(self, function):
@@ -830,11 +834,22 @@ class Scope(object):
         from some IREq ``exprs``. The expressions must be provided
         in program order.
         """
-        exprs = as_tuple(exprs)
-
         self.reads = {}
         self.writes = {}
-        for i, e in enumerate(exprs):
+
+        # A Scope may be grown through `extend`, in which case the data
+        # dependences computed by the parent Scope are reused
+        self._parent = None
+        self._nexprs = 0
+
+        # Comparisons between TimedAccesses, indexed by their index functions
+        # and directions (see `_compare`)
+        self._compared = {}
+
+        self._add(as_tuple(exprs))
+
+    def _add(self, exprs):
+        for i, e in enumerate(exprs, self._nexprs):
             # reads
             for j in retrieve_terminals(e.rhs):
                 v = self.reads.setdefault(j.function, [])
@@ -848,6 +863,24 @@ class Scope(object):
             if e.is_Increment:
                 v = self.reads.setdefault(e.lhs.function, [])
                 v.append(TimedAccess(e.lhs, 'RI', i, e.ispace.directions))
+        self._nexprs += len(exprs)
+
+    def extend(self, exprs):
+        """
+        Return a new Scope for the expressions of ``self`` followed by ``exprs``.
+
+        The TimedAccesses of ``self``, as well as the data dependences between
+        them, are reused; only the data dependences involving ``exprs`` are
+        computed (lazily) by the new Scope.
+        """
+        scope = Scope(())
+        scope.reads = {k: list(v) for k, v in self.reads.items()}
+        scope.writes = {k: list(v) for k, v in self.writes.items()}
+        scope._parent = self
+        scope._nexprs = self._nexprs
+        scope._compared = self._compared
+        scope._add(as_tuple(exprs))
+        return scope
 
     def getreads(self, function):
         return as_tuple(self.reads.get(function))
@@ -889,58 +922,86 @@ class Scope(object):
         groups = list(self.reads.values()) + list(self.writes.values())
         return [i for group in groups for i in group]
 
+    def _compare(self, a, b):
+        """
+        Compare two TimedAccesses to the same Function regardless of their
+        timestamps. Return -1, 0, or 1 if ``a`` precedes, equals, or succeeds ``b``,
+        and None if they are not comparable (e.g., non-integer distance).
+
+        The outcome only depends on the index functions and on the directions,
+        so it is computed once for all TimedAccesses sharing them (e.g., all
+        reads of ``u[t+1, x, y]`` within the Scope).
+        """
+        key = (a.labels, tuple(a), tuple(a.directions), tuple(b), tuple(b.directions))
+        try:
+            return self._compared[key]
+        except KeyError:
+            pass
+        try:
+            v = a < b
+            ret = -1 if v else (0 if v is None else 1)
+        except TypeError:
+            ret = None
+        self._compared[key] = ret
+        return ret
+
+    @memoized_meth
+    def _dependences(self, function):
+        """
+        Retrieve the flow, anti, and output dependences induced by ``function``.
+        """
+        if self._parent is not None:
+            flow, anti, output = (list(i) for i in self._parent._dependences(function))
+            start = self._parent._nexprs
+        else:
+            flow, anti, output = [], [], []
+            start = 0
+
+        writes = self.writes.get(function, [])
+        reads = self.reads.get(function, [])
+        for w in writes:
+            for r in reads:
+                if w.timestamp < start and r.timestamp < start:
+                    # Already tested by the parent Scope
+                    continue
+                v = self._compare(r, w)
+                if v is None:
+                    # Non-integer vectors are not comparable.
+                    # Conservatively, we assume it is a dependence, unless
+                    # it's a read-for-increment
+                    is_flow = is_anti = not r.is_read_increment
+                else:
+                    is_flow = v < 0 or (v == 0 and r.lex_ge(w))
+                    is_anti = v > 0 or (v == 0 and r.lex_lt(w))
+                if is_flow:
+                    flow.append(Dependence(w, r))
+                if is_anti:
+                    anti.append(Dependence(r, w))
+            for w2 in writes:
+                if w.timestamp < start and w2.timestamp < start:
+                    continue
+                v = self._compare(w2, w)
+                # Non-integer vectors are not comparable.
+                # Conservatively, we assume it is a dependence
+                if v is None or v > 0 or (v == 0 and w2.lex_gt(w)):
+                    output.append(Dependence(w2, w))
+
+        return flow, anti, output
+
     @cached_property
     def d_flow(self):
         """Retrieve the flow dependencies, or true dependencies, or read-after-write."""
-        found = DependenceGroup()
-        for k, v in self.writes.items():
-            for w in v:
-                for r in self.reads.get(k, []):
-                    try:
-                        is_flow = (r < w) or (r == w and r.lex_ge(w))
-                    except TypeError:
-                        # Non-integer vectors are not comparable.
-                        # Conservatively, we assume it is a dependence, unless
-                        # it's a read-for-increment
-                        is_flow = not r.is_read_increment
-                    if is_flow:
-                        found.append(Dependence(w, r))
-        return found
+        return DependenceGroup(i for k in self.writes for i in self._dependences(k)[0])
 
     @cached_property
     def d_anti(self):
         """Retrieve the anti dependencies, or write-after-read."""
-        found = DependenceGroup()
-        for k, v in self.writes.items():
-            for w in v:
-                for r in self.reads.get(k, []):
-                    try:
-                        is_anti = (r > w) or (r == w and r.lex_lt(w))
-                    except TypeError:
-                        # Non-integer vectors are not comparable.
-                        # Conservatively, we assume it is a dependence, unless
-                        # it's a read-for-increment
-                        is_anti = not r.is_read_increment
-                    if is_anti:
-                        found.append(Dependence(r, w))
-        return found
+        return DependenceGroup(i for k in self.writes for i in self._dependences(k)[1])
 
     @cached_property
     def d_output(self):
         """Retrieve the output dependencies, or write-after-write."""
-        found = DependenceGroup()
-        for k, v in self.writes.items():
-            for w1 in v:
-                for w2 in self.writes.get(k, []):
-                    try:
-                        is_output = (w2 > w1) or (w2 == w1 and w2.lex_gt(w1))
-                    except TypeError:
-                        # Non-integer vectors are not comparable.
-                        # Conservatively, we assume it is a dependence
-                        is_output = True
-                    if is_output:
-                        found.append(Dependence(w2, w1))
-        return found
+        return DependenceGroup(i for k in self.writes for i in self._dependences(k)[2])
 
     @cached_property
     def d_all(self):
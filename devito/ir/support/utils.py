@@ -4,7 +4,7 @@ from devito.ir.support.basic import Access
 from devito.ir.support.space import Interval, Backward, Forward, Any
 from devito.ir.support.stencil import Stencil
 from devito.symbolics import retrieve_indexed, retrieve_terminals
-from devito.tools import as_tuple, flatten, filter_sorted
+from devito.tools import as_tuple, flatten, filter_ordered, filter_sorted
 from devito.types import Dimension, ModuloDimension
 
 __all__ = ['detect_accesses', 'detect_oobs', 'build_iterators', 'build_intervals',
@@ -128,12 +128,16 @@ def detect_flow_directions(exprs):
     reads = flatten(retrieve_indexed(i.rhs) for i in exprs)
     reads = [Access(i, 'R') for i in reads]
 
+    # Index the reads by Function. Identical accesses would only contribute
+    # the same directions, hence they are tested once
+    readmap = defaultdict(list)
+    for r in filter_ordered(reads):
+        readmap[r.name].append(r)
+
     # Determine indexed-wise direction by looking at the distance vector
     mapper = defaultdict(set)
-    for w in writes:
-        for r in reads:
-            if r.name != w.name:
-                continue
+    for w in filter_ordered(writes):
+        for r in readmap.get(w.name, []):
             dimensions = [d for d in w.aindices if d is not None]
             if not dimensions:
                 continue
@@ -891,18 +891,33 @@ class MPIMsg(CompositeObject):
     def npeers(self):
         return len(self._halos)
 
+    def _buffer_shape(self, function, halo):
+        """The shape of the send/recv buffers for the peer ``halo``."""
+        shape = []
+        for dim, side in zip(*halo):
+            try:
+                shape.append(getattr(function._size_owned[dim], side.name))
+            except AttributeError:
+                assert side is CENTER
+                shape.append(function._size_domain[dim])
+        return shape
+
+    def _arg_nbytes(self, alias=None):
+        """
+        The number of bytes of the send/recv buffers allocated by
+        ``_arg_defaults``, computed without allocating them.
+        """
+        function = alias or self.function
+        itemsize = sizeof(dtype_to_ctype(function.dtype))
+        return sum(2*reduce(mul, self._buffer_shape(function, i))*itemsize
+                   for i in self.halos)
+
     def _arg_defaults(self, alias=None):
         function = alias or self.function
         for i, halo in enumerate(self.halos):
             entry = self.value[i]
             # Buffer size for this peer
-            shape = []
-            for dim, side in zip(*halo):
-                try:
-                    shape.append(getattr(function._size_owned[dim], side.name))
-                except AttributeError:
-                    assert side is CENTER
-                    shape.append(function._size_domain[dim])
+            shape = self._buffer_shape(function, halo)
             entry.sizes = (c_int*len(shape))(*shape)
             # Allocate the send/recv buffers
             size = reduce(mul, shape)
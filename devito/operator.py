@@ -1,25 +1,34 @@
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
 from functools import reduce
+from hashlib import sha1
 from operator import mul
+from pathlib import Path
 
 from cached_property import cached_property
 import ctypes
+import numpy as np
+import sympy
 
-from devito.dle import transform
+from devito.dle import NThreads, transform
+from devito.data import FULL
 from devito.dse import rewrite
 from devito.equation import Eq
 from devito.exceptions import InvalidOperator
+from devito.finite_differences import evaluate_derivatives
 from devito.logger import info, perf, warning
 from devito.ir.equations import LoweredEq
-from devito.ir.clusters import clusterize
-from devito.ir.iet import (Callable, MetaCall, iet_build, iet_insert_decls,
-                           iet_insert_casts, derive_parameters)
+from devito.ir.clusters import autopad, clusterize, split_subdomains
+from devito.ir.iet import (Call, Callable, MetaCall, FindNodes, Specializer, iet_build,
+                           iet_insert_decls, iet_insert_casts, derive_parameters)
 from devito.ir.stree import st_build
+from devito.mpi.routines import MPIMsg
 from devito.parameters import configuration
 from devito.profiling import create_profile
-from devito.symbolics import indexify
+from devito.symbolics import indexify, unfreeze
 from devito.tools import (Signer, ReducerMap, as_tuple, flatten, filter_ordered,
-                          filter_sorted, split)
+                          filter_sorted, memoized_func, split)
 from devito.types import Dimension
 
 __all__ = ['Operator']
@@ -46,6 +55,9 @@ class Operator(Callable):
         * dle : str
             Aggressiveness of the Devito Loop Engine for loop-level
             optimization. Defaults to ``configuration['dle']``.
+        * autopadding : bool
+            Pad the innermost Dimension of the not-yet-allocated Functions to
+            avoid cache-set conflicts. Defaults to ``configuration['autopadding']``.
 
     Examples
     --------
@@ -137,6 +149,7 @@ class Operator(Callable):
         self.name = kwargs.get("name", "Kernel")
         subs = kwargs.get("subs", {})
         dse = kwargs.get("dse", configuration['dse'])
+        autopadding = kwargs.get("autopadding", configuration['autopadding'])
 
         # Header files, etc.
         self._headers = list(self._default_headers)
@@ -148,6 +161,9 @@ class Operator(Callable):
         self._lib = None
         self._cfunction = None
 
+        # The variants specialized for given runtime arguments (see ``apply``)
+        self._specializations = OrderedDict()
+
         # References to local or external routines
         self._func_table = OrderedDict()
 
@@ -155,6 +171,9 @@ class Operator(Callable):
         # autotuning reports, etc
         self._state = self._initialize_state(**kwargs)
 
+        # Evaluate the Derivatives, expanding each distinct one only once
+        expressions = evaluate_derivatives(expressions)
+
         # Form and gather any required implicit expressions
         expressions = self._add_implicit(expressions)
 
@@ -172,8 +191,18 @@ class Operator(Callable):
         # and apply the Devito Symbolic Engine (DSE) for flop optimization
         clusters = clusterize(expressions)
         clusters = rewrite(clusters, mode=set_dse_mode(dse))
+
+        # Specialize the Clusters reading Functions constant over SubDomains
+        clusters = split_subdomains(clusters)
+        self._dimensions = filter_sorted(self._dimensions +
+                                         [d for c in clusters for d in c.ispace.dimensions
+                                          if d.is_Sub])
+
         self._dtype, self._dspace = clusters.meta
 
+        # Data layout optimization
+        padded = autopad(clusters, configuration['platform']) if autopadding else []
+
         # Lower Clusters to a Schedule tree
         stree = st_build(clusters)
 
@@ -182,6 +211,16 @@ class Operator(Callable):
         iet, self._profiler = self._profile_sections(iet)
         iet = self._specialize_iet(iet, **kwargs)
 
+        # The data layout picked for the DiscreteFunctions, that is the padding and
+        # the shrunk time buffers (see the `shrinkbuffers` DLE option), is recorded,
+        # so that it can be given to the DiscreteFunctions passed at runtime too
+        self._autopadded = OrderedDict((f.name, (f.shape, f.dtype, f.padding))
+                                       for f in padded)
+        self._autoshrunk = OrderedDict((f.name, (f.shape, f.dtype))
+                                       for f in [i.function for i in self._input]
+                                       if f.is_TimeFunction and f._time_buffering_default
+                                       and f._time_size < f.time_order + 1)
+
         # Derive all Operator parameters based on the IET
         parameters = derive_parameters(iet, True)
 
@@ -190,6 +229,8 @@ class Operator(Callable):
 
         super(Operator, self).__init__(self.name, iet, 'int', parameters, ())
 
+        self._pin_time_buffers()
+
     # Read-only fields exposed to the outside world
 
     @cached_property
@@ -301,13 +342,49 @@ class Operator(Callable):
 
         return iet
 
+    def _pin_time_buffers(self):
+        """
+        Prevent the time buffers of the input TimeFunctions from changing size
+        (e.g., from being shrunk by another Operator) while the Operator is alive,
+        as the generated code relies on them.
+        """
+        for f in self._input:
+            if f.is_TimeFunction:
+                f.function._operators.add(self)
+
     # Arguments processing
 
+    def _relayout_arguments(self, **kwargs):
+        """
+        Give the data layout picked upon construction (see ``autopadding`` and the
+        ``shrinkbuffers`` DLE option) to the DiscreteFunctions passed as runtime
+        arguments, as long as they have the same shape and type, and their data
+        hasn't been allocated yet.
+        """
+        for k, (shape, dtype) in self._autoshrunk.items():
+            v = kwargs.get(k)
+            if not getattr(v, 'is_TimeFunction', False) or v._data is not None or \
+                    not v._time_size_mutable:
+                continue
+            position = v._time_position
+            size = shape[position]
+            if v._time_buffering_default and v._time_size == size + 1 and \
+                    v.dtype == dtype and v.shape[:position] == shape[:position] and \
+                    v.shape[position + 1:] == shape[position + 1:]:
+                v._set_time_size(size)
+        for k, (shape, dtype, padding) in self._autopadded.items():
+            v = kwargs.get(k)
+            if getattr(v, 'is_DiscreteFunction', False) and v._padding_auto and \
+                    v._data is None and v.shape == shape and v.dtype == dtype:
+                v._set_padding(padding)
+
     def _prepare_arguments(self, **kwargs):
         """
         Process runtime arguments passed to ``.apply()` and derive
         default values for any remaining arguments.
         """
+        self._relayout_arguments(**kwargs)
+
         overrides, defaults = split(self.input, lambda p: p.name in kwargs)
         # Process data-carrier overrides
         args = ReducerMap()
@@ -412,17 +489,27 @@ class Operator(Callable):
     @cached_property
     def _soname(self):
         """A unique name for the shared object resulting from JIT compilation."""
-        return Signer._digest(self, configuration)
+        # The signature of an Operator is computed from its structure rather
+        # than from its C code, hence the source code of Devito, which generates
+        # the C code, is part of it too (a version number wouldn't capture the
+        # edits made to a development tree)
+        return Signer._digest(self, configuration, self._compiler, source_digest())
+
+    @cached_property
+    def _code(self):
+        """The C code generated by the Operator, as a string."""
+        return str(self.ccode)
 
     def _compile(self):
         """
         JIT-compile the C code generated by the Operator.
 
         It is ensured that JIT compilation will only be performed once per
-        Operator, reagardless of how many times this method is invoked.
+        Operator, reagardless of how many times this method is invoked. The
+        C code is only generated if not in the JIT cache already.
         """
         if self._lib is None:
-            self._compiler.jit_compile(self._soname, str(self.ccode))
+            self._compiler.jit_compile(self._soname, lambda: self._code)
 
     @property
     def cfunction(self):
@@ -439,6 +526,96 @@ class Operator(Callable):
 
         return self._cfunction
 
+    # Apply-time specialization
+
+    _specializations_max = 4
+    """The maximum number of specialized variants kept by an Operator."""
+
+    def _specialization_mapper(self, args):
+        """
+        Map the runtime arguments frozen by apply-time specialization to their
+        values in ``args``. These are all of the scalar arguments but those of the
+        time Dimensions, so that the same variant may be used to run over different
+        time ranges, as well as the shapes of the DiscreteFunctions.
+        """
+        exclude = set(flatten(d._arg_names for d in self.dimensions if d.is_Time))
+        mapper = OrderedDict()
+        for p in self.parameters:
+            if p.is_Scalar and p.name not in exclude:
+                v = args[p.name]
+                if isinstance(v, (int, np.integer)):
+                    mapper[p] = sympy.Integer(int(v))
+                elif isinstance(v, (float, np.floating)):
+                    mapper[p] = sympy.Float(float(v))
+            elif p.is_DiscreteFunction:
+                dataobj = args[p.name]
+                for n, d in enumerate(p.dimensions):
+                    mapper[p._C_get_field(FULL, d).size] = \
+                        sympy.Integer(dataobj._obj.size[n])
+        return mapper
+
+    def _specialize(self, mapper):
+        """
+        Create a variant of the Operator in which the symbols in ``mapper`` are
+        replaced by the given values. The variant has the same parameters as
+        the Operator, hence it can be run with the same arguments.
+        """
+        processed = copy(self)
+        processed.__dict__.pop('_soname', None)
+        processed.__dict__.pop('_code', None)
+        processed._lib = None
+        processed._cfunction = None
+        processed._specializations = OrderedDict()
+        processed.body = Specializer(mapper).visit(self.body)
+
+        # Within the elemental functions, a parameter is replaced only if all of
+        # the calls pass it through unchanged, as the calls to the remainder
+        # loops of a blocked loop nest, for example, pass different block sizes
+        efuncs = [i.root for i in self._func_table.values() if i.local]
+        calls = FindNodes(Call).visit([self.body] + [i.body for i in efuncs])
+        processed._func_table = OrderedDict()
+        for k, v in self._func_table.items():
+            if not v.local:
+                processed._func_table[k] = v
+                continue
+            arguments = [i.arguments for i in calls if i.name == k]
+            emapper = {i: j for i, j in mapper.items() if not i.is_Symbol}
+            for n, i in enumerate(v.root.parameters):
+                if i in mapper and all(len(a) > n and a[n] is i for a in arguments):
+                    emapper[i] = mapper[i]
+            root = v.root._rebuild(body=Specializer(emapper).visit(v.root.body))
+            processed._func_table[k] = MetaCall(root, True)
+
+        return processed
+
+    def _specialized_cfunction(self, args):
+        """
+        The JIT-compiled C function of the variant of the Operator specialized
+        for ``args`` or, if not available yet, that of the Operator itself.
+        Upon the first request for given ``args``, the variant is generated and
+        JIT-compiled in the background.
+        """
+        mapper = self._specialization_mapper(args)
+        key = tuple((str(k), v) for k, v in mapper.items())
+
+        try:
+            future = self._specializations.pop(key)
+        except KeyError:
+            variant = self._specialize(mapper)
+            argtypes = [i._C_ctype for i in self.parameters]
+            future = jit_executor().submit(jit_compile_and_load, self._compiler,
+                                           variant._soname, lambda: variant._code,
+                                           self.name, argtypes)
+            while len(self._specializations) >= self._specializations_max:
+                self._specializations.popitem(last=False)
+        # Least recently used last
+        self._specializations[key] = future
+
+        if future.done() and future.result() is not None:
+            return future.result()[1]
+        else:
+            return self.cfunction
+
     # Execution and profiling
 
     def apply(self, **kwargs):
@@ -502,14 +679,32 @@ class Operator(Callable):
         >>> u3 = TimeFunction(name='u', grid=grid)
         >>> op = Operator(Eq(u3.forward, u3 + 1))
         >>> summary = op.apply(time_M=10)
+
+        With ``specialize=True`` (or ``configuration['specialize']``), a variant
+        of the Operator in which the runtime arguments, except for the time
+        Dimensions, are replaced by their values (e.g., ``x_M=2``, the grid
+        spacing, the shape of ``u3``) is JIT-compiled in the background. This
+        allows the C compiler to fold constants and to know the exact loop trip
+        counts. Once ready, the variant is used by all subsequent runs with the
+        same arguments.
+
+        >>> summary = op.apply(time_M=10, specialize=True)
         """
+        specialize = kwargs.pop('specialize', configuration['specialize'])
+
         # Build the arguments list to invoke the kernel function
         args = self.arguments(**kwargs)
 
+        # Pick the kernel function, possibly a variant specialized for `args`
+        if specialize:
+            cfunction = self._specialized_cfunction(args)
+        else:
+            cfunction = self.cfunction
+
         # Invoke kernel function with args
         arg_values = [args[p.name] for p in self.parameters]
         try:
-            self.cfunction(*arg_values)
+            cfunction(*arg_values)
         except ctypes.ArgumentError as e:
             if e.args[0].startswith("argument "):
                 argnum = int(e.args[0][9:].split(':')[0]) - 1
@@ -576,6 +771,154 @@ class Operator(Callable):
 
         return summary
 
+    def estimate_memory(self, **kwargs):
+        """
+        Estimate the amount of memory, in bytes, required to run the Operator.
+
+        The runtime arguments are processed as in ``apply``, but no memory is
+        allocated, nor is the Operator JIT-compiled. Thus, this can be used to
+        check, ahead of a run, that the Operator will fit in memory.
+
+        Parameters
+        ----------
+        **kwargs
+            The runtime arguments, as in ``apply(**kwargs)``.
+
+        Returns
+        -------
+        dict
+            The estimated number of bytes for:
+
+            * 'functions': the data of the DiscreteFunctions, including halo
+              and padding;
+            * 'heap': the temporaries allocated on the heap, such as those
+              introduced by the DSE;
+            * 'stack': the temporaries allocated on the stack, across all threads;
+            * 'mpi': the MPI message buffers;
+            * 'sparse': the buffers used to scatter/gather the sparse data
+              across MPI ranks;
+            * 'total': the sum of all of the above.
+
+        Examples
+        --------
+        >>> from devito import Eq, Grid, TimeFunction, Operator
+        >>> grid = Grid(shape=(4, 4))
+        >>> u = TimeFunction(name='u', grid=grid)
+        >>> op = Operator(Eq(u.forward, u + 1))
+        >>> op.estimate_memory()['functions']
+        288
+
+        The estimate follows the runtime arguments
+
+        >>> u2 = TimeFunction(name='u', grid=Grid(shape=(8, 8)), save=10)
+        >>> op.estimate_memory(u=u2)['functions']
+        4000
+        """
+        summary = OrderedDict([(i, 0) for i in
+                               ['functions', 'heap', 'stack', 'mpi', 'sparse']])
+
+        self._relayout_arguments(**kwargs)
+
+        # The runtime value of each DiscreteFunction. Overriding a SparseFunction
+        # implicitly overrides its SubFunctions too
+        mapper = {}
+        for p in self.input:
+            v = kwargs.get(p.name)
+            if p.is_SparseFunction and getattr(v, 'is_SparseFunction', False):
+                mapper.update({getattr(p, i).name: getattr(v, i)
+                               for i in p._sub_functions})
+        mapper.update(kwargs)
+
+        def nbytes(p):
+            v = mapper.get(p.name, p)
+            try:
+                return v.nbytes
+            except AttributeError:
+                return reduce(mul, v.shape_allocated, 1)*np.dtype(v.dtype).itemsize
+
+        # Derive the Dimension sizes from the DiscreteFunctions shapes, without
+        # ever touching their data (which would trigger allocation)
+        args = ReducerMap()
+        for p in self.input:
+            if p.is_DiscreteFunction:
+                v = mapper.get(p.name, p)
+                if isinstance(v, np.ndarray):
+                    sizes = [s + o - sum(p._size_nodomain[i])
+                             for i, s, o in zip(p.indices, v.shape, p.staggered)]
+                else:
+                    sizes = [s + o for s, o in zip(v.shape, v.staggered)]
+                for i, s in zip(p.indices, sizes):
+                    args.update(i._arg_defaults(_min=0, size=s))
+
+                summary['functions'] += nbytes(p)
+
+                if p.is_SparseFunction and p.grid.distributor.nprocs > 1:
+                    # Packed send and receive buffers, for both the sparse data
+                    # and the SubFunctions
+                    summary['sparse'] += 2*nbytes(p)
+                    summary['sparse'] += sum(2*nbytes(getattr(p, i))
+                                             for i in p._sub_functions)
+            elif p.is_Constant:
+                args.update(p._arg_values(**kwargs))
+        args = args.reduce_all()
+
+        grids = {getattr(p, 'grid', None) for p in self.input} - {None}
+        grid = grids.pop() if len(grids) == 1 else None
+        derived, main = split(self.dimensions, lambda i: i.is_Derived)
+        for d in main + derived:
+            args.update(d._arg_values(args, self._dspace[d], grid, **kwargs))
+
+        def evaluate(expr):
+            expr = unfreeze(expr)
+            try:
+                return int(expr.xreplace({i: args[i.name] for i in expr.free_symbols
+                                          if args.get(i.name) is not None}))
+            except TypeError:
+                # Unknown at this point; e.g., the sizes of the MPI buffers
+                # within `sendrecv`, which are accounted for separately
+                return 0
+
+        # Temporaries
+        roots = [self] + [i.root for i in self._func_table.values()]
+        arrays = [i for i in derive_parameters(roots) if i.is_Array]
+        for i in arrays:
+            size = evaluate(reduce(mul, i.symbolic_shape, 1))*np.dtype(i.dtype).itemsize
+            if i._mem_heap:
+                summary['heap'] += size
+            elif i._mem_stack:
+                summary['stack'] += size
+        nthreads = [args[i.name] for i in self.input if isinstance(i, NThreads)]
+        summary['stack'] *= nthreads[0] if nthreads else 1
+
+        # MPI message buffers. These are either preallocated, one pair of send/recv
+        # buffers for each peer, or allocated on-the-fly within each halo exchange
+        msgs = [i for i in self.objects if isinstance(i, MPIMsg)]
+        for i in msgs:
+            summary['mpi'] += i._arg_nbytes(alias=mapper.get(i.function.name))
+        exchanged = {i.name: i for i in self.input if i.is_DiscreteFunction}
+        exchanged = filter_ordered(exchanged[f.name]
+                                   for i in FindNodes(Call).visit(roots)
+                                   if i.name.startswith('haloupdate')
+                                   for f in i.functions if f.name in exchanged)
+        buffered = {i.function.name for i in msgs}
+        exchanged = [i for i in exchanged if i.name not in buffered]
+        transient = [0]
+        for p in exchanged:
+            v = mapper.get(p.name, p)
+            v = p if isinstance(v, np.ndarray) else v
+            itemsize = np.dtype(v.dtype).itemsize
+            for d in v.dimensions:
+                if d.is_Time:
+                    continue
+                shape = [max(v._size_owned[d]) if d is d1 else v._size_nopad[d1]
+                         for d1 in v.dimensions if not d1.is_Time]
+                transient.append(2*reduce(mul, shape, 1)*itemsize)
+        summary['mpi'] += max(transient)
+
+        summary['total'] = sum(summary.values())
+
+        return summary
+
     def __call__(self, **kwargs):
         self.apply(**kwargs)
 
@@ -584,6 +927,8 @@ class Operator(Callable):
     def __getstate__(self):
         if self._lib:
             state = dict(self.__dict__)
+            # The specialized variants are JIT-compiled again on demand
+            state['_specializations'] = OrderedDict()
             # The compiled shared-object will be pickled; upon unpickling, it
             # will be restored into a potentially different temporary directory,
             # so the entire process during which the shared-object is loaded and
@@ -601,13 +946,16 @@ class Operator(Callable):
                 state['binary'] = f.read()
             return state
         else:
-            return self.__dict__
+            state = dict(self.__dict__)
+            state['_specializations'] = OrderedDict()
+            return state
 
     def __setstate__(self, state):
         soname = state.pop('_soname', None)
         binary = state.pop('binary', None)
         for k, v in state.items():
             setattr(self, k, v)
+        self._pin_time_buffers()
         # If the `sonames` don't match, there *might* be a hidden bug as the
         # unpickled Operator might be generating code that differs from that
         # generated by the pickled Operator. For example, a stupid bug that we
@@ -631,6 +979,60 @@ class Operator(Callable):
 # Misc helpers
 
 
+_jit_executor = None
+
+
+def jit_executor():
+    """The thread pool in which the specialized Operators are JIT-compiled."""
+    global _jit_executor
+    if _jit_executor is None:
+        _jit_executor = ThreadPoolExecutor(max_workers=1)
+    return _jit_executor
+
+
+def jit_executor_shutdown():
+    """
+    Wait for the pending JIT compilations, and release the thread pool in which
+    they are performed. A new thread pool is created upon the next request.
+    """
+    global _jit_executor
+    if _jit_executor is not None:
+        _jit_executor.shutdown()
+        _jit_executor = None
+
+
+@memoized_func
+def source_digest():
+    """
+    A digest of the Devito source code, that is of all of the Python modules
+    in the installed package. Computed once per process.
+    """
+    root = Path(__file__).parent
+    digest = sha1()
+    for i in sorted(root.rglob('*.py')):
+        digest.update(str(i.relative_to(root)).encode())
+        digest.update(i.read_bytes())
+    return digest.hexdigest()
+
+
+def jit_compile_and_load(compiler, soname, code, name, argtypes):
+    """
+    JIT-compile ``code`` and load the resulting shared object. Return the
+    shared object and its function ``name``, or None if JIT compilation fails.
+    """
+    try:
+        compiler.jit_compile(soname, code)
+        lib = compiler.load(soname)
+    except Exception as e:
+        warning("Couldn't JIT-compile the specialized Operator `%s` (%s); using "
+                "the generic Operator instead" % (name, e))
+        return None
+    lib.name = soname
+    cfunction = getattr(lib, name)
+    cfunction.argtypes = argtypes
+    return lib, cfunction
+
+
 def set_dse_mode(mode):
     if not mode:
         return 'noop'
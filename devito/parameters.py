@@ -114,15 +114,21 @@ env_vars_mapper = {
     'DEVITO_BACKEND': 'backend',
     'DEVITO_DEVELOP': 'develop-mode',
     'DEVITO_DSE': 'dse',
+    'DEVITO_DSE_JOBS': 'dse-jobs',
     'DEVITO_DLE': 'dle',
     'DEVITO_OPENMP': 'openmp',
     'DEVITO_MPI': 'mpi',
     'DEVITO_AUTOTUNING': 'autotuning',
     'DEVITO_LOGGING': 'log-level',
     'DEVITO_FIRST_TOUCH': 'first-touch',
+    'DEVITO_AUTOPADDING': 'autopadding',
     'DEVITO_DEBUG_COMPILER': 'debug-compiler',
     'DEVITO_JIT_BACKDOOR': 'jit-backdoor',
-    'DEVITO_IGNORE_UNKNOWN_PARAMS': 'ignore-unknowns'
+    'DEVITO_IGNORE_UNKNOWN_PARAMS': 'ignore-unknowns',
+    'DEVITO_SPECIALIZE': 'specialize',
+    'DEVITO_CHECKPOINTING_MEMORY': 'checkpointing-memory',
+    'DEVITO_CACHE_HIGH_WATERMARK': 'cache-high-watermark',
+    'DEVITO_CACHE_LOW_WATERMARK': 'cache-low-watermark'
 }
 
 
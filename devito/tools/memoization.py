@@ -1,7 +1,12 @@
 from collections import Hashable
-from functools import partial
+from functools import partial, wraps
+from hashlib import sha1
+import os
+import pickle
 
-__all__ = ['memoized_func', 'memoized_meth']
+from devito.tools.os_helper import make_tempdir
+
+__all__ = ['memoized_func', 'memoized_meth', 'memoized_on_disk']
 
 
 class memoized_func(object):
@@ -89,3 +94,55 @@ class memoized_meth(object):
         except KeyError:
             res = cache[key] = self.func(*args, **kw)
         return res
+
+
+class memoized_on_disk(object):
+    """
+    Decorator. Cache a function's return value on disk, so that it is reused
+    across Python processes (e.g., subsequent runs, or the workers of a
+    cluster). The return value must be picklable. The cached value is
+    invalidated as soon as ``key(*args)`` changes; thus, ``key`` should
+    capture everything the return value depends on, besides the arguments
+    themselves (e.g., the hostname, or the path and modification time of an
+    executable).
+
+    The return value is also cached in memory, as in ``memoized_func``.
+
+    Parameters
+    ----------
+    key : callable
+        Compute a string-convertible key from the function arguments.
+    """
+
+    def __init__(self, key):
+        self.key = key
+
+    def __call__(self, func):
+        @memoized_func
+        @wraps(func)
+        def wrapper(*args):
+            key = sha1(str((args, self.key(*args))).encode()).hexdigest()
+            try:
+                filename = os.path.join(str(make_tempdir('detection')),
+                                        '%s-%s.pkl' % (func.__name__, key))
+            except OSError:
+                return func(*args)
+
+            try:
+                with open(filename, 'rb') as f:
+                    return pickle.load(f)
+            except Exception:
+                # Missing, stale (e.g., unpicklable), or corrupted entry
+                pass
+
+            value = func(*args)
+            try:
+                # Write atomically, as multiple processes may race for the same key
+                tmpfile = '%s.%d' % (filename, os.getpid())
+                with open(tmpfile, 'wb') as f:
+                    pickle.dump(value, f)
+                os.replace(tmpfile, filename)
+            except (OSError, pickle.PicklingError):
+                pass
+            return value
+        return wrapper
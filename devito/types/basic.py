@@ -3,7 +3,7 @@ import abc
 import gc
 from collections import namedtuple
 from operator import mul
-from functools import reduce
+from functools import partial, reduce
 from ctypes import POINTER, Structure, byref
 
 import numpy as np
@@ -13,6 +13,8 @@ from cached_property import cached_property
 from cgen import Struct, Value
 
 from devito.data import default_allocator
+from devito.logger import debug
+from devito.parameters import configuration
 from devito.symbolics import Add
 from devito.tools import (EnrichedTuple, Pickable, ctypes_to_cstr, dtype_to_cstr,
                           dtype_to_ctype)
@@ -175,7 +177,8 @@ class Cached(object):
         obj : object
             Object to be cached.
         """
-        _SymbolCache[cls] = weakref.ref(obj)
+        CacheManager._misses += 1
+        _SymbolCache[cls] = weakref.ref(obj, partial(CacheManager._evict, cls))
 
     @classmethod
     def _symbol_type(cls, name):
@@ -184,6 +187,7 @@ class Cached(object):
 
     def _cached_init(self):
         """Initialise symbolic object with a cached object state"""
+        CacheManager._hits += 1
         original = _SymbolCache[self.__class__]
         self.__dict__ = original().__dict__
 
@@ -1045,12 +1049,125 @@ class CacheManager(object):
     """
     Drop unreferenced objects from the SymPy and Devito caches. The associated
     data is lost (and thus memory is freed).
+
+    The CacheManager keeps track of the memory held by the cached objects (i.e.,
+    the bytes allocated for the Data of the cached Functions). As soon as this
+    exceeds ``configuration['cache-high-watermark']``, the caches are
+    automatically trimmed down to ``configuration['cache-low-watermark']``.
+
+    Notes
+    -----
+    Trimming is incremental: the younger garbage collector generations are
+    inspected first, and the older ones are only inspected if the low watermark
+    hasn't been reached yet. Thus, unlike ``clear``, a trim doesn't necessarily
+    require a full garbage collection.
     """
 
+    _hits = 0
+    _misses = 0
+    _evictions = 0
+
+    _nbytes = {}
+    """The bytes held by each cached object, by class."""
+
+    nbytes = 0
+    """The bytes held by all cached objects."""
+
+    _floor = 0
+    """The bytes held by the cached objects after the last (partial) trim."""
+
+    _trimming = False
+
     @classmethod
     def clear(cls):
         sympy.cache.clear_cache()
-        gc.collect()
+        # Collecting some objects (e.g., via finalizers) may leave others
+        # unreachable, hence collect until nothing else can be freed
+        while gc.collect():
+            pass
         for key, val in list(_SymbolCache.items()):
             if val() is None:
                 del _SymbolCache[key]
+        CacheManager._floor = 0
+        debug("Cleared symbol caches %s" % cls._report())
+
+    @classmethod
+    def trim(cls, nbytes=None):
+        """
+        Drop unreferenced objects from the SymPy and Devito caches, until at
+        most ``nbytes`` bytes are held by the cached objects.
+
+        Parameters
+        ----------
+        nbytes : int, optional
+            The target memory footprint. Defaults to
+            ``configuration['cache-low-watermark']``.
+        """
+        if CacheManager._trimming:
+            return
+        if nbytes is None:
+            nbytes = configuration['cache-low-watermark']
+
+        CacheManager._trimming = True
+        try:
+            start = CacheManager.nbytes
+            sympy.cache.clear_cache()
+            generation, oldest = -1, len(gc.get_count()) - 1
+            while CacheManager.nbytes > nbytes and generation < oldest:
+                generation += 1
+                gc.collect(generation)
+            if CacheManager.nbytes > nbytes:
+                CacheManager._floor = CacheManager.nbytes
+            else:
+                CacheManager._floor = 0
+        finally:
+            CacheManager._trimming = False
+
+        debug("Trimmed symbol caches (%d bytes freed, collected up to generation "
+              "%d) %s" % (start - CacheManager.nbytes, generation, cls._report()))
+
+    @classmethod
+    def track(cls, obj):
+        """
+        Account for the Data of a cached object, triggering a trim if the high
+        watermark is exceeded.
+
+        Parameters
+        ----------
+        obj : AbstractCachedFunction
+            A cached object whose Data has just been allocated.
+        """
+        key = type(obj)
+        if _SymbolCache.get(key) is None or obj._data is None:
+            return
+        CacheManager.nbytes += obj._data.nbytes - CacheManager._nbytes.get(key, 0)
+        CacheManager._nbytes[key] = obj._data.nbytes
+
+        high = configuration['cache-high-watermark']
+        low = min(configuration['cache-low-watermark'], high)
+        # If the last trim couldn't reach the low watermark (i.e., most of the
+        # cached data is still in use), avoid trimming again straight away
+        if high > 0 and CacheManager.nbytes > max(high, CacheManager._floor + high - low):
+            cls.trim(low)
+
+    @classmethod
+    def stats(cls):
+        """
+        Return the cache statistics, that is the number of hits, misses and
+        evictions, as well as the number of cached objects and the bytes they hold.
+        """
+        return {'hits': CacheManager._hits, 'misses': CacheManager._misses,
+                'evictions': CacheManager._evictions, 'entries': len(_SymbolCache),
+                'nbytes': CacheManager.nbytes}
+
+    @classmethod
+    def _report(cls):
+        return "[%s]" % ", ".join("%s=%d" % i for i in cls.stats().items())
+
+    @classmethod
+    def _evict(cls, key, ref):
+        # Invoked as soon as a cached object gets garbage collected
+        if _SymbolCache.get(key) is ref:
+            del _SymbolCache[key]
+        CacheManager.nbytes -= CacheManager._nbytes.pop(key, 0)
+        CacheManager._evictions += 1
@@ -2,6 +2,7 @@ from collections import namedtuple
 from ctypes import POINTER, Structure, c_void_p, c_int, cast, byref
 from functools import wraps, reduce
 from operator import mul
+from weakref import WeakSet
 
 import numpy as np
 import sympy
@@ -22,7 +23,7 @@ from devito.tools import (EnrichedTuple, ReducerMap, as_tuple, flatten, is_integ
                           ctypes_to_cstr, memoized_meth, dtype_to_ctype)
 from devito.types.dimension import Dimension
 from devito.types.args import ArgProvider
-from devito.types.basic import AbstractCachedFunction
+from devito.types.basic import AbstractCachedFunction, CacheManager
 from devito.types.utils import Buffer, NODE, CELL
 
 __all__ = ['Function', 'TimeFunction']
@@ -61,6 +62,10 @@ class DiscreteFunction(AbstractCachedFunction, ArgProvider):
             # Staggering metadata
             self._staggered = self.__staggered_setup__(**kwargs)
 
+            # Unless explicitly provided, the padding may be tuned at Operator
+            # construction time (see `configuration['autopadding']`)
+            self._padding_auto = kwargs.get('padding') is None
+
             # Symbolic (finite difference) coefficients
             self._coefficients = kwargs.get('coefficients', 'standard')
             if self._coefficients not in ('standard', 'symbolic'):
@@ -71,7 +76,14 @@ class DiscreteFunction(AbstractCachedFunction, ArgProvider):
             self._first_touch = kwargs.get('first_touch', configuration['first-touch'])
             self._allocator = kwargs.get('allocator', default_allocator())
             initializer = kwargs.get('initializer')
-            if initializer is None or callable(initializer):
+            if self._allocator.is_External:
+                # Adopt the external buffer straight away, so that its layout
+                # gets validated upon construction
+                self._initializer = initializer if callable(initializer) else None
+                self._data_allocated
+                if initializer is not None and not callable(initializer):
+                    self.data_with_halo[:] = initializer
+            elif initializer is None or callable(initializer):
                 # Initialization postponed until the first access to .data
                 self._initializer = initializer
             elif isinstance(initializer, (np.ndarray, list, tuple)):
@@ -110,10 +122,12 @@ class DiscreteFunction(AbstractCachedFunction, ArgProvider):
                 debug("Allocating memory for %s%s" % (self.name, self.shape_allocated))
                 self._data = Data(self.shape_allocated, self.dtype,
                                   modulo=self._mask_modulo, allocator=self._allocator)
-                if self._first_touch:
+                # Externally owned buffers already carry meaningful data
+                external = self._allocator.is_External
+                if self._first_touch and not external:
                     assign(self, 0)
                 if callable(self._initializer):
-                    if self._first_touch:
+                    if self._first_touch and not external:
                         warning("`first touch` together with `initializer` causing "
                                 "redundant data initialization")
                     try:
@@ -121,8 +135,9 @@ class DiscreteFunction(AbstractCachedFunction, ArgProvider):
                     except ValueError:
                         # Perhaps user only wants to initialise the physical domain
                         self._initializer(self.data)
-                else:
+                elif not external:
                     self.data_with_halo.fill(0)
+                CacheManager.track(self)
             return func(self)
         return wrapper
 
@@ -368,6 +383,21 @@ class DiscreteFunction(AbstractCachedFunction, ArgProvider):
         return tuple(v.reshape(*self._size_inhalo[d]) if v is not None else v
                      for d, v in zip(self.dimensions, self._decomposition))
 
+    def _set_padding(self, padding):
+        """
+        Change the padding region. This is only legal as long as no memory has
+        been allocated, as the data layout would otherwise change.
+        """
+        if self._data is not None:
+            raise ValueError("Cannot change the padding of `%s` as its data "
+                             "has already been allocated" % self.name)
+        self._padding = tuple(padding)
+        # Invalidate the cached properties depending on the padding
+        for i in ['shape_allocated', 'symbolic_shape', '_size_padding',
+                  '_size_nodomain', '_offset_domain', '_offset_halo',
+                  '_offset_owned', '_mask_domain', '_mask_inhalo', '_mask_outhalo']:
+            self.__dict__.pop(i, None)
+
     @property
     def data(self):
         """
@@ -875,7 +905,14 @@ class Function(DiscreteFunction, Differentiable):
     allocator : MemoryAllocator, optional
         Controller for memory allocation. To be used, for example, when one wants
         to take advantage of the memory hierarchy in a NUMA architecture. Refer to
-        `default_allocator.__doc__` for more information.
+        `default_allocator.__doc__` for more information. An ExternalAllocator
+        may be used to adopt an existing buffer as data, without any copy.
+    constant_on : dict, optional
+        Map SubDomains of ``grid`` to the constant value the Function takes in
+        them. The Operators then evaluate the equations reading the Function
+        through specialized loop nests, one for the SubDomain, in which the
+        constant is folded in, and the others for the rest of the Grid. This is
+        a promise made by the user, which is not checked against the data.
 
     Examples
     --------
@@ -890,29 +927,34 @@ class Function(DiscreteFunction, Differentiable):
     >>> g
     g(x, y)
 
-    First-order derivatives through centered finite-difference approximations
+    Derivatives are unevaluated until an Operator is built
 
     >>> f.dx
+    Derivative(f(x, y), x)
+
+    First-order derivatives through centered finite-difference approximations
+
+    >>> f.dx.evaluate
     -f(x, y)/h_x + f(x + h_x, y)/h_x
-    >>> f.dy
+    >>> f.dy.evaluate
     -f(x, y)/h_y + f(x, y + h_y)/h_y
-    >>> g.dx
+    >>> g.dx.evaluate
     -0.5*g(x - h_x, y)/h_x + 0.5*g(x + h_x, y)/h_x
-    >>> (f + g).dx
+    >>> (f + g).dx.evaluate
     -(f(x, y) + g(x, y))/h_x + (f(x + h_x, y) + g(x + h_x, y))/h_x
 
     First-order derivatives through left/right finite-difference approximations
 
-    >>> f.dxl
+    >>> f.dxl.evaluate
     f(x, y)/h_x - f(x - h_x, y)/h_x
-    >>> g.dxl
+    >>> g.dxl.evaluate
     1.5*g(x, y)/h_x + 0.5*g(x - 2*h_x, y)/h_x - 2.0*g(x - h_x, y)/h_x
-    >>> f.dxr
+    >>> f.dxr.evaluate
     -f(x, y)/h_x + f(x + h_x, y)/h_x
 
     Second-order derivative through centered finite-difference approximation
 
-    >>> g.dx2
+    >>> g.dx2.evaluate
     -2.0*g(x, y)/h_x**2 + g(x - h_x, y)/h_x**2 + g(x + h_x, y)/h_x**2
 
     Notes
@@ -936,6 +978,21 @@ class Function(DiscreteFunction, Differentiable):
             else:
                 raise TypeError("`space_order` must be int or 3-tuple of ints")
 
+            # The SubDomains in which the Function is known to be constant
+            self._constant_on = dict(kwargs.get('constant_on') or {})
+            if self._constant_on:
+                if self.grid is None:
+                    raise TypeError("`constant_on` requires a `grid`")
+                if any(i not in self.grid.subdomains.values() for i in self._constant_on):
+                    raise ValueError("`constant_on` requires SubDomains of `grid`")
+                for i in self._constant_on:
+                    # The Operator iterates over the complement of `i` too
+                    try:
+                        i.complement
+                    except NotImplementedError as e:
+                        raise ValueError("`constant_on` doesn't support SubDomain "
+                                         "`%s`: %s" % (i.name, e))
+
             # Dynamically add derivative short-cuts
             self._fd = generate_fd_shortcuts(self)
 
@@ -1016,6 +1073,11 @@ class Function(DiscreteFunction, Differentiable):
         """The space order."""
         return self._space_order
 
+    @property
+    def constant_on(self):
+        """The SubDomains in which the Function is constant, and its values."""
+        return self._constant_on
+
     def sum(self, p=None, dims=None):
         """
         Generate a symbolic expression computing the sum of ``p`` points
@@ -1119,7 +1181,8 @@ class TimeFunction(Function):
     allocator : MemoryAllocator, optional
         Controller for memory allocation. To be used, for example, when one wants
         to take advantage of the memory hierarchy in a NUMA architecture. Refer to
-        `default_allocator.__doc__` for more information.
+        `default_allocator.__doc__` for more information. An ExternalAllocator
+        may be used to adopt an existing buffer as data, without any copy.
 
     Examples
     --------
@@ -1137,11 +1200,11 @@ class TimeFunction(Function):
 
     First-order derivatives through centered finite-difference approximations
 
-    >>> f.dx
+    >>> f.dx.evaluate
     -f(t, x, y)/h_x + f(t, x + h_x, y)/h_x
-    >>> f.dt
+    >>> f.dt.evaluate
     -f(t, x, y)/dt + f(t + dt, x, y)/dt
-    >>> g.dt
+    >>> g.dt.evaluate
     -0.5*g(t - dt, x, y)/dt + 0.5*g(t + dt, x, y)/dt
 
     When using the alternating buffer protocol, the size of the time dimension
@@ -1191,6 +1254,10 @@ class TimeFunction(Function):
 
             self.save = kwargs.get('save')
 
+            # The live Operators built on top of the TimeFunction. Their generated
+            # code relies on the size of the time buffer, which thus can't change
+            self._operators = WeakSet()
+
     @classmethod
     def __indices_setup__(cls, **kwargs):
         dimensions = kwargs.get('dimensions')
@@ -1259,6 +1326,32 @@ class TimeFunction(Function):
     def _time_size(self):
         return self.shape_allocated[self._time_position]
 
+    def _set_time_size(self, size):
+        """
+        Change the number of slots of the modulo time buffer. This is only legal
+        as long as no memory has been allocated, as the data layout would
+        otherwise change, and as long as no live Operator uses the TimeFunction,
+        as its generated code would otherwise access the buffer out of bounds.
+        """
+        if self._data is not None:
+            raise ValueError("Cannot change the time buffer of `%s` as its data "
+                             "has already been allocated" % self.name)
+        if not self._time_size_mutable:
+            raise ValueError("Cannot change the time buffer of `%s` as it's used "
+                             "by other Operators" % self.name)
+        shape = list(self._shape)
+        shape[self._time_position] = size
+        self._shape = tuple(shape)
+        # Invalidate the cached properties, as most depend on the shape
+        for i in list(self.__dict__):
+            if isinstance(getattr(type(self), i, None), cached_property):
+                self.__dict__.pop(i)
+
+    @property
+    def _time_size_mutable(self):
+        """True if no live Operator relies on the size of the time buffer."""
+        return len(self._operators) == 0
+
     @property
     def _time_buffering(self):
         return not is_integer(self.save)
@@ -391,6 +391,55 @@ class SubDomain(object):
     def shape(self):
         return self._shape
 
+    @property
+    def complement(self):
+        """
+        The SubDomains partitioning the region of the Grid that the SubDomain
+        does not span.
+
+        Along the ``n``-th Dimension, the complement consists of up to two slabs
+        (e.g., a left and a right slab if the SubDomain spans the ``middle``),
+        which span the SubDomain along the first ``n-1`` Dimensions and the
+        entire Grid along the others. Thus, no two slabs overlap.
+        """
+        if self.dimensions is None:
+            raise ValueError("SubDomain `%s` isn't attached to any Grid" % self.name)
+
+        roots = tuple(d.root for d in self.dimensions)
+        sizes = [s + (sum(d._thickness_map.values()) if d.is_Sub else 0)
+                 for d, s in zip(self.dimensions, self.shape)]
+
+        complement = []
+        for n, d in enumerate(self.dimensions):
+            if not d.is_Sub:
+                continue
+            if d.parent is not d.root:
+                raise NotImplementedError("Cannot compute the complement of "
+                                          "nested SubDimensions")
+            (_, ltkn), (_, rtkn) = d.thickness
+            name = '%s_%s' % (d.root.name, self.name)
+            if d.symbolic_min == d.parent.symbolic_min:
+                # `d` spans the `ltkn` leftmost points
+                pieces = [(SubDimension.middle('%sr' % name, d.parent, ltkn, 0),
+                           sizes[n] - ltkn)]
+            elif d.symbolic_max == d.parent.symbolic_max:
+                # `d` spans the `rtkn` rightmost points
+                pieces = [(SubDimension.middle('%sl' % name, d.parent, 0, rtkn),
+                           sizes[n] - rtkn)]
+            else:
+                pieces = [(SubDimension.left('%sl' % name, d.parent, ltkn,
+                                             local=False), ltkn),
+                          (SubDimension.right('%sr' % name, d.parent, rtkn,
+                                              local=False), rtkn)]
+            for piece, size in pieces:
+                if size == 0:
+                    continue
+                dimensions = self.dimensions[:n] + (piece,) + roots[n+1:]
+                shape = tuple(self.shape[:n]) + (size,) + tuple(sizes[n+1:])
+                complement.append(ComplementSlab('%s_c%d' % (self.name, len(complement)),
+                                                 dimensions, shape))
+        return tuple(complement)
+
     def define(self, dimensions):
         """
         Parametrically describe the SubDomain w.r.t. a generic Grid.
@@ -427,6 +476,22 @@ class Interior(SubDomain):
         return {d: ('middle', 1, 1) for d in dimensions}
 
 
+class ComplementSlab(SubDomain):
+
+    """
+    A slab of the complement of a SubDomain (see ``SubDomain.complement``).
+    """
+
+    def __init__(self, name, dimensions, shape):
+        self.name = name
+        super(ComplementSlab, self).__init__()
+        self._dimensions = dimensions
+        self._shape = shape
+
+    def define(self, dimensions):
+        return {d.root: d for d in self._dimensions}
+
+
 class SubDomainSet(SubDomain):
     """
     Class to define a set of N (a positive integer) subdomains.
@@ -533,6 +598,10 @@ class SubDomainSet(SubDomain):
     def bounds(self):
         return self._bounds
 
+    @property
+    def complement(self):
+        raise NotImplementedError("The complement of a SubDomainSet isn't supported")
+
     def _create_implicit_exprs(self):
         if not len(self._bounds) == 2*len(self.dimensions):
             raise ValueError("Left and right bounds must be supplied for each dimension")
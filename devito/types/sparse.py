@@ -7,7 +7,8 @@ from cached_property import cached_property
 
 from devito.cgen_utils import INT, cast_mapper
 from devito.equation import Eq, Inc
-from devito.finite_differences import Differentiable, generate_fd_shortcuts
+from devito.finite_differences import (Differentiable, evaluate_derivatives,
+                                       generate_fd_shortcuts)
 from devito.logger import warning
 from devito.mpi import MPI, SparseDistributor
 from devito.symbolics import indexify, retrieve_function_carriers
@@ -477,6 +478,9 @@ class SparseFunction(AbstractSparseFunction):
                     # case ``self._data is None``
                     self.coordinates.data
 
+            # The last colouring plan, see `_colouring_plan`
+            self._colouring_cache = (None, None)
+
     def __distributor_setup__(self, **kwargs):
         """
         A `SparseDistributor` handles the SparseFunction decomposition based on
@@ -490,6 +494,92 @@ class SparseFunction(AbstractSparseFunction):
         """The SparseFunction coordinates."""
         return self._coordinates
 
+    @cached_property
+    def _colouring(self):
+        """
+        The SubFunctions carrying the colouring plan of the sparse points, that
+        is the sparse points permutation and the offset of each colour within it.
+        """
+        perm = PlanFunction(name='%s_perm' % self.name, parent=self, dtype=np.int32,
+                            dimensions=(Dimension(name='k_%s' % self.name),),
+                            shape=(self.npoint,), space_order=0)
+        offsets = PlanFunction(name='%s_colours' % self.name, parent=self,
+                               dtype=np.int32,
+                               dimensions=(Dimension(name='c_%s' % self.name),),
+                               shape=(1,), space_order=0)
+        return perm, offsets
+
+    def _colouring_plan(self, coords):
+        """
+        Sort the sparse points at ``coords`` into conflict-free colours, that is
+        groups of points whose injection supports do not overlap.
+
+        The grid is tiled into boxes of ``2*self._radius`` points per Dimension.
+        The points in distinct boxes with the same parity are far enough apart to
+        be injected concurrently (with a one-point margin against rounding), while
+        the points within the same box are spread over distinct colours. Within a
+        colour, the points are sorted by box, to improve data locality.
+
+        Returns
+        -------
+        perm : np.ndarray
+            The sparse points, sorted by colour.
+        offsets : np.ndarray
+            The offset of each colour within ``perm``, plus the total number of
+            points.
+
+        Notes
+        -----
+        The plan of the last ``coords`` is cached, so it is only recomputed when
+        the coordinates change.
+        """
+        coords = np.asarray(coords)
+        key = (coords.shape, hash(coords.tobytes()))
+        if self._colouring_cache[0] == key:
+            return self._colouring_cache[1]
+
+        # The reference grid point of each sparse point, as computed at runtime
+        origin = np.array([o.data for o in self.grid.origin], dtype=coords.dtype)
+        spacing = np.array([d.spacing.data for d in self.grid.dimensions],
+                           dtype=coords.dtype)
+        gridpoints = np.floor((coords - origin)/spacing).astype(np.int64)
+        gridpoints = gridpoints.reshape(-1, self.grid.dim)
+        npoint = gridpoints.shape[0]
+
+        boxes = gridpoints // (2*self._radius)
+        parity = (boxes % 2).dot(2**np.arange(self.grid.dim))
+
+        # Rank of each point within its box
+        order = np.lexsort(boxes.T[::-1])
+        sboxes = boxes[order]
+        first = np.ones(npoint, dtype=bool)
+        first[1:] = np.any(sboxes[1:] != sboxes[:-1], axis=1)
+        starts = np.maximum.accumulate(np.where(first, np.arange(npoint), 0))
+        rank = np.empty(npoint, dtype=np.int64)
+        rank[order] = np.arange(npoint) - starts
+
+        colour = rank*2**self.grid.dim + parity
+        perm = order[np.argsort(colour[order], kind='stable')]
+        _, counts = np.unique(colour, return_counts=True)
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+
+        plan = (perm.astype(np.int32), offsets.astype(np.int32))
+        self._colouring_cache = (key, plan)
+
+        return plan
+
+    def _arg_colouring(self, **kwargs):
+        """
+        The runtime arguments of the colouring plan, which is derived from the
+        (rank-local) coordinates passed to the Operator.
+        """
+        coords = self._arg_values(**kwargs)[self.coordinates.name]
+        values = {}
+        for f, v in zip(self._colouring, self._colouring_plan(coords)):
+            values[f.name] = v
+            values.update(f.indices[0]._arg_defaults(size=v.size))
+        return values
+
     @property
     def coordinates_data(self):
         return self.coordinates.data.view(np.ndarray)
@@ -644,6 +734,9 @@ class SparseFunction(AbstractSparseFunction):
         increment: bool, optional
             If True, generate increments (Inc) rather than assignments (Eq).
         """
+        # The derivatives must be expanded before moving to the interpolation points
+        expr = evaluate_derivatives(expr)
+
         variables = list(retrieve_function_carriers(expr))
 
         # List of indirection indices for all adjacent grid points
@@ -677,6 +770,7 @@ class SparseFunction(AbstractSparseFunction):
         offset : int, optional
             Additional offset from the boundary.
         """
+        expr = evaluate_derivatives(expr)
 
         variables = list(retrieve_function_carriers(expr)) + [field]
 
@@ -828,6 +922,20 @@ class SparseFunction(AbstractSparseFunction):
     _pickle_kwargs = AbstractSparseFunction._pickle_kwargs + ['coordinates_data']
 
 
+class PlanFunction(SubFunction):
+    """
+    A SubFunction carrying part of the colouring plan of a SparseFunction,
+    which is computed from the coordinates upon argument processing.
+    """
+
+    def _arg_values(self, **kwargs):
+        if self.name in kwargs:
+            raise RuntimeError("`%s` is a SubFunction, so it can't be assigned "
+                               "a value dynamically" % self.name)
+        else:
+            return self._parent._arg_colouring(**kwargs)
+
+
 class SparseTimeFunction(AbstractSparseTimeFunction, SparseFunction):
     """
     Tensor symbol representing a space- and time-varying sparse array in symbolic
@@ -1079,7 +1187,7 @@ class PrecomputedSparseFunction(AbstractSparseFunction):
         increment: bool, optional
             If True, generate increments (Inc) rather than assignments (Eq).
         """
-        expr = indexify(expr)
+        expr = indexify(evaluate_derivatives(expr))
 
         p, _, _ = self.interpolation_coeffs.indices
         dim_subs = []
@@ -1107,7 +1215,7 @@ class PrecomputedSparseFunction(AbstractSparseFunction):
         offset : int, optional
             Additional offset from the boundary.
         """
-        expr = indexify(expr)
+        expr = indexify(evaluate_derivatives(expr))
         field = indexify(field)
 
         p, _ = self.gridpoints.indices
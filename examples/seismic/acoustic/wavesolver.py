@@ -1,11 +1,13 @@
-from devito import Function, TimeFunction
+import numpy as np
+import psutil
+
+from devito import Checkpointer, Function, SegmentedOperator, TimeFunction
+from devito.checkpointing import RevolveSchedule
 from devito.tools import memoized_meth
 from examples.seismic import PointSource, Receiver
 from examples.seismic.acoustic.operators import (
     ForwardOperator, AdjointOperator, GradientOperator, BornOperator
 )
-from examples.checkpointing.checkpoint import DevitoCheckpoint, CheckpointOperator
-from pyrevolve import Revolver
 
 
 class AcousticWaveSolver(object):
@@ -152,6 +154,57 @@ class AcousticWaveSolver(object):
                                       dt=kwargs.pop('dt', self.dt), **kwargs)
         return srca, v, summary
 
+    def gradient_strategy(self, memory=None):
+        """
+        Choose how the forward wavefield should be made available to
+        ``gradient`` so that the computation fits within a memory budget.
+
+        The memory footprint of the Operators is estimated ahead of execution,
+        without allocating any data. If the entire forward wavefield fits in
+        memory, it is saved. Otherwise, checkpointing is used, with as many
+        in-memory checkpoints as the budget allows; should the budget be too
+        small for the default number of checkpoints, the extra checkpoints
+        are stored in a memory-mapped file on disk.
+
+        Parameters
+        ----------
+        memory : int, optional
+            The memory budget, in bytes. Defaults to the available system memory.
+
+        Returns
+        -------
+        dict
+            Either ``{'save': True}``, meaning that the wavefield computed by
+            ``forward(save=True)`` should be passed to ``gradient``, or the
+            checkpointing keyword arguments for ``gradient``, namely
+            ``{'checkpointing': True, 'n_checkpoints': ...,
+            'checkpointing_memory': ...}``.
+        """
+        if memory is None:
+            memory = psutil.virtual_memory().available
+
+        if self.op_grad().estimate_memory(dt=self.dt)['total'] <= memory:
+            return {'save': True}
+
+        # Footprint of the forward and reverse Operators, minus the checkpoints
+        required = max(self.op_fwd(save=False).estimate_memory(dt=self.dt)['total'],
+                       self.op_grad(save=False).estimate_memory(dt=self.dt)['total'])
+        if required > memory:
+            raise ValueError("Not enough memory to compute the gradient, even with "
+                             "checkpointing (%d bytes required, %d available)"
+                             % (required, memory))
+
+        u = TimeFunction(name='u', grid=self.model.grid,
+                         time_order=2, space_order=self.space_order)
+        nbytes = np.prod(u.shape_allocated)*np.dtype(u.dtype).itemsize
+
+        n_timesteps = self.geometry.nt - 2
+        n_checkpoints = max(RevolveSchedule(n_timesteps).n_checkpoints,
+                            min(n_timesteps, (memory - required) // nbytes))
+
+        return {'checkpointing': True, 'n_checkpoints': int(n_checkpoints),
+                'checkpointing_memory': int(memory - required)}
+
     def gradient(self, rec, u, v=None, grad=None, m=None, checkpointing=False, **kwargs):
         """
         Gradient modelling function for computing the adjoint of the
@@ -187,15 +240,15 @@ class AcousticWaveSolver(object):
         if checkpointing:
             u = TimeFunction(name='u', grid=self.model.grid,
                              time_order=2, space_order=self.space_order)
-            cp = DevitoCheckpoint([u])
-            n_checkpoints = None
-            wrap_fw = CheckpointOperator(self.op_fwd(save=False), src=self.geometry.src,
-                                         u=u, m=m, dt=dt)
-            wrap_rev = CheckpointOperator(self.op_grad(save=False), u=u, v=v,
-                                          m=m, rec=rec, dt=dt, grad=grad)
+            fwd = SegmentedOperator(self.op_fwd(save=False), src=self.geometry.src,
+                                    u=u, m=m, dt=dt)
+            rev = SegmentedOperator(self.op_grad(save=False), u=u, v=v,
+                                    m=m, rec=rec, dt=dt, grad=grad)
 
             # Run forward
-            wrp = Revolver(cp, wrap_fw, wrap_rev, n_checkpoints, rec.data.shape[0]-2)
+            wrp = Checkpointer([u], fwd, rev, rec.data.shape[0]-2,
+                               n_checkpoints=kwargs.pop('n_checkpoints', None),
+                               memory=kwargs.pop('checkpointing_memory', None))
             wrp.apply_forward()
             summary = wrp.apply_reverse()
         else:
@@ -364,38 +364,44 @@ def initialize_damp(damp, nbpml, spacing, mask=False):
         whether the dampening is a mask or layer.
         mask => 1 inside the domain and decreases in the layer
         not mask => 0 inside the domain and increase in the layer
-    """
-
-    phy_shape = damp.grid.subdomains['phydomain'].shape
-    data = np.ones(phy_shape) if mask else np.zeros(phy_shape)
-
-    pad_widths = [(nbpml, nbpml) for i in range(damp.ndim)]
-    data = np.pad(data, pad_widths, 'edge')
 
+    Notes
+    -----
+    The damping profile is evaluated per Dimension, over the global shape of
+    ``damp``, and then broadcast into the points owned by the calling rank one
+    slab at a time.
+    """
     dampcoeff = 1.5 * np.log(1.0 / 0.001) / (40.)
 
     assert all(damp._offset_domain[0] == i for i in damp._offset_domain)
 
-    for i in range(damp.ndim):
-        for j in range(nbpml):
-            # Dampening coefficient
-            pos = np.abs((nbpml - j + 1) / float(nbpml))
-            val = dampcoeff * (pos - np.sin(2*np.pi*pos)/(2*np.pi))
-            if mask:
-                val = -val
-            # : slices
-            all_ind = [slice(0, d) for d in data.shape]
-            # Left slice for dampening for dimension i
-            all_ind[i] = slice(j, j+1)
-            data[tuple(all_ind)] += val/spacing[i]
-            # right slice for dampening for dimension i
-            all_ind[i] = slice(data.shape[i]-j, data.shape[i]-j+1)
-            data[tuple(all_ind)] += val/spacing[i]
-
-    initialize_function(damp, data, 0)
-
-
-def initialize_function(function, data, nbpml, pad_mode='edge'):
+    # Dampening coefficients, from the outermost point inwards
+    pos = np.abs((nbpml - np.arange(nbpml) + 1) / float(nbpml))
+    val = dampcoeff * (pos - np.sin(2*np.pi*pos)/(2*np.pi))
+    if mask:
+        val = -val
+
+    # 1D profiles along each Dimension; note that, as the domain is at least
+    # `2*nbpml + 1` points wide, the left and right layers never overlap
+    profiles = []
+    for i, s in enumerate(damp.shape_global):
+        profile = np.zeros(s)
+        profile[:nbpml] += val/spacing[i]
+        profile[s-nbpml+1:] += val[1:][::-1]/spacing[i]
+        profiles.append(profile)
+
+    def fill(indices):
+        block = np.full([len(i) for i in indices], 1. if mask else 0.)
+        for i, (profile, idx) in enumerate(zip(profiles, indices)):
+            shape = [1]*damp.ndim
+            shape[i] = len(idx)
+            block += profile[idx].reshape(shape)
+        return block
+
+    _stream(damp, _padded_indices(damp, 0, damp.shape_global), fill)
+
+
+def initialize_function(function, data, nbpml, pad_mode='edge', transform=None):
     """
     Initialize a `Function` with the given ``data``. ``data``
     does *not* include the PML layers for the absorbing boundary conditions;
@@ -405,16 +411,76 @@ def initialize_function(function, data, nbpml, pad_mode='edge'):
     ----------
     function : Function
         The initialised object.
-    data : ndarray
-        The data array used for initialisation.
+    data : array_like or str
+        The data used for initialisation. This may be any object supporting
+        slicing, such as a `numpy.memmap`, or the path to a raw binary file,
+        which gets memory-mapped.
     nbpml : int
         Number of PML layers for boundary damping.
     pad_mode : str or callable, optional
         A string or a suitable padding function as explained in :func:`numpy.pad`.
+    transform : callable, optional
+        A pointwise function applied to ``data`` (e.g., to turn a velocity
+        into a square slowness) as it's read.
+
+    Notes
+    -----
+    With the default ``pad_mode='edge'``, ``data`` is streamed in slabs straight
+    into the domain+halo region owned by the calling rank, so only the relevant
+    subdomain is read and no padded copy of ``data`` is ever built.
     """
-    pad_widths = [(nbpml + i.left, nbpml + i.right) for i in function._size_halo]
-    data = np.pad(data, pad_widths, pad_mode)
-    function.data_with_halo[:] = data
+    shape = tuple(i - 2*nbpml for i in function.shape_global)
+    if isinstance(data, str):
+        data = np.memmap(data, dtype=function.dtype, mode='r', shape=shape)
+
+    if pad_mode != 'edge':
+        data = np.asarray(data)
+        if transform is not None:
+            data = transform(data)
+        pad_widths = [(nbpml + i.left, nbpml + i.right) for i in function._size_halo]
+        data = np.pad(data, pad_widths, pad_mode)
+        function.data_with_halo[:] = data
+        return
+
+    def fill(indices):
+        # Read the bounding box of the requested points, then replicate
+        # the edges via indexing
+        bbox = tuple(slice(i[0], i[-1] + 1) for i in indices)
+        block = np.asarray(data[bbox])
+        block = block[np.ix_(*[i - i[0] for i in indices])]
+        return block if transform is None else transform(block)
+
+    _stream(function, _padded_indices(function, nbpml, data.shape), fill)
+
+
+def _padded_indices(function, nbpml, shape):
+    """
+    For each Dimension of ``function``, the indices into an array of shape
+    ``shape``, padded by ``nbpml`` points on both sides, of the domain+inhalo
+    points owned by the calling rank. Indices falling in the padding are clamped
+    to the array edges.
+    """
+    indices = []
+    for i, h, s in zip(function.local_indices, function._size_inhalo, shape):
+        glb = np.arange(i.start - h.left, i.stop + h.right)
+        indices.append(np.clip(glb - nbpml, 0, s - 1))
+    return indices
+
+
+def _stream(function, indices, fill, nbytes=2**26):
+    """
+    Initialise the domain+inhalo region of ``function`` one slab at a time.
+    ``fill`` produces the values of a slab given its ``indices``; slabs are cut
+    along the outermost Dimension and are at most ``nbytes`` bytes.
+    """
+    target = function._data_with_inhalo
+    if target.size == 0:
+        return
+    nbytes_row = max(target[0].nbytes, 1)
+    step = max(nbytes // nbytes_row, 1)
+    for i in range(0, target.shape[0], step):
+        slab = slice(i, i + step)
+        target[slab] = fill([indices[0][slab]] + indices[1:])
 
 
 class PhysicalDomain(SubDomain):
@@ -450,6 +516,15 @@ class GenericModel(object):
         self.grid = Grid(extent=extent, shape=shape_pml, origin=origin_pml, dtype=dtype,
                          subdomains=subdomains)
 
+    def _load(self, value):
+        """
+        Memory-map ``value`` if it's the path to a raw binary file, so that it
+        can be streamed into a Function rather than loaded in full.
+        """
+        if isinstance(value, str):
+            return np.memmap(value, dtype=self.dtype, mode='r', shape=self.shape)
+        return value
+
     def physical_params(self, **kwargs):
         """
         Return all set physical parameters and update to input values if provided
@@ -514,8 +589,10 @@ class Model(GenericModel):
         Number of grid points size in (x,y,z) order.
     space_order : int
         Order of the spatial stencil discretisation.
-    vp : array_like or float
-        Velocity in km/s
+    vp : array_like or float or str
+        Velocity in km/s. Array-like parameters may also be given as
+        `numpy.memmap`s or as paths to raw binary files of type ``dtype``; these
+        are streamed into the model, one slab at a time.
     nbpml : int, optional
         The number of PML layers for boundary damping.
     dtype : np.float32 or np.float64
@@ -528,6 +605,11 @@ class Model(GenericModel):
         Tilt angle in radian.
     phi : array_like or float
         Asymuth angle in radian.
+    fold_damp : bool, optional
+        If True, declare that ``damp`` vanishes in the physical domain, so that
+        the Operators evaluate the damping terms only within the absorbing
+        layers. This trades larger code for fewer flops and memory accesses
+        in the physical domain. Defaults to False.
 
     The `Model` provides two symbolic data objects for the
     creation of seismic wave propagation operators:
@@ -539,9 +621,11 @@ class Model(GenericModel):
     """
     def __init__(self, origin, spacing, shape, space_order, vp, nbpml=20,
                  dtype=np.float32, epsilon=None, delta=None, theta=None, phi=None,
-                 subdomains=(), **kwargs):
+                 subdomains=(), fold_damp=False, **kwargs):
         super(Model, self).__init__(origin, spacing, shape, space_order, nbpml, dtype,
                                     subdomains)
+        vp, epsilon, delta, theta, phi = [self._load(i) for i in
+                                          (vp, epsilon, delta, theta, phi)]
 
         # Create square slowness of the wave as symbol `m`
         if isinstance(vp, np.ndarray):
@@ -553,7 +637,8 @@ class Model(GenericModel):
         self.vp = vp
 
         # Create dampening field as symbol `damp`
-        self.damp = Function(name="damp", grid=self.grid)
+        constant_on = {self.grid.subdomains['phydomain']: 0} if fold_damp else None
+        self.damp = Function(name="damp", grid=self.grid, constant_on=constant_on)
         initialize_damp(self.damp, self.nbpml, self.spacing)
 
         # Additional parameter fields for TTI operators
@@ -563,7 +648,8 @@ class Model(GenericModel):
             if isinstance(epsilon, np.ndarray):
                 self._physical_parameters += ('epsilon',)
                 self.epsilon = Function(name="epsilon", grid=self.grid)
-                initialize_function(self.epsilon, 1 + 2 * epsilon, self.nbpml)
+                initialize_function(self.epsilon, epsilon, self.nbpml,
+                                    transform=lambda v: 1 + 2 * v)
                 # Maximum velocity is scale*max(vp) if epsilon > 0
                 if mmax(self.epsilon) > 0:
                     self.scale = np.sqrt(mmax(self.epsilon))
@@ -577,7 +663,8 @@ class Model(GenericModel):
             if isinstance(delta, np.ndarray):
                 self._physical_parameters += ('delta',)
                 self.delta = Function(name="delta", grid=self.grid)
-                initialize_function(self.delta, np.sqrt(1 + 2 * delta), self.nbpml)
+                initialize_function(self.delta, delta, self.nbpml,
+                                    transform=lambda v: np.sqrt(1 + 2 * v))
             else:
                 self.delta = delta
         else:
@@ -647,7 +734,8 @@ class Model(GenericModel):
 
         # Update the square slowness according to new value
         if isinstance(vp, np.ndarray):
-            initialize_function(self.m, 1 / (self.vp * self.vp), self.nbpml)
+            initialize_function(self.m, self.vp, self.nbpml,
+                                transform=lambda v: 1 / (v * v))
         else:
             self.m.data = 1 / vp**2
 
@@ -666,14 +754,19 @@ class ModelElastic(GenericModel):
         Number of grid points size in (x,y,z) order.
     space_order : int
         Order of the spatial stencil discretisation.
-    vp : float or array
-        P-wave velocity in km/s.
-    vs : float or array
+    vp : float or array or str
+        P-wave velocity in km/s. Arrays may also be given as paths to raw
+        binary files of type ``dtype``.
+    vs : float or array or str
         S-wave velocity in km/s.
     nbpml : int, optional
         The number of PML layers for boundary damping.
-    rho : float or array, optional
+    rho : float or array or str, optional
         Density in kg/cm^3 (rho=1 for water).
+    fold_damp : bool, optional
+        If True, declare that ``damp`` is 1 in the physical domain, so that
+        the Operators evaluate the damping terms only within the absorbing
+        layers. Defaults to False.
 
     The `ModelElastic` provides a symbolic data objects for the
     creation of seismic wave propagation operators:
@@ -682,12 +775,14 @@ class ModelElastic(GenericModel):
         The damping field for absorbing boundary condition.
     """
     def __init__(self, origin, spacing, shape, space_order, vp, vs, rho, nbpml=20,
-                 dtype=np.float32):
+                 dtype=np.float32, fold_damp=False):
         super(ModelElastic, self).__init__(origin, spacing, shape, space_order,
                                            nbpml=nbpml, dtype=dtype)
+        vp, vs, rho = [self._load(i) for i in (vp, vs, rho)]
 
         # Create dampening field as symbol `damp`
-        self.damp = Function(name="damp", grid=self.grid)
+        constant_on = {self.grid.subdomains['phydomain']: 1} if fold_damp else None
+        self.damp = Function(name="damp", grid=self.grid, constant_on=constant_on)
         initialize_damp(self.damp, self.nbpml, self.spacing, mask=True)
 
         # Create square slowness of the wave as symbol `m`
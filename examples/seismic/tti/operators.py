@@ -2,7 +2,7 @@ from sympy import cos, sin
 
 from devito import Eq, Operator, TimeFunction
 from examples.seismic import PointSource, Receiver
-from devito.finite_differences import centered, first_derivative, transpose
+from devito.finite_differences import Derivative, centered, transpose
 
 
 def second_order_stencil(model, u, v, H0, Hz):
@@ -51,22 +51,16 @@ def Gzz_centered(field, costheta, sintheta, cosphi, sinphi, space_order):
     """
     order1 = space_order / 2
     x, y, z = field.space_dimensions
-    Gz = -(sintheta * cosphi * first_derivative(field, dim=x,
-                                                side=centered, fd_order=order1) +
-           sintheta * sinphi * first_derivative(field, dim=y,
-                                                side=centered, fd_order=order1) +
-           costheta * first_derivative(field, dim=z,
-                                       side=centered, fd_order=order1))
-
-    Gzz = (first_derivative(Gz * sintheta * cosphi,
-                            dim=x, side=centered, fd_order=order1,
-                            matvec=transpose) +
-           first_derivative(Gz * sintheta * sinphi,
-                            dim=y, side=centered, fd_order=order1,
-                            matvec=transpose) +
-           first_derivative(Gz * costheta,
-                            dim=z, side=centered, fd_order=order1,
-                            matvec=transpose))
+    Gz = -(sintheta * cosphi * Derivative(field, x, fd_order=order1, side=centered) +
+           sintheta * sinphi * Derivative(field, y, fd_order=order1, side=centered) +
+           costheta * Derivative(field, z, fd_order=order1, side=centered))
+
+    Gzz = (Derivative(Gz * sintheta * cosphi, x, fd_order=order1, side=centered,
+                      matvec=transpose) +
+           Derivative(Gz * sintheta * sinphi, y, fd_order=order1, side=centered,
+                      matvec=transpose) +
+           Derivative(Gz * costheta, z, fd_order=order1, side=centered,
+                      matvec=transpose))
     return Gzz
 
 
@@ -91,14 +85,12 @@ def Gzz_centered_2d(field, costheta, sintheta, space_order):
     """
     order1 = space_order / 2
     x, y = field.space_dimensions[:2]
-    Gz = -(sintheta * first_derivative(field, dim=x, side=centered, fd_order=order1) +
-           costheta * first_derivative(field, dim=y, side=centered, fd_order=order1))
-    Gzz = (first_derivative(Gz * sintheta, dim=x,
-                            side=centered, fd_order=order1,
-                            matvec=transpose) +
-           first_derivative(Gz * costheta, dim=y,
-                            side=centered, fd_order=order1,
-                            matvec=transpose))
+    Gz = -(sintheta * Derivative(field, x, fd_order=order1, side=centered) +
+           costheta * Derivative(field, y, fd_order=order1, side=centered))
+    Gzz = (Derivative(Gz * sintheta, x, fd_order=order1, side=centered,
+                      matvec=transpose) +
+           Derivative(Gz * costheta, y, fd_order=order1, side=centered,
+                      matvec=transpose))
     return Gzz
 
 
@@ -176,6 +176,58 @@ def test_mixed_blocking_nthreads():
     assert 'nthreads' in op._state['autotuning'][0]['tuned']
 
 
+@pytest.mark.parametrize("level,nruns", [('basic', 12), ('aggressive', 8)])
+def test_streaming(level, nruns):
+    """
+    Test that the nontemporal stores and the software prefetch distance are
+    tuned along with the block shapes.
+    """
+    # The x86 nontemporal store intrinsics are only available with a known ISA
+    platform = configuration['platform']
+    configuration['platform'] = 'intel64'
+
+    try:
+        grid = Grid(shape=(64, 64, 64))
+        f = TimeFunction(name='f', grid=grid)
+        g = Function(name='g', grid=grid)
+
+        op = Operator(Eq(f.forward, f + g), dle=('advanced', {'openmp': False,
+                                                              'ntstores': True,
+                                                              'prefetch': True}))
+        op.apply(time=0, autotune=level)
+    finally:
+        configuration['platform'] = str(platform)
+
+    tuned = op._state['autotuning'][0]['tuned']
+    assert op._state['autotuning'][0]['runs'] % nruns == 0
+    assert 'ntstores' in tuned
+    assert 'pfdistance' in tuned
+    if level == 'basic':
+        # Both nontemporal and regular stores, for each of the six block shapes
+        assert op._state['autotuning'][0]['runs'] == nruns
+        assert tuned['pfdistance'] == 2
+
+
+@pytest.mark.parametrize("level,nruns", [('basic', 12), ('aggressive', 18)])
+def test_unroll_factor(level, nruns):
+    """
+    Test that the unroll factor is tuned along with the block shapes, and that
+    the original Iterations are always tried.
+    """
+    grid = Grid(shape=(64, 64, 64))
+    f = TimeFunction(name='f', grid=grid, space_order=4)
+
+    op = Operator(Eq(f.forward, f.laplace), dle=('advanced', {'openmp': False,
+                                                              'unroll': 1}))
+    op.apply(time=0, autotune=level)
+
+    assert op._state['autotuning'][0]['runs'] % nruns == 0
+    assert 'ufactor' in op._state['autotuning'][0]['tuned']
+    if level == 'basic':
+        # An unroll factor of 2 and 1, for each of the six block shapes
+        assert op._state['autotuning'][0]['runs'] == nruns
+
+
 def test_tti_aggressive():
     from test_dse import tti_operator
     wave_solver = tti_operator(dse='aggressive', dle=('advanced', {'openmp': False}))
@@ -310,3 +362,22 @@ def test_multiple_threads():
     assert op._state['autotuning'][0]['runs'] == 60  # Would be 30 with `aggressive`
     assert op._state['autotuning'][0]['tpr'] == options['squeezer'] + 1
     assert len(op._state['autotuning'][0]['tuned']) == 3
+
+
+def test_time_blocking():
+    """
+    Test that, with time blocking, the autotuner attempts the time-tile depths
+    along with the space block shapes, over enough timesteps to fit the deepest
+    time tile.
+    """
+    grid = Grid(shape=(32, 32, 32))
+
+    u = TimeFunction(name='u', grid=grid, space_order=2)
+
+    op = Operator(Eq(u.forward, u.dx2 + u + 1),
+                  dle=('advanced', {'openmp': False, 'blocktime': True}))
+    op.apply(time_M=20, autotune='basic')
+    assert op._state['autotuning'][0]['runs'] == 12  # 3 depths x 4 block shapes
+    assert op._state['autotuning'][0]['tpr'] == max(options['blockdepth']) + 1
+    assert len(op._state['autotuning'][0]['tuned']) == 3
+    assert 'time0_tblk_size' in op._state['autotuning'][0]['tuned']
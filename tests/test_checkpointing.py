@@ -5,7 +5,10 @@ from pyrevolve import Revolver
 import numpy as np
 
 from conftest import skipif
-from devito import Grid, TimeFunction, Operator, Function, Eq, switchconfig
+from devito import (Grid, TimeFunction, Operator, Function, Eq, switchconfig,
+                    Checkpointer, SegmentedOperator)
+from devito.checkpointing import (ADVANCE, TAKESHOT, RESTORE, REVERSE,
+                                  RevolveSchedule, UniformSchedule)
 from examples.checkpointing.checkpoint import DevitoCheckpoint, CheckpointOperator
 from examples.seismic.acoustic.acoustic_example import acoustic_setup
 from examples.seismic import Receiver
@@ -248,3 +251,86 @@ def test_index_alignment(const):
     wrp.apply_reverse()
     assert(np.allclose(v.data[0, :, :], 0))
     assert(np.allclose(prod.data, final_value))
+
+
+def simulate(schedule):
+    """
+    Run ``schedule`` over a mock state, namely the index of the current
+    timestep, and return the ordered reverse steps.
+    """
+    state = 0
+    slots = {}
+    reversed_steps = []
+    for action, start, end, slot in schedule:
+        if action == ADVANCE:
+            assert state == start
+            state = end
+        elif action == TAKESHOT:
+            assert state == start
+            assert 0 <= slot < schedule.n_checkpoints
+            slots[slot] = state
+        elif action == RESTORE:
+            assert slots[slot] == start
+            state = start
+        elif action == REVERSE:
+            # The reverse step `t` needs the state produced by the forward step `t`
+            assert state == start + 1
+            reversed_steps.append(start)
+    return reversed_steps
+
+
+@pytest.mark.parametrize('n_timesteps', [1, 2, 7, 20, 53])
+@pytest.mark.parametrize('n_checkpoints', [1, 2, 3, 5, None])
+def test_revolve_schedule(n_timesteps, n_checkpoints):
+    schedule = RevolveSchedule(n_timesteps, n_checkpoints)
+    assert simulate(schedule) == list(reversed(range(n_timesteps)))
+
+    # No timestep is recomputed more often than predicted by the binomial bound
+    nsteps = sum(i.end - i.start for i in schedule if i.action == ADVANCE)
+    assert nsteps <= n_timesteps*(schedule.n_recomputations + 1)
+
+
+@pytest.mark.parametrize('n_timesteps', [1, 2, 7, 20, 53])
+@pytest.mark.parametrize('interval', [1, 3, 4, None])
+def test_uniform_schedule(n_timesteps, interval):
+    schedule = UniformSchedule(n_timesteps, interval)
+    assert simulate(schedule) == list(reversed(range(n_timesteps)))
+
+    # Each timestep is recomputed at most once
+    nsteps = sum(i.end - i.start for i in schedule if i.action == ADVANCE)
+    assert nsteps <= 2*n_timesteps
+
+
+@switchconfig(log_level='WARNING')
+@pytest.mark.parametrize('schedule,n_checkpoints,memory', [
+    ('revolve', 3, None),
+    ('revolve', 3, 1),  # A single slot in memory, the others on disk
+    ('uniform', 7, None),
+    ('uniform', 7, 1)
+])
+def test_checkpointer(schedule, n_checkpoints, memory):
+    """
+    Test the adjoint computation through checkpointing against the
+    analytical solution.
+    """
+    grid = Grid(shape=(4, 4))
+    u = TimeFunction(name='u', grid=grid)
+    v = TimeFunction(name='v', grid=grid)
+    g = Function(name='g', grid=grid)
+
+    fwd = Operator(Eq(u.forward, u + 1))
+    rev = Operator([Eq(v.backward, v + 1), Eq(g, g + u*v)])
+
+    nt = 10
+    if memory is not None:
+        memory = u._data_allocated.nbytes
+    cp = Checkpointer([u], SegmentedOperator(fwd, time_M=nt),
+                      SegmentedOperator(rev, time_M=nt), nt,
+                      n_checkpoints=n_checkpoints, schedule=schedule, memory=memory)
+    if memory is not None:
+        assert cp.storage.nbytes_disk > 0
+    cp.apply_forward()
+    cp.apply_reverse()
+
+    # At the reverse step `t`, `u = t` and `v = nt - t`
+    assert np.all(g.data == sum(t*(nt - t) for t in range(nt)))
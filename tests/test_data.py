@@ -1,9 +1,12 @@
+import ctypes
+import mmap
+
 import pytest
 import numpy as np
 
 from conftest import skipif
 from devito import (Grid, Function, TimeFunction, SparseTimeFunction, Dimension, # noqa
-                    Eq, Operator, ALLOC_GUARD, ALLOC_FLAT)
+                    Eq, Operator, ALLOC_GUARD, ALLOC_FLAT, ExternalAllocator)
 from devito.data import LEFT, RIGHT, Decomposition
 
 pytestmark = skipif('ops')
@@ -678,6 +681,70 @@ def test_scalar_arg_substitution(t0, t1):
     assert t0.subs('t0', t1) == t1
 
 
+class TestExternalAllocator(object):
+
+    @pytest.mark.parametrize('kind', ['ndarray', 'mmap', 'memoryview',
+                                      'pointer', 'capsule'])
+    def test_zero_copy(self, kind):
+        """
+        Test that an external buffer is adopted as Function data, without copy.
+        """
+        grid = Grid(shape=(8, 8))
+        shape = Function(name='f', grid=grid, space_order=2).shape_allocated
+
+        owner, _ = ALLOC_FLAT.alloc(shape, np.float32)
+        owner.fill(1.)
+        if kind == 'ndarray':
+            allocator = ExternalAllocator(owner)
+        elif kind == 'mmap':
+            owner = mmap.mmap(-1, int(np.prod(shape))*4)
+            np.frombuffer(owner, dtype=np.float32)[:] = 1.
+            allocator = ExternalAllocator(owner)
+        elif kind == 'memoryview':
+            allocator = ExternalAllocator(memoryview(owner))
+        elif kind == 'pointer':
+            allocator = ExternalAllocator(owner.ctypes.data, nbytes=owner.nbytes,
+                                          owner=owner)
+        else:
+            capsule_new = ctypes.PYFUNCTYPE(ctypes.py_object, ctypes.c_void_p,
+                                            ctypes.c_char_p, ctypes.c_void_p)(
+                ('PyCapsule_New', ctypes.pythonapi))
+            allocator = ExternalAllocator(capsule_new(owner.ctypes.data, None, None),
+                                          nbytes=owner.nbytes)
+            # The functions shared via `ctypes.pythonapi` are left untouched
+            assert ctypes.pythonapi.PyCapsule_GetPointer.argtypes is None
+
+        f = Function(name='f', grid=grid, space_order=2, allocator=allocator)
+        assert np.all(f.data_with_halo == 1.)
+
+        Operator(Eq(f, f + 1)).apply()
+
+        owner = np.frombuffer(owner, dtype=np.float32).reshape(shape)
+        assert np.shares_memory(f._data_allocated, owner)
+        assert np.all(owner[2:-2, 2:-2] == 2.)
+        assert np.all(owner[:2] == 1.)
+
+    def test_illegal_buffers(self):
+        grid = Grid(shape=(8, 8))
+        shape = Function(name='f', grid=grid, space_order=2).shape_allocated
+        buffer, _ = ALLOC_FLAT.alloc((np.prod(shape) + 1,), np.float32)
+
+        # Non-contiguous
+        with pytest.raises(ValueError):
+            ExternalAllocator(buffer[::2])
+
+        illegal = [
+            buffer[:64].reshape(8, 8),  # No halo
+            buffer[:-1].reshape(shape).astype(np.float64),  # Wrong dtype
+            buffer[:-2],  # Wrong size
+            buffer[1:]  # Misaligned
+        ]
+        for i in illegal:
+            with pytest.raises(ValueError):
+                Function(name='f', grid=grid, space_order=2,
+                         allocator=ExternalAllocator(i))
+
+
 @pytest.mark.skip(reason="will corrupt memory and risk crash")
 def test_oob_noguard():
     """
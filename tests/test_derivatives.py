@@ -5,7 +5,9 @@ from sympy import Derivative, simplify, diff
 from conftest import skipif
 from devito import (Grid, Function, TimeFunction, Eq, Operator, clear_cache, NODE,
                     ConditionalDimension, left, right, centered, generic_derivative)
-from devito.finite_differences import Differentiable
+from devito.finite_differences import (Differentiable, evaluate_derivatives, fd_weights,
+                                       Derivative as FDDerivative)
+from devito.finite_differences.finite_difference import FDWeightsCache
 
 _PRECISION = 9
 
@@ -70,7 +72,7 @@ class TestFD(object):
     def test_preformed_derivatives(self, SymbolType, derivative, dim):
         """Test the stencil expressions provided by devito objects"""
         u = SymbolType(name='u', grid=self.grid, time_order=2, space_order=2)
-        expr = getattr(u, derivative)
+        expr = getattr(u, derivative).evaluate
         assert(len(expr.args) == dim)
 
     @pytest.mark.parametrize('derivative, dim', [
@@ -81,7 +83,7 @@ class TestFD(object):
         """Test first derivative expressions against native sympy"""
         dim = dim(self.grid)
         u = TimeFunction(name='u', grid=self.grid, time_order=2, space_order=order)
-        expr = getattr(u, derivative)
+        expr = getattr(u, derivative).evaluate
         # Establish native sympy derivative expression
         width = int(order / 2)
         if order == 1:
@@ -103,7 +105,7 @@ class TestFD(object):
         """
         dim = dim(self.grid)
         u = TimeFunction(name='u', grid=self.grid, time_order=2, space_order=order)
-        expr = getattr(u, derivative)
+        expr = getattr(u, derivative).evaluate
         # Establish native sympy derivative expression
         width = int(order / 2)
         indices = [(dim + i * dim.spacing) for i in range(-width, width + 1)]
@@ -252,7 +254,7 @@ class TestFD(object):
         expr = eval(expr)
 
         assert isinstance(expr, Differentiable)
-        assert expected == str(expr)
+        assert expected == str(expr.evaluate)
 
     @pytest.mark.parametrize('so', [2, 5, 8])
     def test_all_shortcuts(self, so):
@@ -268,3 +270,47 @@ class TestFD(object):
 
         for fd in g._fd:
             assert getattr(g, fd)
+
+    def test_fd_weights_cache(self, tmpdir):
+        """
+        Test that identical stencils share the same weights, also across
+        processes through the on-disk cache.
+        """
+        fd_weights.cache_clear()
+
+        grid = Grid(shape=(10, 10))
+        f = Function(name='f', grid=grid, space_order=4)
+        g = TimeFunction(name='g', grid=grid, space_order=4)
+
+        f.dx2.evaluate, g.dx2.evaluate, g.dy2.evaluate  # noqa
+        info = fd_weights.cache_info()
+        assert info.misses == 1 and info.hits == 2
+
+        weights = fd_weights(2, (-2, -1, 0, 1, 2))
+        assert np.allclose([float(i) for i in weights], [-1/12, 4/3, -5/2, 4/3, -1/12])
+
+        path = str(tmpdir.join('weights.pkl'))
+        FDWeightsCache(path).put('key', weights)
+        assert FDWeightsCache(path).get('key') == weights
+
+    def test_lazy_derivatives(self):
+        """
+        Test that derivatives are only expanded upon evaluation, and that
+        repeated derivatives are only evaluated once.
+        """
+        grid = Grid(shape=(10, 10))
+        x, y = grid.dimensions
+        u = TimeFunction(name='u', grid=grid, space_order=4)
+
+        expr = u.dx2 + u.dy2
+        assert all(isinstance(i, FDDerivative) for i in expr.args)
+        assert expr.evaluate == u.dx2.evaluate + u.dy2.evaluate
+
+        f = Function(name='f', grid=grid)
+        eqns = evaluate_derivatives([Eq(u.forward, f*u.dx2), Eq(f, u*u.dx2)])
+        stencils = [i for e in eqns for i in e.rhs.args if i.is_Add]
+        assert len(stencils) == 2 and stencils[0] is stencils[1]
+
+        # Substituting a differentiation Dimension triggers the evaluation
+        assert u.dx2.subs(x, x + 1) == u.dx2.evaluate.subs(x, x + 1)
+        assert isinstance(u.dx2.subs(y, y + 1), FDDerivative)
@@ -1,18 +1,21 @@
 from functools import reduce
 from operator import mul
+import gc
 
 import numpy as np
 import pytest
 
 from conftest import EVAL, skipif
 from devito import (Grid, Function, TimeFunction, SparseTimeFunction, SubDimension,
-                    Eq, Operator, solve)
+                    Dimension, Eq, Inc, Operator, configuration, solve)
 from devito.dle import BlockDimension, NThreads, transform
 from devito.dle.parallelizer import nhyperthreads
+from devito.exceptions import InvalidArgument
 from devito.ir.equations import DummyEq
 from devito.ir.iet import (Call, Expression, Iteration, Conditional, FindNodes,
-                           iet_analyze, retrieve_iteration_tree)
+                           FindSymbols, iet_analyze, retrieve_iteration_tree)
 from devito.tools import as_tuple
+from devito.types import ModuloDimension
 from unittest.mock import patch
 
 pytestmark = skipif(['yask', 'ops'])
@@ -241,6 +244,295 @@ def test_cache_blocking_edge_cases_highorder(shape, blockshape):
     assert np.allclose(wo_blocking, w_blocking, rtol=1e-12)
 
 
+@pytest.mark.parametrize("shape,blockshape,blockshape1", [
+    ((25, 25, 46), (8, 8, 8), (4, 4, 4)),
+    ((25, 25, 46), (10, 7, 46), (3, 4, 8)),
+    ((25, 25, 46), (5, 25, 7), (8, 8, 8)),
+    ((25, 46), (25, 7), (7, 2))
+])
+def test_cache_blocking_multilevel(shape, blockshape, blockshape1):
+    time_order = 2
+    wo_blocking, _ = _new_operator2(shape, time_order, dle='noop')
+
+    grid = Grid(shape=shape, dtype=np.int32)
+    infield = TimeFunction(name='infield', grid=grid, time_order=time_order)
+    infield.data[:] = np.arange(reduce(mul, shape), dtype=np.int32).reshape(shape)
+    outfield = TimeFunction(name='outfield', grid=grid, time_order=time_order)
+    op = Operator(Eq(outfield.forward, outfield + infield*3.0),
+                  dle=('blocking', {'blockinner': True, 'blocklevels': 2}))
+
+    # Two levels of blocks, the innermost clamped to the enclosing ones
+    blockdims = [i.dim for i in FindNodes(Iteration).visit(op._func_table['bf0'].root)
+                 if isinstance(i.dim, BlockDimension)]
+    assert len(blockdims) == 2*grid.dim
+    assert all(i.level == 1 and i.parent in blockdims for i in blockdims[grid.dim:])
+
+    blocksizes = get_blocksizes(op, ('blocking', {'blockinner': True}), grid, blockshape)
+    blocksizes.update({'%s0_blk1_size' % d: v
+                       for d, v in zip(grid.dimensions, blockshape1)})
+    op(infield=infield, outfield=outfield, t=10, **blocksizes)
+
+    assert np.equal(wo_blocking.data, outfield.data).all()
+
+
+@pytest.mark.parametrize("blocklevels", [1, 2])
+def test_cache_blocking_default_shape(blocklevels):
+    grid = Grid(shape=(256, 256, 256))
+    u = TimeFunction(name='u', grid=grid, space_order=4)
+    op = Operator(Eq(u.forward, u.laplace + u),
+                  dle=('advanced', {'blockinner': True, 'blocklevels': blocklevels,
+                                    'openmp': False}))
+
+    args = op.arguments(time_M=0)
+    blockdims = [i.dim for i in FindNodes(Iteration).visit(op._func_table['bf0'].root)
+                 if isinstance(i.dim, BlockDimension)]
+    heuristic = blockdims[0].heuristic
+    assert heuristic is not None
+
+    # The blocks, as opposed to the whole grid, fit in the target caches, and
+    # the innermost (contiguous) side is never the shortest
+    sizes = {d: args[d.max_name] - args[d.min_name] + 1 for d in grid.dimensions}
+    assert heuristic.working_set(sizes, sizes) > heuristic.capacities[0]
+    for n, capacity in enumerate(heuristic.capacities):
+        shape = {d.root: args[d.step.name] for d in blockdims if d.level == n}
+        assert len(shape) == grid.dim
+        assert heuristic.working_set(shape, sizes) <= capacity
+        assert shape[grid.dimensions[-1]] == max(shape.values())
+    assert len(heuristic.capacities) == blocklevels
+
+    # More threads, more (smaller) blocks
+    assert heuristic.shape((256,)*3, 1024) != heuristic.shape((256,)*3, 1)
+
+
+@pytest.mark.parametrize('openmp', [False, True])
+def test_streaming(openmp):
+    """
+    Test that nontemporal stores and software prefetching preserve the
+    numerical results, whether the nontemporal stores are switched on or off
+    at runtime.
+    """
+    # The x86 nontemporal store intrinsics are only available with a known ISA
+    platform = configuration['platform']
+    configuration['platform'] = 'intel64'
+
+    try:
+        grid = Grid(shape=(37, 41, 67))
+        f = TimeFunction(name='f', grid=grid, space_order=2)
+        g = Function(name='g', grid=grid)
+        g.data[:] = np.random.rand(*grid.shape)
+        eq = Eq(f.forward, f.laplace + g)
+
+        op0 = Operator(eq, dle='noop')
+        op1 = Operator(eq, dle=('advanced', {'openmp': openmp, 'ntstores': True,
+                                             'prefetch': True}))
+
+        op0.apply(time_M=2)
+        expected = f.data.copy()
+        for ntstores in [1, 0]:
+            f.data[:] = 0.
+            op1.apply(time_M=2, ntstores=ntstores)
+            assert np.allclose(f.data, expected, rtol=1e-6)
+    finally:
+        configuration['platform'] = str(platform)
+
+    calls = [i.name for i in FindNodes(Call).visit(op1._func_table['bf0'].root)]
+    assert '__builtin_prefetch' in calls
+    assert any('_stream_ps' in i for i in calls)
+    assert '_mm_sfence' in str(op1)
+
+
+@pytest.mark.parametrize('nlevels', [1, 2])
+def test_unroll_jam(nlevels):
+    """
+    Test that unroll-and-jam preserves the numerical results, for all of the
+    unroll factors (including those with no dedicated variant), and that the
+    values shared by the jammed copies are loaded once.
+    """
+    grid = Grid(shape=(37, 41, 67))
+    f = TimeFunction(name='f', grid=grid, space_order=8)
+    f.data[0, :] = np.random.rand(*f.data.shape[1:])
+    eq = Eq(f.forward, f.laplace*grid.spacing[0]**2)
+
+    op0 = Operator(eq, dle='noop')
+    op1 = Operator(eq, dle=('advanced', {'unroll': nlevels}))
+
+    op0.apply(time_M=0)
+    expected = f.data[1].copy()
+    for ufactor in [1, 2, 3, 4]:
+        f.data[1, :] = 0.
+        op1.apply(time_M=0, ufactor=ufactor)
+        assert np.allclose(f.data[1], expected, atol=1e-5)
+
+    # One variant per unroll factor, plus the original Iterations
+    conditionals = [i for i in FindNodes(Conditional).visit(op1._func_table['bf0'].root)
+                    if 'ufactor' in str(i.condition)]
+    assert len(conditionals) == 2
+    trees = retrieve_iteration_tree(conditionals[0].then_body)
+    assert trees[0][-nlevels - 1].step == 2
+    loads = [i for i in FindNodes(Expression).visit(trees[0][-1])
+             if i.write.name.startswith('f_r')]
+    assert len(loads) > 0
+
+
+def _new_operator4(shape, space_order, blockshape=None, dle=None):
+    grid = Grid(shape=shape, extent=tuple(i - 1. for i in shape))
+    u = TimeFunction(name='u', grid=grid, time_order=2, space_order=space_order)
+    m = Function(name='m', grid=grid)
+    m.data[:] = 1.
+
+    src = SparseTimeFunction(name='src', grid=grid, npoint=2, nt=12)
+    src.coordinates.data[:] = [[2.5]*grid.dim, [i - 4.2 for i in shape]]
+    src.data[:] = np.arange(12*2).reshape(12, 2)
+    rec = SparseTimeFunction(name='rec', grid=grid, npoint=3, nt=12)
+    rec.coordinates.data[:] = [[0.]*grid.dim, [4.7]*grid.dim, [i - 1. for i in shape]]
+
+    eqns = [Eq(u.forward, solve(m*u.dt2 - u.laplace, u.forward))]
+    eqns += src.inject(field=u.forward, expr=src*0.1)
+    eqns += rec.interpolate(expr=u)
+    op = Operator(eqns, dle=dle)
+
+    dims = (grid.time_dim,) + grid.dimensions
+    blocksizes = {'%s0_tblk_size' % d.name: v for d, v in zip(dims, as_tuple(blockshape))}
+    op.apply(time_M=10, dt=0.1, **blocksizes)
+
+    return u.data.copy(), rec.data.copy(), op
+
+
+@pytest.mark.parametrize("shape,space_order,blockshape", [
+    ((19, 21), 2, (3, 4)),
+    ((19, 21), 4, (4, 7)),
+    ((19, 21), 8, (2, 21)),
+    ((13, 14, 11), 4, (3, 5, 6)),
+    ((13, 14, 11), 4, (11, 13, 14)),
+])
+def test_time_blocking(shape, space_order, blockshape):
+    u0, rec0, _ = _new_operator4(shape, space_order, dle='noop')
+    u1, rec1, op = _new_operator4(shape, space_order, blockshape,
+                                  dle=('advanced', {'blocktime': True}))
+
+    # The time loop is blocked, and the stencil skewed, within all of the tiles
+    trees = retrieve_iteration_tree(op)
+    assert all(isinstance(i[0].dim, BlockDimension) and i[0].dim.root.is_Time
+               for i in trees)
+    assert all(i[0] is trees[0][0] for i in trees)
+
+    assert np.all(u0 == u1)
+    assert np.all(rec0 == rec1)
+
+
+def test_time_blocking_bailout():
+    grid = Grid(shape=(10, 10))
+    u = TimeFunction(name='u', grid=grid, space_order=2)
+    f = Function(name='f', grid=grid)
+
+    # `f` is overwritten at each timestep, so time tiles can't be skewed
+    op = Operator([Eq(f, u.dx), Eq(u.forward, u + f)],
+                  dle=('advanced', {'blocktime': True}))
+
+    assert not any(isinstance(i.dim, BlockDimension) and i.dim.root.is_Time
+                   for i in FindNodes(Iteration).visit(op))
+
+
+@pytest.mark.parametrize("shape,space_order,dle", [
+    ((19, 21), 2, ('advanced', {'shrinkbuffers': True})),
+    ((13, 14, 11), 4, ('advanced', {'shrinkbuffers': True})),
+    ((13, 14, 11), 4, ('advanced', {'shrinkbuffers': True, 'blocktime': True})),
+    ((13, 14, 11), 4, ('speculative', {'shrinkbuffers': True, 'openmp': True})),
+])
+def test_shrink_buffers(shape, space_order, dle):
+    u0, rec0, _ = _new_operator4(shape, space_order, dle='noop')
+    u1, rec1, op = _new_operator4(shape, space_order, dle=dle)
+
+    # `u[t-1]` is only read where `u[t+1]` is written, so they can share a slot
+    assert u0.shape[0] == 3
+    assert u1.shape[0] == 2
+    assert all(i.modulo == 2 for i in FindSymbols('free-symbols').visit(op)
+               if isinstance(i, ModuloDimension))
+
+    assert np.all(u0[10 % 3] == u1[10 % 2])
+    assert np.all(u0[11 % 3] == u1[11 % 2])
+    assert np.all(rec0 == rec1)
+
+
+@pytest.mark.parametrize("time_order,expr", [
+    (1, 'u.dx + u'),
+    (2, 'u.backward.dx + u'),
+    (2, 'u.forward.dx + u'),
+])
+def test_shrink_buffers_unsafe(time_order, expr):
+    grid = Grid(shape=(10, 10))
+    u = TimeFunction(name='u', grid=grid, time_order=time_order, space_order=2)
+
+    op = Operator(Eq(u.forward, eval(expr)), dle=('advanced', {'shrinkbuffers': True}))
+
+    assert u._time_size == time_order + 1
+    assert all(i.modulo == time_order + 1 for i in FindSymbols('free-symbols').visit(op)
+               if isinstance(i, ModuloDimension))
+
+
+def test_shrink_buffers_runtime_args():
+    grid = Grid(shape=(10, 10))
+    u = TimeFunction(name='u', grid=grid, time_order=2, space_order=2)
+    u.data[:] = 1.
+
+    op = Operator(Eq(u.forward, 2*u - u.backward + u.laplace),
+                  dle=('advanced', {'shrinkbuffers': True}))
+
+    # `u` has been allocated already, so its data layout can't change
+    assert u._time_size == 3
+    assert all(i.modulo == 3 for i in FindSymbols('free-symbols').visit(op)
+               if isinstance(i, ModuloDimension))
+
+    v = TimeFunction(name='v', grid=grid, time_order=2, space_order=2)
+    op = Operator(Eq(v.forward, 2*v - v.backward + v.laplace),
+                  dle=('advanced', {'shrinkbuffers': True}))
+    assert v._time_size == 2
+
+    # The shrunk time buffer is given to the TimeFunctions passed at runtime
+    v1 = TimeFunction(name='v1', grid=grid, time_order=2, space_order=2)
+    op.apply(v=v1, time_M=2)
+    assert v1.data.shape == (2, 10, 10)
+
+    # Unless they are already allocated
+    v2 = TimeFunction(name='v2', grid=grid, time_order=2, space_order=2)
+    v2.data[:] = 0.
+    with pytest.raises(InvalidArgument):
+        op.apply(v=v2, time_M=2)
+
+
+def test_shrink_buffers_shared():
+    grid = Grid(shape=(10, 10))
+    u = TimeFunction(name='u', grid=grid, time_order=2, space_order=2)
+
+    def eq(f):
+        return Eq(f.forward, 2*f - f.backward + f.laplace)
+
+    op0 = Operator(eq(u), dle='noop')
+    op1 = Operator(eq(u), dle=('advanced', {'shrinkbuffers': True}))
+
+    # `op0` relies on a 3-slot buffer, so `u` can't be shrunk by `op1`
+    assert u._time_size == 3
+    assert all(i.modulo == 3 for i in FindSymbols('free-symbols').visit(op1)
+               if isinstance(i, ModuloDimension))
+    with pytest.raises(ValueError):
+        u._set_time_size(2)
+
+    u.data[:, 5, 5] = 1.
+    op0.apply(time_M=4)
+    v = TimeFunction(name='v', grid=grid, time_order=2, space_order=2)
+    v.data[:, 5, 5] = 1.
+    Operator(eq(v), dle='noop').apply(time_M=4)
+    assert np.all(u.data == v.data)
+
+    # Once no other Operator uses it, `w` can be shrunk
+    w = TimeFunction(name='w', grid=grid, time_order=2, space_order=2)
+    op0 = Operator(eq(w), dle='noop')
+    del op0
+    gc.collect()
+    Operator(eq(w), dle=('advanced', {'shrinkbuffers': True}))
+    assert w._time_size == 2
+
+
 class TestNodeParallelism(object):
 
     @pytest.mark.parametrize('exprs,expected', [
@@ -378,6 +670,105 @@ class TestNodeParallelism(object):
         assert not iterations[3].is_Affine
         assert 'schedule(static)' in iterations[3].pragmas[0].value
 
+    def test_scalar_reduction(self):
+        grid = Grid(shape=(11, 11))
+
+        f = Function(name='f', grid=grid)
+        f.data[:] = np.arange(121).reshape(11, 11)
+        n = Function(name='n', shape=(1,), dimensions=(Dimension(name='i'),))
+
+        op = Operator(Inc(n[0], f*f), dle='openmp')
+
+        # The increment goes into a thread-private accumulator, no atomics needed
+        iterations = FindNodes(Iteration).visit(op)
+        assert 'reduction(+:n_r0)' in iterations[0].pragmas[0].value
+        assert 'omp atomic' not in str(op)
+
+        op.apply()
+        assert n.data[0] == np.sum(f.data**2)
+
+    def test_array_reduction(self):
+        grid = Grid(shape=(11, 11))
+        x, y = grid.dimensions
+
+        f = Function(name='f', grid=grid)
+        f.data[:] = np.arange(121).reshape(11, 11)
+        h = Function(name='h', shape=(11,), dimensions=(y,))
+
+        op = Operator(Inc(h, f), dle='openmp')
+
+        # `h` is only indexed by the sequential `y`, so it's array-reduced along `x`
+        iterations = FindNodes(Iteration).visit(op)
+        assert 'reduction(+:h[0:h_vec->size[0]])' in iterations[0].pragmas[0].value
+        assert 'omp atomic' not in str(op)
+
+        op.apply()
+        assert np.all(h.data == np.sum(f.data, axis=0))
+
+    @patch("devito.dle.parallelizer.Ompizer.REDUCTION_ARRAY_SIZE", 0)
+    def test_array_reduction_fallback(self):
+        grid = Grid(shape=(11, 11))
+        x, y = grid.dimensions
+
+        f = Function(name='f', grid=grid)
+        f.data[:] = np.arange(121).reshape(11, 11)
+        h = Function(name='h', shape=(11,), dimensions=(y,))
+
+        op = Operator(Inc(h, f), dle='openmp')
+
+        # `h` is too big to be privatised, hence atomic increments are used
+        assert 'reduction' not in str(op)
+        assert 'omp atomic update' in str(op)
+
+        op.apply()
+        assert np.all(h.data == np.sum(f.data, axis=0))
+
+    def test_injection_atomics(self):
+        grid = Grid(shape=(11, 11))
+
+        u = TimeFunction(name='u', grid=grid)
+        src = SparseTimeFunction(name='src', grid=grid, npoint=3, nt=5)
+
+        op = Operator(src.inject(field=u.forward, expr=src), dle='openmp')
+
+        # Indirect accesses, atomic increments are the only option
+        assert 'reduction' not in str(op)
+        assert 'omp atomic update' in str(op)
+
+    @pytest.mark.parametrize('shape', [(21, 21), (11, 11, 11)])
+    def test_injection_colouring(self, shape):
+        grid = Grid(shape=shape)
+
+        u = TimeFunction(name='u', grid=grid)
+        src = SparseTimeFunction(name='src', grid=grid, npoint=100, nt=5)
+        src.coordinates.data[:] = np.random.rand(100, len(shape))*.4 + .3
+        src.data[:] = np.random.rand(5, 100)
+
+        eqns = src.inject(field=u.forward, expr=src)
+        op0 = Operator(eqns, dle=('advanced', {'openmp': True}))
+        op1 = Operator(eqns, dle=('advanced', {'openmp': True, 'colouring': True}))
+
+        # The points are injected by colours, rather than atomically
+        assert 'omp atomic' not in str(op1)
+        iterations = FindNodes(Iteration).visit(op1)
+        assert iterations[1].dim.name == 'c_src' and iterations[1].is_Sequential
+        assert iterations[2].dim.name == 'k_src' and iterations[2].is_Parallel
+        assert 'omp for' in iterations[2].pragmas[0].value
+
+        op0.apply(time_M=3)
+        expected = u.data.copy()
+        u.data[:] = 0.
+        op1.apply(time_M=3)
+        assert np.allclose(u.data, expected, rtol=1e-5)
+
+        # Restricting the sparse points is still honoured
+        u.data[:] = 0.
+        op0.apply(time_M=3, p_src_m=10, p_src_M=50)
+        expected = u.data.copy()
+        u.data[:] = 0.
+        op1.apply(time_M=3, p_src_m=10, p_src_M=50)
+        assert np.allclose(u.data, expected, rtol=1e-5)
+
 
 class TestNestedParallelism(object):
 
@@ -1,4 +1,5 @@
 from sympy import Add, cos, sin  # noqa
+import threading
 import numpy as np
 import pytest
 from unittest.mock import patch
@@ -9,6 +10,7 @@ from devito import (Eq, Inc, Constant, Function, TimeFunction, SparseTimeFunctio
 from devito.ir import Stencil, FlowGraph, FindSymbols, retrieve_iteration_tree  # noqa
 from devito.dle import BlockDimension
 from devito.dse import common_subexprs_elimination, collect
+from devito.dse.aliases import analyze, canonical
 from devito.symbolics import (xreplace_constrained, iq_timeinvariant, estimate_cost,
                               pow_to_mul)
 from devito.tools import generator
@@ -83,6 +85,9 @@ def test_xreplace_constrained_time_invariants(tu, tv, tw, ti0, ti1, t0, t1,
     # divisions (== powers with negative exponenet) are always captured
     (['Eq(tu, tv**-1*(tw*5 + tw*5*t0))', 'Eq(tu, tv**-1*t0)'],
      ['1/tv[t, x, y, z]', 'r0*(5*t0*tw[t, x, y, z] + 5*tw[t, x, y, z])', 'r0*t0']),
+    # nested, with the temporaries in topological order
+    (['Eq(tu, (ti0 + ti1)**-1*t0)', 'Eq(tv, (ti0 + ti1)**-1*t1 + (ti0 + ti1)*t0)'],
+     ['ti0[x, y, z] + ti1[x, y, z]', '1/r0', 'r1*t0', 'r0*t0 + r1*t1']),
 ])
 def test_common_subexprs_elimination(tu, tv, tw, ti0, ti1, t0, t1, exprs, expected):
     counter = generator()
@@ -174,6 +179,33 @@ def test_collect_aliases(fc, fd, exprs, expected):
                 v.anti_stencil == expected[k])
 
 
+@pytest.mark.parametrize('expr0,expr1,expected', [
+    ('Eq(t0, fc[x,y] + fd[x,y+1])', 'Eq(t1, fc[x+1,y-1] + fd[x+1,y])', True),
+    ('Eq(t0, fc[x,y]*fc[x,0])', 'Eq(t1, fc[x+2,y+1]*fc[x+2,0])', True),
+    ('Eq(t0, fc[x,y] + fd[x,y+1])', 'Eq(t1, fc[x,y] + fd[x,y+2])', False),
+    ('Eq(t0, fc[x,y] + fd[x,y])', 'Eq(t1, fc[x,y] - fd[x,y])', False),
+    ('Eq(t0, fc[x,y] + fd[x,y])', 'Eq(t1, fc[x,y] + fc[x,y+1])', False),
+    ('Eq(t0, 2.*fc[x,y])', 'Eq(t1, 2*fc[x,y])', False),
+])
+def test_canonical_aliases(expr0, expr1, expected):
+    """
+    Test that two potential aliases have the same canonical form if and only
+    if they are translated copies of each other.
+    """
+    grid = Grid(shape=(4, 4))
+    x, y = grid.dimensions  # noqa
+
+    t0 = Scalar(name='t0')  # noqa
+    t1 = Scalar(name='t1')  # noqa
+    fc = Function(name='fc', grid=grid)  # noqa
+    fd = Function(name='fd', grid=grid)  # noqa
+
+    c0 = analyze(eval(expr0))
+    c1 = analyze(eval(expr1))
+
+    assert (canonical(c0) == canonical(c1)) is expected
+
+
 @pytest.mark.parametrize('expr,expected,estimate', [
     ('Eq(t0, t1)', 0, False),
     ('Eq(t0, fa[x] + fb[x])', 1, False),
@@ -342,6 +374,55 @@ def test_contracted_alias_shape_after_blocking():
     assert np.all(u.data == exp)
 
 
+@pytest.mark.parametrize('scratch', ['stack', 'heap'])
+@patch("devito.dse.rewriters.AdvancedRewriter.MIN_COST_ALIAS_INV", 1)
+def test_time_invariant_alias_shape_after_blocking(scratch):
+    """
+    Like `test_full_alias_shape_after_blocking`, but the aliasing expressions
+    are time-invariant. With `blocklocal`, these are recomputed within each block,
+    rather than once before time stepping, so the Array is shrunk as well.
+    """
+    grid = Grid(shape=(3, 3, 3))
+    x, y, z = grid.dimensions  # noqa
+    t = grid.stepping_dim
+
+    f = Function(name='f', grid=grid, space_order=3)
+    f.data_with_halo[:] = np.random.rand(*f.shape_with_halo)
+    u = TimeFunction(name='u', grid=grid, space_order=3)
+    u.data_with_halo[:] = 0.
+
+    # Leads to time-invariant 3D aliases
+    eqn = Eq(u.forward, (u[t, x, y, z]*sin(f[x, y, z] + f[x+1, y+1, z+1]) +
+                         u[t, x, y, z]*sin(f[x+2, y+2, z+2] + f[x+3, y+3, z+3]) + 1))
+    op0 = Operator(eqn, dse='noop', dle=('advanced', {'openmp': True}))
+    op1 = Operator(eqn, dse='advanced', dle=('advanced', {'openmp': True,
+                                                          'blocklocal': True,
+                                                          'scratch': scratch}))
+
+    # No Arrays are left outside of the blocks
+    assert not [i for i in FindSymbols().visit(op1) if i.is_Array]
+
+    # Check Array shape
+    arrays = [i for i in FindSymbols().visit(op1._func_table['bf0'].root) if i.is_Array]
+    assert len(arrays) == 1
+    a = arrays[0]
+    assert a._scope == scratch
+    assert len(a.dimensions) == 3
+    assert all(isinstance(d, BlockDimension) for d in a.dimensions[:-1])
+    # Each thread gets its own copy
+    if scratch == 'stack':
+        assert 'private(%s)' % a.name in str(op1._func_table['bf0'].root)
+    else:
+        assert 'posix_memalign((void**)&%s' % a.name in str(op1._func_table['bf0'].root)
+
+    # Check numerical output
+    op0(time_M=1)
+    exp = np.copy(u.data[:])
+    u.data_with_halo[:] = 0.
+    op1(time_M=1)
+    assert np.allclose(u.data, exp, rtol=1e-6)
+
+
 def test_alias_composite():
     """
     Check that composite alias are optimized away through "smaller" aliases.
@@ -576,3 +657,53 @@ def test_tti_v2_rewrite_aggressive_opcounts(space_order, expected):
     assert len(sections) == 2
     assert sections[0].sops == 4
     assert sections[1].sops == expected
+
+
+@pytest.mark.parametrize('threaded', [False, True])
+@patch("devito.dse.transformer.PARALLEL_MIN_OPS", 0)
+def test_parallel_rewrite(threaded):
+    """
+    Test that rewriting the Clusters in a pool of processes produces exactly
+    the same code as the sequential rewrite, and that the rewrite is sequential
+    while other threads, which would be unsafe to fork, are alive.
+    """
+    from devito.dse.transformer import rewrite_parallel
+    from devito.operator import jit_executor
+
+    grid = Grid(shape=(10, 10, 10))
+    u = TimeFunction(name='u', grid=grid, space_order=4)
+    v = TimeFunction(name='v', grid=grid, space_order=4)
+    f = Function(name='f', grid=grid)
+
+    eqns = [Eq(u.forward, cos(f)*u.dx2 + sin(f)*u.dy2 + v.dx*v.dz),
+            Eq(v.forward, (cos(f)*u.forward.dx + sin(f)*u.forward.dy).dx + v)]
+
+    op0 = Operator(eqns, dse='aggressive')
+
+    states = []
+
+    def spy(*args):
+        states.append(rewrite_parallel(*args))
+        return states[-1]
+
+    # The JIT-compilation thread pool is drained before forking
+    jit_executor().submit(lambda: None)
+    if threaded:
+        event = threading.Event()
+        thread = threading.Thread(target=event.wait)
+        thread.start()
+
+    configuration['dse-jobs'] = 2
+    try:
+        with patch("devito.dse.transformer.rewrite_parallel", spy):
+            op1 = Operator(eqns, dse='aggressive')
+    finally:
+        configuration['dse-jobs'] = 1
+        if threaded:
+            event.set()
+            thread.join()
+
+    assert len(states) == 1
+    assert (states[0] is None) == threaded
+    assert str(op0.ccode) == str(op1.ccode)
+    assert op0._soname == op1._soname
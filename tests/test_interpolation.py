@@ -413,3 +413,28 @@ def test_position(shape):
                                  o_x=ox_g, o_y=oy_g, o_z=oz_g)
 
     assert(np.allclose(rec.data, rec1.data, atol=1e-5))
+
+
+@pytest.mark.parametrize('shape', [(11, 11), (11, 11, 11)])
+def test_colouring_plan(shape, npoint=200):
+    """Test that the sparse points within a colour have disjoint supports."""
+    grid = Grid(shape=shape)
+    sf = SparseFunction(name='sf', grid=grid, npoint=npoint)
+    # Points clustered around the domain center
+    sf.coordinates.data[:] = np.random.RandomState(0).rand(npoint, len(shape))*.4 + .3
+
+    perm, offsets = sf._colouring_plan(sf.coordinates.data)
+    assert sorted(perm) == list(range(npoint))
+    assert offsets[0] == 0 and offsets[-1] == npoint
+
+    gridpoints = np.array(sf.gridpoints)
+    for i, j in zip(offsets[:-1], offsets[1:]):
+        support = [tuple(p + k) for p in gridpoints[perm[i:j]]
+                   for k in np.ndindex(*[2]*len(shape))]
+        assert len(support) == len(set(support))
+
+    # The plan is cached ...
+    assert sf._colouring_plan(sf.coordinates.data)[0] is perm
+    # ... until the coordinates change
+    sf.coordinates.data[0] += .1
+    assert sf._colouring_plan(sf.coordinates.data)[0] is not perm
@@ -472,25 +472,28 @@ class TestDependenceAnalysis(object):
         for i in exprs:
             i.ispace._directions = {i: Forward for i in i.ispace.directions}
 
-        scope = Scope(exprs)
-        assert len(scope.d_all) == len(expected)
+        # A Scope grown through `extend` must find the same dependences
+        for scope in [Scope(exprs), Scope(exprs[:1]).extend(exprs[1:])]:
+            found = list(expected)
+            assert len(scope.d_all) == len(found)
 
-        for i in ['flow', 'anti', 'output']:
-            for dep in getattr(scope, 'd_%s' % i):
-                item = (dep.function.name, i, str(set(dep.cause)))
-                assert item in expected
-                expected.remove(item)
+            for i in ['flow', 'anti', 'output']:
+                for dep in getattr(scope, 'd_%s' % i):
+                    item = (dep.function.name, i, str(set(dep.cause)))
+                    assert item in found
+                    found.remove(item)
 
-        # Sanity check: we did find all of the expected dependences
-        assert len(expected) == 0
+            # Sanity check: we did find all of the expected dependences
+            assert len(found) == 0
 
     def test_flow_detection(self):
         """Test detection of information flow."""
         grid = Grid((10, 10))
         u2 = TimeFunction(name="u2", grid=grid, time_order=2)
         u1 = TimeFunction(name="u1", grid=grid, save=10, time_order=2)
-        exprs = [LoweredEq(indexify(Eq(u1.forward, u1 + 2.0 - u1.backward))),
-                 LoweredEq(indexify(Eq(u2.forward, u2 + 2*u2.backward - u1.dt2)))]
+        exprs = [Eq(u1.forward, u1 + 2.0 - u1.backward),
+                 Eq(u2.forward, u2 + 2*u2.backward - u1.dt2)]
+        exprs = [LoweredEq(indexify(i.evaluate)) for i in exprs]
         mapper = detect_flow_directions(exprs)
         assert mapper.get(grid.stepping_dim) == {Forward}
         assert mapper.get(grid.time_dim) == {Any, Forward}
@@ -1,3 +1,6 @@
+import os
+import tempfile
+
 import numpy as np
 import pytest
 
@@ -9,6 +12,7 @@ from devito.data import LEFT, RIGHT
 from devito.ir.iet import Call, Conditional, Iteration, FindNodes, retrieve_iteration_tree
 from devito.mpi import MPI
 from examples.seismic.acoustic import acoustic_setup
+from examples.seismic.model import initialize_damp, initialize_function
 
 pytestmark = skipif(['yask', 'ops', 'nompi'])
 
@@ -310,6 +314,60 @@ class TestFunction(object):
         assert all(i == slice(*j)
                    for i, j in zip(f.local_indices, expected[grid.distributor.myrank]))
 
+    @pytest.mark.parallel(mode=4)
+    def test_initialize_function_streaming(self):
+        nbpml = 3
+        shape = (13, 11)
+        grid = Grid(shape=tuple(i + 2*nbpml for i in shape))
+        f = Function(name='f', grid=grid, space_order=2)
+
+        vp = np.arange(1, np.prod(shape) + 1, dtype=np.float32).reshape(shape)
+        initialize_function(f, vp, nbpml, transform=lambda v: 1 / (v * v))
+
+        # Each rank only gets its own subdomain, edge-padded
+        expected = np.pad(1 / (vp * vp), nbpml + 2, 'edge')
+        mask = tuple(slice(i.start, i.stop + 4) for i in f.local_indices)
+        assert np.all(f._data_ro_with_inhalo == expected[mask])
+
+    @pytest.mark.parallel(mode=4)
+    def test_initialize_function_from_file(self):
+        nbpml = 3
+        shape = (13, 11)
+        grid = Grid(shape=tuple(i + 2*nbpml for i in shape))
+        f = Function(name='f', grid=grid, space_order=2)
+
+        # Each rank memory-maps its own copy of the file
+        vp = np.arange(1, np.prod(shape) + 1, dtype=np.float32).reshape(shape)
+        fd, filename = tempfile.mkstemp(suffix='.bin')
+        os.close(fd)
+        try:
+            vp.tofile(filename)
+            initialize_function(f, filename, nbpml)
+        finally:
+            os.remove(filename)
+
+        expected = np.pad(vp, nbpml + 2, 'edge')
+        mask = tuple(slice(i.start, i.stop + 4) for i in f.local_indices)
+        assert np.all(f._data_ro_with_inhalo == expected[mask])
+
+    @pytest.mark.parallel(mode=4)
+    @pytest.mark.parametrize('mask', [False, True])
+    def test_initialize_damp(self, mask):
+        nbpml = 3
+        spacing = (10., 5.)
+        grid = Grid(shape=(19, 17))
+        damp = Function(name='damp', grid=grid, space_order=2)
+        initialize_damp(damp, nbpml, spacing, mask=mask)
+
+        # Reference, computed by the calling rank alone
+        grid_serial = Grid(shape=grid.shape, comm=MPI.COMM_SELF)
+        expected = Function(name='damp', grid=grid_serial, space_order=2)
+        initialize_damp(expected, nbpml, spacing, mask=mask)
+
+        local = tuple(slice(i.start, i.stop + 4) for i in damp.local_indices)
+        assert np.allclose(damp._data_ro_with_inhalo,
+                           expected._data_ro_with_inhalo[local])
+
 
 class TestSparseFunction(object):
 
@@ -5,8 +5,9 @@ from conftest import skipif, EVAL, time, x, y, z
 from devito import (clear_cache, Grid, Eq, Operator, Constant, Function, TimeFunction,
                     SparseFunction, SparseTimeFunction, Dimension, error, SpaceDimension,
                     NODE, CELL, configuration)
-from devito.ir.iet import (Expression, Iteration, FindNodes, IsPerfectIteration,
-                           retrieve_iteration_tree)
+from devito.archinfo import Cache
+from devito.ir.iet import (Expression, Iteration, FindNodes, FindSymbols,
+                           IsPerfectIteration, retrieve_iteration_tree)
 from devito.ir.support import Any, Backward, Forward
 from devito.symbolics import indexify, retrieve_indexed
 from devito.tools import flatten
@@ -55,6 +56,38 @@ class TestCodeGen(object):
         assert op.parameters[4].is_Scalar
         assert 'a_dense[x + 1] = 2.0F*constant + a_dense[x + 1]' in str(op)
 
+    def test_soname(self):
+        """Tests that the soname of an Operator, which is computed from the IET
+        rather than from the C code, tells apart Operators generating different
+        C code, and that JIT-compiling an Operator whose shared object is in the
+        JIT cache doesn't require generating the C code."""
+        grid = Grid(shape=(4, 4))
+
+        def make(dtype, c):
+            u = TimeFunction(name='u', grid=grid, dtype=dtype, space_order=2)
+            return Operator(Eq(u.forward, u.laplace + c*u))
+
+        ops = [make(np.float32, 1.), make(np.float64, 1.), make(np.float32, 2.),
+               make(np.float32, 1.)]
+        sonames = [op._soname for op in ops]
+        assert len(set(sonames)) == 3
+        assert sonames[0] == sonames[3]
+        assert str(ops[0].ccode) == str(ops[3].ccode)
+
+        ops[0].cfunction
+        ops[3].cfunction
+        assert '_code' not in ops[3].__dict__
+
+    def test_soname_source_digest(self, monkeypatch):
+        """Tests that the soname of an Operator changes along with the Devito
+        source code, so that stale shared objects are never loaded."""
+        grid = Grid(shape=(4, 4))
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+        soname = Operator(Eq(u.forward, u.laplace))._soname
+
+        monkeypatch.setattr('devito.operator.source_digest', lambda: 'edited')
+        assert Operator(Eq(u.forward, u.laplace))._soname != soname
+
     @pytest.mark.parametrize('expr, so, to, expected', [
         ('Eq(u.forward,u+1)', 0, 1, 'Eq(u[t+1,x,y,z],u[t,x,y,z]+1)'),
         ('Eq(u.forward,u+1)', 1, 1, 'Eq(u[t+1,x+1,y+1,z+1],u[t,x+1,y+1,z+1]+1)'),
@@ -455,6 +488,93 @@ class TestAllocation(object):
         Operator([set_f, set_g])()
         assert f.data[index] == 2.
 
+    @pytest.mark.parametrize('so,padding', [(2, 0), (4, 0), (4, 3)])
+    def test_estimate_memory(self, so, padding):
+        """
+        Test that the estimated memory footprint matches the memory actually
+        allocated, and that estimating the footprint allocates nothing.
+        """
+        grid = Grid(shape=(10, 12))
+        u = TimeFunction(name='u', grid=grid, space_order=so, padding=padding)
+        f = Function(name='f', grid=grid, space_order=so, dtype=np.float64)
+        sf = SparseTimeFunction(name='sf', grid=grid, npoint=3, nt=5)
+        op = Operator([Eq(u.forward, u.laplace + f)] + sf.interpolate(u))
+
+        summary = op.estimate_memory(time_M=4)
+        assert u._data is None and f._data is None and sf._data is None
+
+        expected = sum(i._data_allocated.nbytes
+                       for i in [u, f, sf, sf.coordinates])
+        assert summary['functions'] == expected
+        assert summary['total'] == expected
+
+        # Overrides
+        u2 = TimeFunction(name='u', grid=Grid(shape=(20, 20)), save=5, space_order=so)
+        f2 = Function(name='f', grid=u2.grid, space_order=so, dtype=np.float64)
+        summary = op.estimate_memory(u=u2, f=f2._data_allocated, time_M=4)
+        assert u2._data is None
+        expected = sum(i._data_allocated.nbytes
+                       for i in [u2, f2, sf, sf.coordinates])
+        assert summary['functions'] == expected
+
+    def test_estimate_memory_arrays(self):
+        """Test that the temporaries introduced by the DSE are accounted for."""
+        grid = Grid(shape=(10, 10, 10))
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+        f = Function(name='f', grid=grid)
+        op = Operator(Eq(u.forward, u.dx.dx*f.dx + u.dy.dy*f.dy + u.dz.dz*f.dz),
+                      dse='aggressive', dle='noop')
+
+        arrays = [i for i in FindSymbols().visit(op) if i.is_Array]
+        assert len(arrays) > 0
+
+        summary = op.estimate_memory()
+        assert summary['heap'] == sum(np.prod([s + sum(h) for s, h in
+                                               zip(grid.shape, i._halo)])*4
+                                      for i in arrays)
+        assert summary['total'] == summary['functions'] + summary['heap']
+
+    def test_autopadding(self):
+        """
+        Test that, with power-of-two allocated sizes, the innermost Dimension
+        of the unallocated Functions gets padded, and that the padding is
+        transparent to the computation.
+        """
+        grid = Grid(shape=(48, 48, 48))
+        m = Function(name='m', grid=grid, space_order=8)
+        m.data[:] = np.random.rand(*grid.shape)
+        u = TimeFunction(name='u', grid=grid, space_order=8)
+        v = TimeFunction(name='v', grid=grid, space_order=8, padding=0)
+        eqns = [Eq(u.forward, u + 0.1*u.laplace + m), Eq(v.forward, v + 0.1*u)]
+
+        platform = configuration['platform']
+        caches = platform.caches
+        try:
+            platform.caches = (Cache(1, 32*1024, 8, 64),)
+            op = Operator(eqns, autopadding=True)
+        finally:
+            platform.caches = caches
+
+        # `m` is already allocated, while `v` has an explicit padding
+        assert m.shape_allocated == (64, 64, 64)
+        assert v.shape_allocated == (2, 64, 64, 64)
+        pad = u.padding[-1][1]
+        assert pad > 0 and pad % platform.simd_items_per_reg(u.dtype) == 0
+        assert u.shape_allocated == (2, 64, 64, 64 + pad)
+
+        # The padding is also given to unallocated Functions passed at runtime
+        u1 = TimeFunction(name='u', grid=grid, space_order=8)
+        op.apply(time_M=4, u=u1, v=v)
+        assert u1.shape_allocated == u.shape_allocated
+
+        u2 = TimeFunction(name='u', grid=grid, space_order=8)
+        v2 = TimeFunction(name='v', grid=grid, space_order=8)
+        Operator(eqns).apply(time_M=4, u=u2, v=v2)
+        assert u2.shape_allocated == (2, 64, 64, 64)
+
+        assert np.all(u1.data == u2.data)
+        assert np.all(v.data == v2.data)
+
 
 class TestArguments(object):
 
@@ -968,6 +1088,53 @@ class TestArguments(object):
         except:
             assert False
 
+    def test_specialization(self):
+        """
+        Test that the variant specialized for the runtime arguments replaces
+        them with literals, and that it's used once JIT-compiled.
+        """
+        grid = Grid(shape=(11, 12, 13))
+        c = Constant(name='c', value=0.1)
+        u = TimeFunction(name='u', grid=grid, space_order=2)
+        u.data[:] = np.random.rand(*u.shape)
+        u0 = u.data.copy()
+
+        op = Operator(Eq(u.forward, c*u.laplace + u))
+        op.apply(time_M=3)
+        expected = u.data.copy()
+
+        args = op.arguments(time_M=3)
+        variant = op._specialize(op._specialization_mapper(args))
+        assert variant.parameters == op.parameters
+        efunc = str(variant._func_table['bf0'].root.ccode)
+        assert 'u_vec->size' not in efunc
+        assert 'z_M' not in efunc.split('{', 1)[1]
+
+        # The first run triggers JIT compilation in the background, and uses the
+        # generic Operator until the specialized variant is ready
+        u.data[:] = u0
+        op.apply(time_M=3, specialize=True)
+        assert np.allclose(u.data, expected, rtol=1e-6)
+        assert len(op._specializations) == 1
+        assert list(op._specializations.values())[0].result() is not None
+
+        # Same arguments, except for the time range, hence same variant
+        u.data[:] = u0
+        op.apply(time_m=0, time_M=3, specialize=True)
+        assert np.allclose(u.data, expected, rtol=1e-6)
+        assert len(op._specializations) == 1
+
+    def test_specialization_cache(self):
+        grid = Grid(shape=(11, 11))
+        u = TimeFunction(name='u', grid=grid)
+        op = Operator(Eq(u.forward, u + 1))
+
+        for i in range(op._specializations_max + 2):
+            op.apply(time_M=0, x_M=i, specialize=True)
+        assert len(op._specializations) == op._specializations_max
+        for i in op._specializations.values():
+            assert i.result() is not None
+
 
 class TestDeclarator(object):
 
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from conftest import skipif
+from devito import Grid, Function
+from examples.seismic.model import initialize_damp
+
+pytestmark = skipif(['yask', 'ops'])
+
+
+def initialize_damp_ref(shape, nbpml, spacing, mask=False):
+    """
+    The reference, loop-based, damping field, over the domain of shape
+    ``shape`` (i.e., including the absorbing layers).
+    """
+    phy_shape = tuple(i - 2*nbpml for i in shape)
+    data = np.ones(phy_shape) if mask else np.zeros(phy_shape)
+    data = np.pad(data, [(nbpml, nbpml) for _ in shape], 'edge')
+
+    dampcoeff = 1.5 * np.log(1.0 / 0.001) / (40.)
+
+    for i in range(len(shape)):
+        for j in range(nbpml):
+            pos = np.abs((nbpml - j + 1) / float(nbpml))
+            val = dampcoeff * (pos - np.sin(2*np.pi*pos)/(2*np.pi))
+            if mask:
+                val = -val
+            all_ind = [slice(0, d) for d in data.shape]
+            all_ind[i] = slice(j, j+1)
+            data[tuple(all_ind)] += val/spacing[i]
+            all_ind[i] = slice(data.shape[i]-j, data.shape[i]-j+1)
+            data[tuple(all_ind)] += val/spacing[i]
+
+    return data
+
+
+@pytest.mark.parametrize('shape, spacing', [
+    ((11, 12), (1., 1.)),
+    ((11, 12), (10., 15.)),
+    ((9, 10, 11), (1., 1., 1.)),
+    ((9, 10, 11), (5., 7.5, 20.)),
+])
+@pytest.mark.parametrize('nbpml', [1, 3, 10])
+@pytest.mark.parametrize('mask', [False, True])
+def test_initialize_damp(shape, spacing, nbpml, mask):
+    """
+    Test that the damping field matches the reference, loop-based,
+    implementation.
+    """
+    shape = tuple(i + 2*nbpml for i in shape)
+    grid = Grid(shape=shape)
+    damp = Function(name='damp', grid=grid, space_order=2)
+
+    initialize_damp(damp, nbpml, spacing, mask=mask)
+
+    expected = initialize_damp_ref(shape, nbpml, spacing, mask=mask)
+    assert np.allclose(damp.data, expected, rtol=1e-6)
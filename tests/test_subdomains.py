@@ -1,9 +1,11 @@
 import numpy as np
+import pytest
 from math import floor
 
 from conftest import skipif
-from devito import (Grid, Function, TimeFunction, Eq, solve, Operator, SubDomainSet,
-                    Dimension)
+from devito import (Grid, Function, TimeFunction, Eq, Inc, solve, Operator, SubDomain,
+                    SubDomainSet, Dimension)
+from devito.ir.iet import Expression, FindNodes
 
 pytestmark = skipif(['yask', 'ops'])
 
@@ -164,3 +166,87 @@ class TestSubdomains(object):
                              [0, 0, 0, 0, 0, 0, 0, 0, 0, 0]], dtype=np.int32)
 
         assert((np.array(f.data[:]+g.data[:]) == expected).all())
+
+    @pytest.mark.parametrize('spec', [
+        {'x': ('middle', 2, 3), 'y': ('middle', 1, 1)},
+        {'x': ('left', 4), 'y': ('right', 3)},
+        {'x': ('middle', 0, 2), 'y': None},
+    ])
+    def test_complement(self, spec):
+        """
+        Test that a SubDomain and the slabs of its complement partition the Grid.
+        """
+        class Inner(SubDomain):
+            name = 'inner'
+
+            def define(self, dimensions):
+                return {d: spec[d.name] or d for d in dimensions}
+
+        inner = Inner()
+        grid = Grid(shape=(10, 9), subdomains=(inner,))
+        f = Function(name='f', grid=grid, dtype=np.int32)
+
+        eqns = [Inc(f, 1, subdomain=i) for i in (inner,) + inner.complement]
+        Operator(eqns)()
+
+        assert np.all(f.data == 1)
+
+    def test_constant_on(self):
+        """
+        Test that the loop nests iterating over the SubDomain in which a Function
+        is constant don't access it, and that the results are unaffected.
+        """
+        class Inner(SubDomain):
+            name = 'inner'
+
+            def define(self, dimensions):
+                return {d: ('middle', 4, 4) for d in dimensions}
+
+        inner = Inner()
+        grid = Grid(shape=(24, 20, 18), extent=(23, 19, 17), subdomains=(inner,))
+
+        res = []
+        for constant_on in [None, {inner: 0.}]:
+            damp = Function(name='damp', grid=grid, constant_on=constant_on)
+            damp.data[:] = 0.3
+            damp.data[4:-4, 4:-4, 4:-4] = 0.
+            u = TimeFunction(name='u', grid=grid, space_order=4, time_order=2)
+            u.data[:, 10, 10, 9] = 1.
+
+            pde = u.dt2 - u.laplace + damp*u.dt
+            op = Operator(Eq(u.forward, solve(pde, u.forward)))
+            op(time_M=20, dt=0.1)
+            res.append(u.data.copy())
+
+        trees = [op] + [i.root for i in op._func_table.values()]
+        exprs = FindNodes(Expression).visit(trees)
+        interior = [i for i in exprs
+                    if {s.name for s in i.free_symbols} >= {'xi', 'yi', 'zi'}]
+        assert len(interior) > 0
+        assert all(damp not in i.functions for i in interior)
+        assert np.allclose(res[0], res[1], atol=1e-6)
+
+    def test_constant_on_checks(self):
+        class Inner(SubDomain):
+            name = 'inner'
+
+            def define(self, dimensions):
+                return {d: ('middle', 1, 1) for d in dimensions}
+
+        inner = Inner()
+        grid = Grid(shape=(10, 10))
+        with pytest.raises(ValueError):
+            Function(name='f', grid=grid, constant_on={inner: 0})
+
+    def test_constant_on_subdomainset(self):
+        """
+        SubDomainSets have no complement, so they can't be used for `constant_on`.
+        """
+        class Inner(SubDomainSet):
+            name = 'inner'
+
+        bounds = tuple(np.ones((2,), dtype=np.int32) for _ in range(4))
+        inner = Inner(N=2, bounds=bounds)
+        grid = Grid(shape=(10, 10), subdomains=(inner,))
+        with pytest.raises(ValueError):
+            Function(name='f', grid=grid, constant_on={inner: 0})
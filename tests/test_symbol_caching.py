@@ -6,8 +6,8 @@ import pytest
 from conftest import skipif
 from devito import (Grid, Function, TimeFunction, SparseFunction, SparseTimeFunction,
                     ConditionalDimension, SubDimension, Constant, Operator, Eq, Dimension,
-                    clear_cache)
-from devito.types.basic import _SymbolCache, Scalar
+                    clear_cache, configuration)
+from devito.types.basic import _SymbolCache, CacheManager, Scalar
 
 pytestmark = skipif(['yask', 'ops'])
 
@@ -31,8 +31,8 @@ def test_cache_function_same_indices(FunctionType):
     u0 = FunctionType(name='u', grid=grid)
     u0.data[:] = 6.
     # Pick u(x, y) and u(x + h_x, y) from derivative
-    u1 = u0.dx.args[1].args[2]
-    u2 = u0.dx.args[0].args[1]
+    u1 = u0.dx.evaluate.args[1].args[2]
+    u2 = u0.dx.evaluate.args[0].args[1]
     assert np.allclose(u1.data, 6.)
     assert np.allclose(u2.data, 6.)
 
@@ -44,7 +44,7 @@ def test_cache_function_different_indices(FunctionType):
     u0 = FunctionType(name='u', grid=grid)
     u0.data[:] = 6.
     # Pick u[x + h, y] (different indices) from derivative
-    u = u0.dx.args[0].args[1]
+    u = u0.dx.evaluate.args[0].args[1]
     assert np.allclose(u.data, u0.data)
 
 
@@ -85,7 +85,7 @@ def test_symbol_cache_aliasing():
     u_ref = weakref.ref(u.data)
 
     # Create u[x + h, y] and delete it again
-    dx = u.dx  # Contains two u symbols: u[x, y] and u[x + h, y]
+    dx = u.dx.evaluate  # Contains two u symbols: u[x, y] and u[x + h, y]
     del dx
     clear_cache()
     # FIXME: Unreliable cache sizes
@@ -116,7 +116,7 @@ def test_symbol_cache_aliasing_reverse():
     u_ref = weakref.ref(u.data)
 
     # Create derivative and delete orignal u[x, y]
-    dx = u.dx
+    dx = u.dx.evaluate
     del u
     clear_cache()
     # We still have a references to u
@@ -147,6 +147,63 @@ def test_clear_cache(nx=1000, ny=1000):
         clear_cache()
 
 
+def test_clear_cache_fd_shortcuts():
+    """
+    Test that the derivative shortcut tables, which are shared across Functions,
+    don't keep the symbols of the Grid alive after a ``clear_cache``.
+    """
+    h = Constant(name='h_w')
+    w = Dimension(name='w', spacing=h)
+    Function(name='f', grid=Grid(shape=(4,), dimensions=(w,)))
+    h_ref = weakref.ref(h)
+    del h, w
+
+    clear_cache()
+    assert h_ref() is None
+
+
+def test_cache_watermarks(nx=100, ny=100):
+    """
+    Test that the symbol caches are automatically trimmed once the Data held
+    by the cached Functions exceeds the high watermark.
+    """
+    grid = Grid(shape=(nx, ny))
+    clear_cache()
+    nbytes = Function(name='f', grid=grid).data_with_halo.nbytes
+    clear_cache()
+    stats = CacheManager.stats()
+    # The Data of the Functions kept alive elsewhere (e.g., by other tests)
+    base = CacheManager.nbytes
+
+    high = configuration['cache-high-watermark']
+    low = configuration['cache-low-watermark']
+    try:
+        configuration['cache-high-watermark'] = base + 4*nbytes
+        configuration['cache-low-watermark'] = base + nbytes
+        u = Function(name='u', grid=grid)
+        u.data[:] = 1.
+        for i in range(20):
+            # Functions are kept alive by reference cycles, so only the garbage
+            # collector can free them
+            f = Function(name='f', grid=grid)
+            f.data[:] = 2.
+            assert CacheManager.nbytes - base <= 5*nbytes
+    finally:
+        configuration['cache-high-watermark'] = high
+        configuration['cache-low-watermark'] = low
+
+    # The Functions still in use must not be evicted
+    assert np.all(u.data == 1.) and np.all(f.data == 2.)
+    assert _SymbolCache[type(u)]() is u
+
+    # Cache statistics
+    x, y = grid.dimensions
+    u.subs(x, x + 1)
+    assert CacheManager.stats()['misses'] - stats['misses'] == 21
+    assert CacheManager.stats()['hits'] > stats['hits']
+    assert CacheManager.stats()['evictions'] - stats['evictions'] >= 15
+
+
 def test_cache_after_indexification():
     """Test to assert that the SymPy cache retrieves the right Devito data object
     after indexification.
@@ -25,7 +25,7 @@ class TestSC(object):
         u0 = TimeFunction(name='u', grid=grid, time_order=order, space_order=order)
         u1 = TimeFunction(name='u', grid=grid, time_order=order, space_order=order,
                           coefficients='symbolic')
-        eq0 = Eq(-u0.dx+u0.dt)
+        eq0 = Eq(-u0.dx+u0.dt).evaluate
         eq1 = Eq(u1.dt-u1.dx)
         assert(eq0.evalf(_PRECISION).__repr__() == eq1.evalf(_PRECISION).__repr__())
 
@@ -1,8 +1,10 @@
+from uuid import uuid4
+
 from sympy.abc import a, b, c, d, e
 import pytest
 
 from conftest import skipif
-from devito.tools import toposort
+from devito.tools import memoized_on_disk, toposort
 
 pytestmark = skipif(['yask', 'ops'])
 
@@ -20,3 +22,27 @@ def test_toposort(elements, expected):
         assert ordering == expected
     except ValueError:
         assert expected is None
+
+
+def test_memoized_on_disk():
+    calls = []
+    version = [0]
+
+    def detect(arg):
+        calls.append(arg)
+        return (arg, version[0])
+
+    # A unique argument, so that there's nothing on disk from previous runs
+    arg = str(uuid4())
+
+    assert memoized_on_disk(lambda i: version[0])(detect)(arg) == (arg, 0)
+    assert len(calls) == 1
+
+    # A fresh decorator (as in a new process) must pick the value from disk
+    assert memoized_on_disk(lambda i: version[0])(detect)(arg) == (arg, 0)
+    assert len(calls) == 1
+
+    # Changing the key must invalidate the cached value
+    version[0] = 1
+    assert memoized_on_disk(lambda i: version[0])(detect)(arg) == (arg, 1)
+    assert len(calls) == 2
@@ -4,9 +4,10 @@ import pytest
 
 from conftest import skipif
 from devito.ir.equations import DummyEq
-from devito.ir.iet import (Block, Expression, Callable, FindSections,
-                           FindSymbols, IsPerfectIteration, Transformer,
-                           Conditional, printAST)
+from devito.ir.iet import (Block, Expression, Callable, FindNodes, FindSections,
+                           FindSymbols, IETIndex, IsPerfectIteration, Iteration,
+                           Transformer, Conditional, printAST,
+                           retrieve_iteration_tree)
 
 pytestmark = skipif(['yask', 'ops'])
 
@@ -307,3 +308,45 @@ def test_nested_transformer(exprs, iters, block2):
   <Iteration s::s::(0, 4, 1)::(0, 0)>
     <Iteration k::k::(0, 7, 1)::(0, 0)>
       <Expression a[i] = 8.0*a[i] + 6.0/b[i]>"""
+
+
+def test_transformer_preserves_untouched(exprs, block3):
+    """A Transformer only rebuilds the nodes enclosing the replaced ones."""
+    processed = Transformer({exprs[3]: exprs[0]}).visit(block3)
+    assert processed is not block3
+    assert processed.nodes[0] is block3.nodes[0]
+    assert processed.nodes[1] is block3.nodes[1]
+    assert processed.nodes[2] is not block3.nodes[2]
+
+    assert Transformer({}).visit(block3) is block3
+
+
+def test_iet_index(exprs, iters, block3):
+    """Lookups and transformations through an IETIndex must be equivalent
+    to those performed via FindNodes and Transformer."""
+    index = IETIndex.lookup(block3)
+    assert IETIndex.lookup(block3) is index
+
+    for match in [Iteration, Expression, (Iteration, Expression)]:
+        assert index.find(match) == FindNodes(match).visit(block3)
+    for i in FindNodes(Iteration).visit(block3):
+        assert index.find(Expression, i) == FindNodes(Expression).visit(i)
+    assert [list(i) for i in index.iteration_trees] ==\
+        [list(i) for i in retrieve_iteration_tree(block3)]
+
+    inner = block3.nodes[1].nodes[0]
+    assert index.parent(inner) is block3.nodes[1]
+    assert index.ancestors(inner) == (block3, block3.nodes[1])
+    assert index.parent(block3) is None
+
+    for nested in [False, True]:
+        mapper = {inner: iters[3](inner.nodes), exprs[3]: exprs[0]}
+        processed = index.transform(mapper, nested=nested)
+        expected = Transformer(mapper, nested=nested).visit(block3)
+        assert printAST(processed) == printAST(expected)
+        assert processed.nodes[0] is block3.nodes[0]
+
+        # The IETIndex of the transformed IET is derived incrementally
+        derived = IETIndex.lookup(processed)
+        assert derived.find(Expression) == FindNodes(Expression).visit(processed)
+        assert derived._parents == IETIndex(processed)._parents